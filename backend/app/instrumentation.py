@@ -0,0 +1,432 @@
+"""Opt-in instrumentation: stage timers, counters and sampling profiles.
+
+Metrics are collected only when ``CDSS_METRICS=1`` (or after
+``enable()``). When disabled, ``stage()`` returns a shared no-op context
+manager and ``count()`` returns immediately, so instrumented hot paths
+pay a single flag check.
+
+Independently of process metrics, ``ServerTimingMiddleware`` collects
+the same stages per request for selected endpoints and reports them in
+a ``Server-Timing`` header and a structured slow-request log.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+ENABLED = os.environ.get("CDSS_METRICS") == "1"
+PROFILING_ENABLED = os.environ.get("CDSS_PROFILING") == "1"
+
+# Requests slower than this are written to the slow-request log
+SLOW_REQUEST_MS = float(os.environ.get("CDSS_SLOW_REQUEST_MS", "1000"))
+
+# Endpoints whose pipeline stages are reported per request
+TIMED_PATH_PREFIXES = (
+    "/api/convert", "/api/graphs/", "/api/resolve-alternatives"
+)
+
+slow_request_logger = logging.getLogger("cdss.slow_requests")
+
+# Header that requests a sampling profile of a single request
+PROFILE_HEADER = b"x-cdss-profile"
+PROFILE_ID_HEADER = b"x-cdss-profile-id"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """Process-wide store of stage timings and counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stage_seconds: Dict[str, float] = {}
+        self._stage_calls: Dict[str, int] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+
+    def observe(self, stage_name: str, seconds: float) -> None:
+        """Record one execution of a stage."""
+        with self._lock:
+            self._stage_seconds[stage_name] = (
+                self._stage_seconds.get(stage_name, 0.0) + seconds
+            )
+            self._stage_calls[stage_name] = (
+                self._stage_calls.get(stage_name, 0) + 1
+            )
+
+    def incr(self, name: str, value: float = 1, labels: Labels = ()) -> None:
+        """Increment a counter."""
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self) -> None:
+        """Clear all recorded metrics."""
+        with self._lock:
+            self._stage_seconds.clear()
+            self._stage_calls.clear()
+            self._counters.clear()
+
+    def render_prometheus(self) -> str:
+        """Render metrics in the Prometheus text exposition format."""
+        with self._lock:
+            stage_seconds = dict(self._stage_seconds)
+            stage_calls = dict(self._stage_calls)
+            counters = dict(self._counters)
+
+        lines = [
+            "# HELP cdss_instrumentation_enabled Whether metrics are collected",
+            "# TYPE cdss_instrumentation_enabled gauge",
+            f"cdss_instrumentation_enabled {int(ENABLED)}",
+            "# HELP cdss_stage_seconds Time spent in pipeline stages",
+            "# TYPE cdss_stage_seconds summary",
+        ]
+        for name in sorted(stage_seconds):
+            lines.append(
+                f'cdss_stage_seconds_sum{{stage="{name}"}} {stage_seconds[name]:.9f}'
+            )
+            lines.append(
+                f'cdss_stage_seconds_count{{stage="{name}"}} {stage_calls[name]}'
+            )
+
+        seen = set()
+        for (name, labels) in sorted(counters):
+            metric = f"cdss_{name}_total"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+            if label_text:
+                label_text = "{" + label_text + "}"
+            lines.append(f"{metric}{label_text} {counters[(name, labels)]:g}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+class RequestTimings:
+    """Stage timings and counters collected for a single request."""
+
+    __slots__ = ("stages", "counts")
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.counts: Dict[str, float] = {}
+
+    def observe(self, stage_name: str, seconds: float) -> None:
+        """Record time spent in a stage."""
+        self.stages[stage_name] = self.stages.get(stage_name, 0.0) + seconds
+
+    def incr(self, name: str, value: float = 1) -> None:
+        """Increment a per-request counter."""
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def server_timing(self, total_seconds: float) -> str:
+        """Render the stages as a Server-Timing header value."""
+        entries = [
+            f"{name};dur={seconds * 1000.0:.3f}"
+            for name, seconds in self.stages.items()
+        ]
+        entries.append(f"total;dur={total_seconds * 1000.0:.3f}")
+        return ", ".join(entries)
+
+
+_request_timings: contextvars.ContextVar = contextvars.ContextVar(
+    "cdss_request_timings", default=None
+)
+
+
+def active() -> bool:
+    """Check whether anything is collecting stage timings right now."""
+    return ENABLED or _request_timings.get() is not None
+
+
+class _NullStage:
+    """No-op stage timer used while instrumentation is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Context manager timing one execution of a named stage."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "_Stage":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        elapsed = time.perf_counter() - self.start
+        if ENABLED:
+            metrics.observe(self.name, elapsed)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.observe(self.name, elapsed)
+
+
+def stage(name: str):
+    """Time a block of code as a named stage.
+
+    Usage:
+        with stage("ld_construction"):
+            ...
+    """
+    if not active():
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def timed(name: str):
+    """Decorator timing every call of a function as a named stage."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not active():
+                return func(*args, **kwargs)
+            with _Stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name: str, value: float = 1, labels: Labels = ()) -> None:
+    """Increment a counter when instrumentation is enabled."""
+    if ENABLED:
+        metrics.incr(name, value, labels)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.incr(name, value)
+
+
+def enable() -> None:
+    """Turn metric collection on."""
+    global ENABLED
+    ENABLED = True
+
+
+def disable() -> None:
+    """Turn metric collection off."""
+    global ENABLED
+    ENABLED = False
+
+
+class SamplingProfiler:
+    """Statistical profiler sampling one thread's stack at a fixed interval.
+
+    Samples are aggregated as collapsed stacks ("outer;inner count"),
+    the input format of common flame graph tools.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.001):
+        """Initialize the profiler.
+
+        Args:
+            thread_id: Identifier of the thread to sample
+            interval: Seconds between samples
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_filename}:{code.co_name}")
+                frame = frame.f_back
+            key = ";".join(reversed(stack))
+            self.samples[key] = self.samples.get(key, 0) + 1
+
+    def collapsed(self) -> str:
+        """Render samples as collapsed stacks."""
+        return "".join(
+            f"{stack} {samples}\n"
+            for stack, samples in sorted(
+                self.samples.items(), key=lambda item: -item[1]
+            )
+        )
+
+
+class ProfileStore:
+    """Bounded store of recently captured request profiles."""
+
+    def __init__(self, max_profiles: int = 32):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: str) -> str:
+        """Store a profile and return its ID."""
+        profile_id = uuid.uuid4().hex
+        with self._lock:
+            self._profiles[profile_id] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        return profile_id
+
+    def get(self, profile_id: str) -> Optional[str]:
+        """Get a stored profile."""
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+
+profiles = ProfileStore()
+
+
+class ProfilingMiddleware:
+    """ASGI middleware capturing a sampling profile for flagged requests.
+
+    A request carrying ``X-CDSS-Profile: 1`` is sampled while it is being
+    handled; the response gets an ``X-CDSS-Profile-Id`` header naming the
+    profile, which can be fetched from ``/metrics/profiles/{id}``.
+    """
+
+    def __init__(self, app, interval: float = 0.001):
+        self.app = app
+        self.interval = interval
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = SamplingProfiler(threading.get_ident(), self.interval)
+        profile_ids = []
+
+        async def send_with_profile(message):
+            if message["type"] == "http.response.start":
+                profiler.stop()
+                profile_ids.append(profiles.add(profiler.collapsed()))
+                message["headers"] = list(message.get("headers", [])) + [
+                    (PROFILE_ID_HEADER, profile_ids[0].encode())
+                ]
+            await send(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            profiler.stop()
+
+    @staticmethod
+    def _requested(scope) -> bool:
+        for name, value in scope.get("headers", ()):
+            if name == PROFILE_HEADER:
+                return value not in (b"", b"0", b"false")
+        return False
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware reporting per-stage timings of graph endpoints.
+
+    For requests under ``path_prefixes``, stage timings recorded by
+    ``stage()``/``timed()`` are attached as a ``Server-Timing`` header.
+    Requests slower than ``slow_request_ms`` are written as one JSON
+    record to the ``cdss.slow_requests`` logger, together with the graph
+    sizes counted during the request.
+    """
+
+    def __init__(
+        self,
+        app,
+        path_prefixes: Sequence[str] = TIMED_PATH_PREFIXES,
+        slow_request_ms: Optional[float] = None
+    ):
+        self.app = app
+        self.path_prefixes = tuple(path_prefixes)
+        self.slow_request_ms = (
+            SLOW_REQUEST_MS if slow_request_ms is None else slow_request_ms
+        )
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or
+                not scope["path"].startswith(self.path_prefixes)):
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+        status = []
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+                header = timings.server_timing(time.perf_counter() - start)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", header.encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+            duration_ms = (time.perf_counter() - start) * 1000.0
+            if duration_ms >= self.slow_request_ms:
+                self._log_slow_request(
+                    scope, status[0] if status else 500, duration_ms, timings
+                )
+
+    def _log_slow_request(
+        self,
+        scope,
+        status: int,
+        duration_ms: float,
+        timings: RequestTimings
+    ) -> None:
+        record = {
+            "event": "slow_request",
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status,
+            "duration_ms": round(duration_ms, 3),
+            "threshold_ms": self.slow_request_ms,
+            "stages_ms": {
+                name: round(seconds * 1000.0, 3)
+                for name, seconds in timings.stages.items()
+            },
+            "graph_sizes": timings.counts,
+        }
+        slow_request_logger.warning(json.dumps(record))
@@ -1,19 +1,226 @@
 """Main FastAPI application for Concept Design Support System."""
 
-from fastapi import FastAPI, HTTPException
+import os
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Any, Dict, List, Optional
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+from pydantic_core import to_json
+
+from . import instrumentation
+from .wire_format import COMPACT_MEDIA_TYPE, compact_body, representation
+
+if TYPE_CHECKING:
+    from .services.design_exploration import DesignExplorationEngine
+    from .services.graph_conversion import GraphConversionEngine
+    from .services.interactive_exploration import InteractiveExplorationEngine
+    from .services.knowledge_base import KnowledgeBase
+    from .models.graphs import SIGraph
+
+
+# Global engine instances
+#
+# Engines and their dependencies (networkx, component models, services)
+# are imported and built on first use so that importing this module stays
+# cheap. Set CDSS_EAGER_STARTUP=1 to build them in the lifespan hook
+# instead, before the worker starts accepting requests, or run under
+# gunicorn.conf.py to build them once in the master (see app.preload).
+
+@lru_cache(maxsize=None)
+def load_knowledge_base() -> "KnowledgeBase":
+    """Get the shared knowledge base.
+
+    Loaded from the JSON file named by CDSS_KNOWLEDGE_BASE if set, else
+    the built-in collision avoidance example.
+    """
+    from .services.knowledge_base import KnowledgeBase
+    path = os.environ.get("CDSS_KNOWLEDGE_BASE")
+    return KnowledgeBase.load(path) if path else KnowledgeBase()
+
+
+@lru_cache(maxsize=None)
+def load_design_engine() -> "DesignExplorationEngine":
+    """Get the design exploration engine."""
+    from .services.design_exploration import DesignExplorationEngine
+    return DesignExplorationEngine(load_knowledge_base())
+
+
+@lru_cache(maxsize=None)
+def load_conversion_engine() -> "GraphConversionEngine":
+    """Get the graph conversion engine."""
+    from .services.graph_conversion import GraphConversionEngine
+    return GraphConversionEngine()
+
+
+@lru_cache(maxsize=None)
+def load_interactive_engine() -> "InteractiveExplorationEngine":
+    """Get the interactive exploration engine."""
+    from .services.interactive_exploration import InteractiveExplorationEngine
+    return InteractiveExplorationEngine(
+        load_knowledge_base(), subproblems=load_conversion_engine().subproblems
+    )
+
+
+_ENGINE_GETTERS = {
+    "knowledge_base": load_knowledge_base,
+    "design_engine": load_design_engine,
+    "conversion_engine": load_conversion_engine,
+    "interactive_engine": load_interactive_engine,
+}
+
+
+# SI graph of the current DE graph, kept with its reachability index
+# until the DE graph changes
+_si_graph_cache: Dict[str, Any] = {}
+
+
+def current_si_graph() -> "SIGraph":
+    """Get the SI graph of the current DE graph, converting only on change."""
+    de_graph = load_design_engine().get_graph()
+    revision = (de_graph.uid, de_graph.revision)
+    if _si_graph_cache.get("revision") != revision:
+        _si_graph_cache["si_graph"] = load_conversion_engine().convert_de_to_si(de_graph)
+        _si_graph_cache["revision"] = revision
+    return _si_graph_cache["si_graph"]
+
+
+# Distinguishes this process's ETags from those of earlier processes,
+# whose revision counters started over, and from those of sibling
+# workers forked from the same master, whose counters diverge after
+# the fork
+_ETAG_EPOCH = os.urandom(6).hex()
+
+
+def _renew_etag_epoch() -> None:
+    """Give a forked process its own ETag epoch."""
+    global _ETAG_EPOCH
+    _ETAG_EPOCH = os.urandom(6).hex()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_renew_etag_epoch)
+
+
+def make_etag(kind: str, uid: int, revision: int, variant: str = "json") -> str:
+    """Build a strong ETag for a revision of a graph or knowledge base.
+
+    Args:
+        kind: Resource kind
+        uid: Identity of the graph or knowledge base
+        revision: Its revision
+        variant: Negotiated representation; each has its own ETag
+    """
+    suffix = "" if variant == "json" else f"-{variant}"
+    return f'"{kind}-{_ETAG_EPOCH}-{uid}-{revision}{suffix}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Get a 304 response if the client already holds this representation.
+
+    Args:
+        request: The incoming request
+        etag: ETag of the current representation
+
+    Returns:
+        304 response, or None if the representation must be sent
+    """
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return None
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == "*" or tag == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+def negotiated_variant(request: Request) -> str:
+    """Get the graph representation the client asked for."""
+    return representation(
+        request.headers.get("accept"), request.headers.get("accept-encoding")
+    )
+
+
+def graph_model(graph_dict: Dict[str, Any]) -> "GraphResponse":
+    """Validate a graph dictionary as a GraphResponse."""
+    return GraphResponse(
+        type=graph_dict["type"],
+        nodes=graph_dict["nodes"],
+        edges=graph_dict["edges"],
+        hierarchies=graph_dict.get("hierarchies")
+    )
+
+
+def json_response(content: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Serialize an already validated response body as JSON.
+
+    Returning a ready response skips FastAPI's own response_model pass,
+    so the "response_serialization" stage covers all the encoding work.
+
+    Args:
+        content: Body, possibly holding response models
+        headers: Extra response headers
+
+    Returns:
+        JSON response
+    """
+    with instrumentation.stage("response_serialization"):
+        body = to_json(content)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def graph_response(graph_dict: Dict[str, Any], variant: str, etag: str) -> Response:
+    """Serialize a graph dictionary in the negotiated representation.
+
+    Args:
+        graph_dict: Graph as produced by ``to_dict``
+        variant: "json", "compact" or "compact+gzip"
+        etag: ETag of the representation
+
+    Returns:
+        Ready JSON or compact response
+    """
+    if variant == "json":
+        with instrumentation.stage("response_validation"):
+            model = graph_model(graph_dict)
+        return json_response(
+            model, {"ETag": etag, "Vary": "Accept, Accept-Encoding"}
+        )
+
+    with instrumentation.stage("compact_encoding"):
+        body, headers = compact_body(graph_dict, variant == "compact+gzip")
+    headers["ETag"] = etag
+    return Response(body, media_type=COMPACT_MEDIA_TYPE, headers=headers)
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve legacy module-level engine names lazily."""
+    getter = _ENGINE_GETTERS.get(name)
+    if getter is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getter()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build engines at startup when eager startup is requested."""
+    if os.environ.get("CDSS_EAGER_STARTUP") == "1":
+        for getter in _ENGINE_GETTERS.values():
+            getter()
+    yield
 
-from .services.design_exploration import DesignExplorationEngine
-from .services.graph_conversion import GraphConversionEngine
-from .services.interactive_exploration import InteractiveExplorationEngine
-from .services.knowledge_base import KnowledgeBase
 
 app = FastAPI(
     title="Concept Design Support System",
     description="API for component-based concept design visualization",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for frontend communication
@@ -23,13 +230,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
-# Global engine instances
-knowledge_base = KnowledgeBase()
-design_engine = DesignExplorationEngine(knowledge_base)
-conversion_engine = GraphConversionEngine()
-interactive_engine = InteractiveExplorationEngine(knowledge_base)
+# Server-Timing headers and slow-request log for graph endpoints
+app.add_middleware(instrumentation.ServerTimingMiddleware)
+
+# On-demand sampling profiles (requests with an X-CDSS-Profile header)
+if instrumentation.PROFILING_ENABLED:
+    app.add_middleware(instrumentation.ProfilingMiddleware)
 
 
 # Request/Response models
@@ -41,6 +250,30 @@ class ExplorationRequest(BaseModel):
     intention: Optional[str] = None
 
 
+class SearchRequest(BaseModel):
+    """Request model for design space search."""
+    initial_system: str
+    # Cost model: "components" or "solutions"
+    cost: str = "components"
+    beam_width: Optional[int] = Field(default=None, ge=1)
+    max_nodes: int = 10000
+    time_budget_ms: Optional[float] = None
+
+
+class ReliabilityRequest(BaseModel):
+    """Request model for SI graph reliability evaluation."""
+    # Own failure probability by node or component ID
+    failure_probabilities: Dict[str, float] = {}
+    default_failure: float = 0.0
+    # "exact" (Monte Carlo beyond MAX_SHARED_NODES shared subsystems)
+    # or "monte_carlo"
+    method: str = "exact"
+    # At most reliability.MAX_TRIALS
+    trials: int = 1000000
+    seed: Optional[int] = None
+    node_id: Optional[str] = None
+
+
 class GraphResponse(BaseModel):
     """Response model for graph data."""
     type: str
@@ -49,6 +282,15 @@ class GraphResponse(BaseModel):
     hierarchies: Optional[Dict[str, List[str]]] = None
 
 
+class ResolveAlternativesRequest(BaseModel):
+    """Request to resolve ALT components of the SI graph into BUPs."""
+    # Selected subsystem keyed by ALT component ID or parent node ID
+    selections: Dict[str, str] = {}
+    # Named fallback policy ("first", "last"), or None to leave
+    # alternatives without a selection unresolved
+    policy: Optional[str] = "first"
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -57,11 +299,15 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "health": "/health",
+            "metrics": "/metrics",
             "explore": "/api/explore",
             "de_graph": "/api/graphs/de",
             "ld_graph": "/api/graphs/ld",
             "si_graph": "/api/graphs/si",
-            "convert": "/api/convert"
+            "convert": "/api/convert",
+            "search": "/api/search",
+            "resolve_alternatives": "/api/resolve-alternatives",
+            "reliability": "/api/reliability"
         }
     }
 
@@ -72,6 +318,31 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Expose instrumentation metrics in Prometheus text format."""
+    return PlainTextResponse(
+        instrumentation.metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/metrics/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str):
+    """Get a captured request profile as collapsed stacks.
+
+    Args:
+        profile_id: ID from the X-CDSS-Profile-Id response header
+
+    Returns:
+        Collapsed stack samples
+    """
+    profile = instrumentation.profiles.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(profile)
+
+
 @app.post("/api/explore", response_model=GraphResponse)
 async def explore_design(request: ExplorationRequest):
     """Execute design exploration and return DE graph.
@@ -83,6 +354,8 @@ async def explore_design(request: ExplorationRequest):
         DE graph data
     """
     try:
+        design_engine = load_design_engine()
+
         # Reset engine
         design_engine.reset()
 
@@ -102,72 +375,279 @@ async def explore_design(request: ExplorationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/search")
+async def search_design(request: SearchRequest):
+    """Search the design space for a low-cost design.
+
+    Args:
+        request: Initial system, cost model and search budget
+
+    Returns:
+        DE graph of the best design and search statistics
+    """
+    from .services.design_search import component_count_cost, solution_count_cost
+
+    cost_models = {
+        "components": component_count_cost,
+        "solutions": solution_count_cost,
+    }
+    cost_fn = cost_models.get(request.cost)
+    if cost_fn is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown cost model: {request.cost}"
+        )
+
+    try:
+        design_engine = load_design_engine()
+        design_engine.reset()
+
+        time_budget = (
+            request.time_budget_ms / 1000.0
+            if request.time_budget_ms is not None else None
+        )
+        result = design_engine.search(
+            request.initial_system,
+            cost_fn=cost_fn,
+            beam_width=request.beam_width,
+            max_nodes=request.max_nodes,
+            time_budget=time_budget
+        )
+        graph_dict = design_engine.get_graph().to_dict()
+
+        return {
+            "graph": GraphResponse(
+                type=graph_dict["type"],
+                nodes=graph_dict["nodes"],
+                edges=graph_dict["edges"]
+            ),
+            "search": result.to_dict()
+        }
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/api/graphs/de", response_model=GraphResponse)
-async def get_de_graph():
+async def get_de_graph(request: Request):
     """Get current DE graph.
 
     Returns:
-        DE graph data
+        DE graph data, or 304 if the client's ETag is current
     """
     try:
-        de_graph = design_engine.get_graph()
+        de_graph = load_design_engine().get_graph()
+        variant = negotiated_variant(request)
+        etag = make_etag("de", de_graph.uid, de_graph.revision, variant)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+
         graph_dict = de_graph.to_dict()
 
-        return GraphResponse(
-            type=graph_dict["type"],
-            nodes=graph_dict["nodes"],
-            edges=graph_dict["edges"]
-        )
+        return graph_response(graph_dict, variant, etag)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/graphs/ld", response_model=GraphResponse)
-async def get_ld_graph():
+async def get_ld_graph(request: Request):
     """Get LD graph converted from current DE graph.
 
     Returns:
-        LD graph data
+        LD graph data, or 304 if the client's ETag is current
     """
     try:
-        de_graph = design_engine.get_graph()
+        de_graph = load_design_engine().get_graph()
+        variant = negotiated_variant(request)
+        etag = make_etag("ld", de_graph.uid, de_graph.revision, variant)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
 
         # Convert to LD graph
-        ld_graph = conversion_engine.convert_de_to_ld(de_graph)
+        ld_graph = load_conversion_engine().convert_de_to_ld(de_graph)
         graph_dict = ld_graph.to_dict()
 
-        return GraphResponse(
-            type=graph_dict["type"],
-            nodes=graph_dict["nodes"],
-            edges=graph_dict["edges"]
-        )
+        return graph_response(graph_dict, variant, etag)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/graphs/si", response_model=GraphResponse)
-async def get_si_graph():
+async def get_si_graph(request: Request):
     """Get SI graph converted from current DE graph.
 
     Returns:
-        SI graph data
+        SI graph data, or 304 if the client's ETag is current
     """
     try:
-        de_graph = design_engine.get_graph()
-
-        # Convert to SI graph
-        si_graph = conversion_engine.convert_de_to_si(de_graph)
+        de_graph = load_design_engine().get_graph()
+        variant = negotiated_variant(request)
+        etag = make_etag("si", de_graph.uid, de_graph.revision, variant)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+
+        # Converted SI graph, shared with the reachability queries
+        si_graph = current_si_graph()
         graph_dict = si_graph.to_dict()
 
-        return GraphResponse(
-            type=graph_dict["type"],
-            nodes=graph_dict["nodes"],
-            edges=graph_dict["edges"],
-            hierarchies=graph_dict.get("hierarchies")
-        )
+        return graph_response(graph_dict, variant, etag)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/graphs/si/ancestors/{node_id:path}")
+async def get_si_ancestors(node_id: str, roots_only: bool = False):
+    """Get every node above a node of the current SI graph.
+
+    Args:
+        node_id: Node or component ID
+        roots_only: Only return top-level root nodes
+
+    Returns:
+        Node ID and the IDs of its ancestors
+    """
+    try:
+        ancestors = current_si_graph().ancestors(node_id, roots_only=roots_only)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown node: {node_id}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"node_id": node_id, "ancestors": ancestors}
+
+
+@app.get("/api/graphs/si/descendants/{node_id:path}")
+async def get_si_descendants(node_id: str):
+    """Get every node beneath a node of the current SI graph.
+
+    Args:
+        node_id: Node or component ID
+
+    Returns:
+        Node ID and the IDs of its descendants
+    """
+    try:
+        descendants = current_si_graph().descendants(node_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown node: {node_id}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"node_id": node_id, "descendants": descendants}
+
+
+@app.get("/api/graphs/si/situations")
+async def get_si_situations():
+    """Get the situations CND components of the current SI graph branch on.
+
+    Returns:
+        Situation names
+    """
+    try:
+        return {"situations": current_si_graph().situations()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/graphs/si/situations/{situation:path}")
+async def get_si_active_subsystems(situation: str):
+    """Get the subsystems active in a situation.
+
+    Args:
+        situation: The situation
+
+    Returns:
+        Active subsystems and the CND component activating each
+    """
+    try:
+        conditions = current_si_graph().conditions_for(situation)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if not conditions:
+        raise HTTPException(status_code=404, detail=f"Unknown situation: {situation}")
+    return {
+        "situation": situation,
+        "active_subsystems": list(conditions),
+        "conditions": conditions
+    }
+
+
+@app.get("/api/graphs/si/configurations")
+async def get_si_configurations(samples: int = 0, seed: Optional[int] = None):
+    """Count the configurations of the current SI graph.
+
+    Args:
+        samples: Number of uniformly sampled configurations to return
+        seed: Optional random seed for reproducible samples
+
+    Returns:
+        Configuration counts and samples
+    """
+    import random
+    from .services.configuration_space import ConfigurationSpace
+
+    if samples < 0:
+        raise HTTPException(status_code=400, detail="samples must be >= 0")
+
+    try:
+        space = ConfigurationSpace(current_si_graph())
+        result = space.to_dict()
+        result["samples"] = space.samples(samples, random.Random(seed)) if samples else []
+        return result
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/reliability")
+def evaluate_reliability(request: ReliabilityRequest):
+    """Evaluate the reliability of the current SI graph.
+
+    Exact evaluation falls back to Monte Carlo simulation when the SI
+    graph shares too many subsystems; the result's ``exact`` flag tells
+    which was used. The evaluation is CPU-bound, so this is a plain
+    ``def`` handler that FastAPI runs in its thread pool instead of on
+    the event loop.
 
+    Args:
+        request: Failure probabilities and evaluation method
+
+    Returns:
+        Reliability result
+    """
+    from .services.reliability import ReliabilityModel
+
+    if request.method not in ("exact", "monte_carlo"):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown method: {request.method}"
+        )
+    try:
+        model = ReliabilityModel(
+            current_si_graph(),
+            request.failure_probabilities,
+            request.default_failure
+        )
+        if request.method == "exact" and model.can_evaluate_exactly():
+            result = model.exact(request.node_id)
+        else:
+            result = model.monte_carlo(request.trials, request.seed, request.node_id)
+        return result.to_dict()
+
+    except KeyError:
+        raise HTTPException(
+            status_code=404, detail=f"Unknown node: {request.node_id}"
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -180,38 +660,66 @@ async def convert_graphs():
         All three graph representations
     """
     try:
-        de_graph = design_engine.get_graph()
+        de_graph = load_design_engine().get_graph()
 
         # Get DE graph
         de_dict = de_graph.to_dict()
 
         # Convert to LD
-        ld_graph = conversion_engine.convert_de_to_ld(de_graph)
+        ld_graph = load_conversion_engine().convert_de_to_ld(de_graph)
         ld_dict = ld_graph.to_dict()
 
         # Convert to SI
-        si_graph = conversion_engine.convert_de_to_si(de_graph)
+        si_graph = load_conversion_engine().convert_de_to_si(de_graph)
         si_dict = si_graph.to_dict()
 
-        return {
-            "de": GraphResponse(
-                type=de_dict["type"],
-                nodes=de_dict["nodes"],
-                edges=de_dict["edges"]
-            ),
-            "ld": GraphResponse(
-                type=ld_dict["type"],
-                nodes=ld_dict["nodes"],
-                edges=ld_dict["edges"]
-            ),
-            "si": GraphResponse(
-                type=si_dict["type"],
-                nodes=si_dict["nodes"],
-                edges=si_dict["edges"],
-                hierarchies=si_dict.get("hierarchies")
+        with instrumentation.stage("response_validation"):
+            graphs = {
+                "de": graph_model(de_dict),
+                "ld": graph_model(ld_dict),
+                "si": graph_model(si_dict)
+            }
+        return json_response(graphs)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/resolve-alternatives", response_model=GraphResponse)
+async def resolve_alternatives(request: ResolveAlternativesRequest):
+    """Get SI graph with its alternatives resolved into backups.
+
+    Args:
+        request: Selections and fallback policy
+
+    Returns:
+        SI graph data with ALT components replaced by BUP components
+    """
+    from .services.graph_conversion import ALTERNATIVE_POLICIES
+
+    policy = None
+    if request.policy is not None:
+        policy = ALTERNATIVE_POLICIES.get(request.policy)
+        if policy is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown policy: {request.policy}"
             )
-        }
 
+    try:
+        de_graph = load_design_engine().get_graph()
+        engine = load_conversion_engine()
+
+        si_graph = engine.convert_de_to_si(de_graph)
+        engine.resolve_alternatives(si_graph, request.selections, policy)
+        graph_dict = si_graph.to_dict()
+
+        with instrumentation.stage("response_validation"):
+            model = graph_model(graph_dict)
+        return json_response(model)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -244,38 +752,41 @@ async def get_component_types():
 
 # Interactive Exploration Endpoints
 
-class StartExplorationRequest(BaseModel):
-    """Request to start interactive exploration."""
-    initial_system: str
-
-
 class StepRequest(BaseModel):
     """Request for a step in exploration."""
-    pass
+    # Return the whole DE graph, not only the components the step added
+    include_graph: bool = False
 
 
-class SituationRequest(BaseModel):
+class StartExplorationRequest(StepRequest):
+    """Request to start interactive exploration."""
+    initial_system: str
+    # Order of pending subsystems: "dfs" (default), "bfs" or "priority"
+    queue_order: Optional[str] = None
+
+
+class SituationRequest(StepRequest):
     """Request to assess situation."""
     situation: str
 
 
-class ProblemRequest(BaseModel):
+class ProblemRequest(StepRequest):
     """Request to identify problem."""
     problem: str
 
 
-class IntentionRequest(BaseModel):
+class IntentionRequest(StepRequest):
     """Request to establish intention."""
     intention: str
 
 
-class DecomposeRequest(BaseModel):
+class DecomposeRequest(StepRequest):
     """Request to decompose intention."""
     sub_intentions: List[str]
     sub_systems: List[str]
 
 
-class SolutionRequest(BaseModel):
+class SolutionRequest(StepRequest):
     """Request to apply solution."""
     solution: str
 
@@ -291,9 +802,13 @@ async def start_interactive_exploration(request: StartExplorationRequest):
         Next step information
     """
     try:
-        interactive_engine.reset()
-        result = interactive_engine.start_exploration(request.initial_system)
+        # Starting resets the engine, once the request is validated
+        result = load_interactive_engine().start_exploration(
+            request.initial_system, request.queue_order, request.include_graph
+        )
         return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -309,7 +824,9 @@ async def assess_situation_step(request: SituationRequest):
         Next step information
     """
     try:
-        result = interactive_engine.assess_situation(request.situation)
+        result = load_interactive_engine().assess_situation(
+            request.situation, request.include_graph
+        )
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -326,7 +843,9 @@ async def identify_problem_step(request: ProblemRequest):
         Next step information
     """
     try:
-        result = interactive_engine.identify_problem(request.problem)
+        result = load_interactive_engine().identify_problem(
+            request.problem, request.include_graph
+        )
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -343,7 +862,9 @@ async def establish_intention_step(request: IntentionRequest):
         Next step information
     """
     try:
-        result = interactive_engine.establish_intention(request.intention)
+        result = load_interactive_engine().establish_intention(
+            request.intention, request.include_graph
+        )
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -360,9 +881,10 @@ async def decompose_intention_step(request: DecomposeRequest):
         Next step information
     """
     try:
-        result = interactive_engine.decompose_intention(
+        result = load_interactive_engine().decompose_intention(
             request.sub_intentions,
-            request.sub_systems
+            request.sub_systems,
+            request.include_graph
         )
         return result
     except Exception as e:
@@ -380,7 +902,9 @@ async def apply_solution_step(request: SolutionRequest):
         Next step information
     """
     try:
-        result = interactive_engine.apply_solution(request.solution)
+        result = load_interactive_engine().apply_solution(
+            request.solution, request.include_graph
+        )
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -394,31 +918,70 @@ async def get_exploration_state():
         Current state information
     """
     try:
-        return interactive_engine.get_current_state()
+        return load_interactive_engine().get_current_state()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/knowledge-base")
-async def get_knowledge_base():
+async def get_knowledge_base(request: Request, response: Response):
     """Get knowledge base contents.
 
     Returns:
-        Knowledge base data
+        Knowledge base data, or 304 if the client's ETag is current
     """
     try:
-        return knowledge_base.to_dict()
+        kb = load_knowledge_base()
+        etag = make_etag("kb", kb.uid, kb.revision)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+        response.headers["ETag"] = etag
+        return kb.to_dict()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/knowledge-base/systems")
-async def get_all_systems():
+async def get_all_systems(request: Request, response: Response):
     """Get all known systems from knowledge base."""
     try:
-        return {"systems": knowledge_base.get_all_systems()}
+        kb = load_knowledge_base()
+        etag = make_etag("kb-systems", kb.uid, kb.revision)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+        response.headers["ETag"] = etag
+        return {"systems": kb.get_all_systems()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/knowledge-base/suggest")
+async def suggest_names(term: str, view: str = "systems", limit: int = 5):
+    """Suggest known names similar to a possibly misspelled term.
+
+    Args:
+        term: Name as the designer wrote it
+        view: "systems", "situations", "problems" or "intentions"
+        limit: Maximum number of suggestions
+
+    Returns:
+        Suggested names with their similarity, most similar first
+    """
+    try:
+        suggestions = load_knowledge_base().suggest(term, view, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "term": term,
+        "view": view,
+        "suggestions": [
+            {"name": name, "score": round(score, 3)} for name, score in suggestions
+        ]
+    }
 
 
 if __name__ == "__main__":
@@ -0,0 +1,239 @@
+"""Storage backends for DE, LD, and SI graphs.
+
+Graphs are stored either in a ``networkx.DiGraph`` or in the lightweight
+``AdjacencyDiGraph`` below, which implements only the subset of the
+DiGraph interface the graph classes use.
+"""
+
+import os
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+NETWORKX_BACKEND = "networkx"
+ADJACENCY_BACKEND = "adjacency"
+
+GRAPH_BACKENDS = (NETWORKX_BACKEND, ADJACENCY_BACKEND)
+
+# Backend used when a graph is created without an explicit choice
+DEFAULT_GRAPH_BACKEND = os.environ.get("CDSS_GRAPH_BACKEND", NETWORKX_BACKEND)
+
+
+class _NodeView:
+    """Read-only view over node attributes, mirroring ``DiGraph.nodes``."""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node: Dict[Hashable, Dict[str, Any]]):
+        self._node = node
+
+    def __call__(self) -> "_NodeView":
+        return self
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._node)
+
+    def __len__(self) -> int:
+        return len(self._node)
+
+    def __contains__(self, node_id: Hashable) -> bool:
+        return node_id in self._node
+
+    def __getitem__(self, node_id: Hashable) -> Dict[str, Any]:
+        return self._node[node_id]
+
+
+class _EdgeView:
+    """Edge iteration view, mirroring ``DiGraph.edges``."""
+
+    __slots__ = ("_succ",)
+
+    def __init__(self, succ: Dict[Hashable, Dict[Hashable, Dict[str, Any]]]):
+        self._succ = succ
+
+    def __call__(self, data: Any = False, default: Any = None) -> List[Tuple]:
+        if data is False:
+            return list(self)
+        if data is True:
+            return [
+                (u, v, attrs)
+                for u, nbrs in self._succ.items()
+                for v, attrs in nbrs.items()
+            ]
+        return [
+            (u, v, attrs.get(data, default))
+            for u, nbrs in self._succ.items()
+            for v, attrs in nbrs.items()
+        ]
+
+    def __iter__(self) -> Iterator[Tuple[Hashable, Hashable]]:
+        for u, nbrs in self._succ.items():
+            for v in nbrs:
+                yield (u, v)
+
+    def __len__(self) -> int:
+        return sum(len(nbrs) for nbrs in self._succ.values())
+
+
+class AdjacencyDiGraph:
+    """Directed graph over plain successor/predecessor dicts.
+
+    Supports add/remove of nodes and edges, in/out edges, neighbors and
+    iteration with the same call signatures as ``networkx.DiGraph``, so
+    graph classes can use either backend interchangeably. Predecessor
+    maps hold no attributes; edge attributes live only on the successor
+    side.
+    """
+
+    __slots__ = ("_node", "_succ", "_pred")
+
+    def __init__(self):
+        self._node: Dict[Hashable, Dict[str, Any]] = {}
+        self._succ: Dict[Hashable, Dict[Hashable, Dict[str, Any]]] = {}
+        self._pred: Dict[Hashable, Dict[Hashable, None]] = {}
+
+    @property
+    def nodes(self) -> _NodeView:
+        """Node view supporting iteration, membership and attributes."""
+        return _NodeView(self._node)
+
+    @property
+    def edges(self) -> _EdgeView:
+        """Edge view supporting iteration and ``edges(data=...)``."""
+        return _EdgeView(self._succ)
+
+    def add_node(self, node_id: Hashable, **attrs) -> None:
+        """Add a node, updating attributes if it already exists."""
+        if node_id not in self._node:
+            self._node[node_id] = attrs
+            self._succ[node_id] = {}
+            self._pred[node_id] = {}
+        else:
+            self._node[node_id].update(attrs)
+
+    def add_edge(self, source: Hashable, target: Hashable, **attrs) -> None:
+        """Add an edge, creating missing endpoints."""
+        if source not in self._node:
+            self.add_node(source)
+        if target not in self._node:
+            self.add_node(target)
+
+        edge_attrs = self._succ[source].get(target)
+        if edge_attrs is None:
+            self._succ[source][target] = attrs
+            self._pred[target][source] = None
+        else:
+            edge_attrs.update(attrs)
+
+    def remove_node(self, node_id: Hashable) -> None:
+        """Remove a node and all incident edges."""
+        if node_id not in self._node:
+            raise KeyError(f"Node {node_id!r} is not in the graph")
+
+        for target in self._succ[node_id]:
+            del self._pred[target][node_id]
+        for source in self._pred[node_id]:
+            del self._succ[source][node_id]
+
+        del self._node[node_id]
+        del self._succ[node_id]
+        del self._pred[node_id]
+
+    def remove_edge(self, source: Hashable, target: Hashable) -> None:
+        """Remove an edge."""
+        try:
+            del self._succ[source][target]
+            del self._pred[target][source]
+        except KeyError:
+            raise KeyError(f"Edge {source!r}->{target!r} is not in the graph")
+
+    def has_node(self, node_id: Hashable) -> bool:
+        """Check whether a node exists."""
+        return node_id in self._node
+
+    def has_edge(self, source: Hashable, target: Hashable) -> bool:
+        """Check whether an edge exists."""
+        return target in self._succ.get(source, ())
+
+    def in_edges(self, node_id: Hashable) -> List[Tuple[Hashable, Hashable]]:
+        """Get incoming edges of a node as (source, target) pairs."""
+        return [(source, node_id) for source in self._pred.get(node_id, ())]
+
+    def out_edges(self, node_id: Hashable) -> List[Tuple[Hashable, Hashable]]:
+        """Get outgoing edges of a node as (source, target) pairs."""
+        return [(node_id, target) for target in self._succ.get(node_id, ())]
+
+    def neighbors(self, node_id: Hashable) -> Iterator[Hashable]:
+        """Iterate over successors of a node."""
+        return iter(self._succ[node_id])
+
+    successors = neighbors
+
+    def predecessors(self, node_id: Hashable) -> Iterator[Hashable]:
+        """Iterate over predecessors of a node."""
+        return iter(self._pred[node_id])
+
+    def number_of_nodes(self) -> int:
+        """Get the number of nodes."""
+        return len(self._node)
+
+    def number_of_edges(self) -> int:
+        """Get the number of edges."""
+        return sum(len(nbrs) for nbrs in self._succ.values())
+
+    def to_networkx(self) -> Any:
+        """Copy the graph into a ``networkx.DiGraph``."""
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self._node.items())
+        graph.add_edges_from(self.edges(data=True))
+        return graph
+
+    def __getitem__(self, node_id: Hashable) -> Dict[Hashable, Dict[str, Any]]:
+        return self._succ[node_id]
+
+    def __contains__(self, node_id: Hashable) -> bool:
+        return node_id in self._node
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._node)
+
+    def __len__(self) -> int:
+        return len(self._node)
+
+    def __repr__(self) -> str:
+        return (
+            f"AdjacencyDiGraph(nodes={self.number_of_nodes()}, "
+            f"edges={self.number_of_edges()})"
+        )
+
+
+def create_digraph(backend: Optional[str] = None) -> Any:
+    """Create an empty directed graph for the given backend.
+
+    Args:
+        backend: "networkx" or "adjacency"; defaults to
+            ``DEFAULT_GRAPH_BACKEND``
+
+    Returns:
+        A ``networkx.DiGraph`` or ``AdjacencyDiGraph``
+    """
+    backend = backend or DEFAULT_GRAPH_BACKEND
+
+    if backend == NETWORKX_BACKEND:
+        import networkx as nx
+        return nx.DiGraph()
+    if backend == ADJACENCY_BACKEND:
+        return AdjacencyDiGraph()
+
+    raise ValueError(
+        f"Unknown graph backend: {backend!r} (expected one of {GRAPH_BACKENDS})"
+    )
+
+
+def to_networkx(graph: Any) -> Any:
+    """Return a ``networkx.DiGraph`` for a graph of any backend."""
+    converter = getattr(graph, "to_networkx", None)
+    if converter is not None:
+        # Backends other than networkx copy themselves
+        return converter()
+    return graph
@@ -0,0 +1,999 @@
+"""Memory-mapped, read-only graph files.
+
+A graph file holds one DE, LD or SI graph in flat columnar sections
+that are used in place through ``mmap``. Opening a file reads only its
+header, and every worker process that maps the same file shares one
+copy of it in the page cache.
+
+Layout (native byte order, every section aligned to 8 bytes)::
+
+    b"CDSSGRPH"  uint32 header length  JSON header  sections...
+
+Sections:
+
+- ``string_offsets``/``strings``: string pool. Node IDs come first,
+  in node order, followed by the other strings the graph refers to.
+- ``id_table``: open-addressing hash table (CRC-32, linear probing)
+  mapping node IDs to node indices.
+- ``node_attrs``, ``node_types``, ``component_offsets``/``components``:
+  node table. Each node has an index into a table of distinct
+  attribute dicts, an index into the header's ``labels`` for its
+  component type (-1 for none) and its encoded component, if any.
+- ``out_indptr``/``out_indices``/``out_attrs``/``out_logic`` and
+  ``in_indptr``/``in_indices``/``in_logic``: edge arrays in CSR form,
+  with an index into a table of distinct edge attribute dicts and the
+  logic code of each edge.
+- ``level_indptr``/``level_nodes``: SI hierarchy levels as string
+  indices, with level keys in the header.
+- ``link_sources``/``link_targets``: SI reachability links from
+  subsystems to components and components to parents.
+
+Attribute dicts and components are stored as JSON, with tuples, enums
+and component models tagged by type. Decoding only ever builds JSON
+values and the known model and enum classes below, so loading a file
+cannot run code. They are decoded only when accessed, and cached per
+process.
+
+Graph files are a library feature for the SDK and scripts; the API
+server and ``preload()`` do not load them.
+"""
+
+import json
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from enum import Enum
+from typing import (
+    Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+)
+
+from pydantic import BaseModel
+
+from .component import ComponentType, Port, PortDirection
+from .de_components import (
+    SIComponent, PIComponent, EIComponent, DIComponent, CBComponent, SAComponent
+)
+from .graph_index import CSRAdjacency, GraphIndex, ReachabilityIndex, logic_code
+from .graphs import (
+    DEGraph, LDGraph, LogicOperator, SIGraph, _graph_ids, _hierarchy_links,
+    _type_key, situation_entries
+)
+from .si_components import (
+    CNDComponent, BUPComponent, COLComponent, ALTComponent, EXOComponent
+)
+
+MAGIC = b"CDSSGRPH"
+FORMAT_VERSION = 2
+
+ALIGNMENT = 8
+EMPTY_SLOT = 0xFFFFFFFF
+
+# Classes whose values graph files can store, by name
+STORED_MODELS: Dict[str, type] = {cls.__name__: cls for cls in (
+    Port,
+    SIComponent, PIComponent, EIComponent, DIComponent, CBComponent, SAComponent,
+    CNDComponent, BUPComponent, COLComponent, ALTComponent, EXOComponent,
+)}
+STORED_ENUMS: Dict[str, type] = {cls.__name__: cls for cls in (
+    ComponentType, PortDirection, LogicOperator,
+)}
+
+GRAPH_KINDS = {DEGraph: "DE", LDGraph: "LD", SIGraph: "SI"}
+
+AnyGraph = Union[DEGraph, LDGraph, SIGraph]
+
+
+def _read_only(self, *args, **kwargs) -> None:
+    raise TypeError(f"{type(self).__name__} is read-only")
+
+
+def _table_size(num_keys: int) -> int:
+    """Get a power-of-two hash table size with load factor at most 1/2."""
+    size = 8
+    while size < 2 * num_keys:
+        size *= 2
+    return size
+
+
+def _encode(value: Any) -> Any:
+    """Encode a value as JSON data, tagging what JSON cannot express.
+
+    Raises:
+        ValueError: If the value (or a part of it) cannot be stored
+    """
+    if isinstance(value, Enum):
+        name = type(value).__name__
+        if STORED_ENUMS.get(name) is not type(value):
+            raise ValueError(f"Graph files cannot store {name} values")
+        return {"e": [name, value.value]}
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, tuple):
+        return {"t": [_encode(item) for item in value]}
+    if isinstance(value, dict):
+        return {"m": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, BaseModel):
+        name = type(value).__name__
+        if STORED_MODELS.get(name) is not type(value):
+            raise ValueError(f"Graph files cannot store {name} values")
+        return {"c": [name, {
+            field: _encode(getattr(value, field)) for field in type(value).model_fields
+        }]}
+    raise ValueError(f"Graph files cannot store {type(value).__name__} values")
+
+
+def _decode(data: Any) -> Any:
+    """Rebuild a value from its JSON data.
+
+    Raises:
+        ValueError: If the data names an unknown tag, model or enum
+    """
+    if isinstance(data, list):
+        return [_decode(item) for item in data]
+    if not isinstance(data, dict):
+        return data
+    ((tag, body),) = data.items()
+    if tag == "t":
+        return tuple(_decode(item) for item in body)
+    if tag == "m":
+        return {_decode(k): _decode(v) for k, v in body}
+    if tag == "e" and body[0] in STORED_ENUMS:
+        return STORED_ENUMS[body[0]](body[1])
+    if tag == "c" and body[0] in STORED_MODELS:
+        fields = {field: _decode(value) for field, value in body[1].items()}
+        # Stored values were validated when the model was created
+        return STORED_MODELS[body[0]].model_construct(**fields)
+    raise ValueError(f"Unknown value in graph file: {tag!r}")
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(_encode(value), separators=(",", ":")).encode("utf-8")
+
+
+def _loads(blob: Any) -> Any:
+    return _decode(json.loads(bytes(blob)))
+
+
+class _SectionWriter:
+    """Collects typed sections and lays them out after the header."""
+
+    def __init__(self):
+        self.sections: List[Tuple[str, str, bytes]] = []
+
+    def add(self, name: str, typecode: str, values: Any) -> None:
+        data = values.tobytes() if isinstance(values, array) else bytes(values)
+        self.sections.append((name, typecode, data))
+
+    def add_blobs(self, name: str, blobs: List[bytes]) -> None:
+        """Add variable-length blobs as an offsets section and a data section."""
+        offsets = array('Q', [0])
+        total = 0
+        for blob in blobs:
+            total += len(blob)
+            offsets.append(total)
+        self.add(f"{name}_offsets", 'Q', offsets)
+        self.add(name, 'B', b"".join(blobs))
+
+    def write(self, path: str, header: Dict[str, Any]) -> None:
+        # Offsets depend on the header length, which depends on the
+        # offsets; reserve room by measuring with placeholder offsets.
+        layout: Dict[str, List[Any]] = {
+            name: [0, typecode, len(data)] for name, typecode, data in self.sections
+        }
+        header = dict(header, sections=layout)
+        prefix = len(MAGIC) + 4
+        start = prefix + len(json.dumps(header)) + 64 * len(layout)
+        start += -start % ALIGNMENT
+
+        offset = start
+        for name, _, data in self.sections:
+            layout[name][0] = offset
+            offset += len(data) + (-len(data) % ALIGNMENT)
+        encoded = json.dumps(header).encode("utf-8")
+        if prefix + len(encoded) > start:
+            raise ValueError("Graph file header does not fit its reserved space")
+
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(encoded)))
+            f.write(encoded)
+            f.write(bytes(start - prefix - len(encoded)))
+            for _, _, data in self.sections:
+                f.write(data)
+                f.write(bytes(-len(data) % ALIGNMENT))
+
+
+def save_graph(graph: AnyGraph, path: str) -> None:
+    """Write a DE, LD or SI graph as a memory-mappable graph file.
+
+    Args:
+        graph: The graph (mapped graphs can be saved again)
+        path: Destination path
+
+    Raises:
+        ValueError: If a node ID is not a string, or an attribute or
+            component holds a value graph files cannot store
+    """
+    kind = next(
+        (k for cls, k in GRAPH_KINDS.items() if isinstance(graph, cls)), None
+    )
+    if kind is None:
+        raise ValueError(f"Cannot save {type(graph).__name__} as a graph file")
+    digraph = graph.graph
+
+    node_ids = list(digraph.nodes())
+    for node_id in node_ids:
+        if not isinstance(node_id, str):
+            raise ValueError(f"Graph files need string node IDs, got {node_id!r}")
+    strings: List[str] = list(node_ids)
+    string_index = {node_id: i for i, node_id in enumerate(node_ids)}
+
+    def intern(value: Any) -> int:
+        value = str(value)
+        i = string_index.get(value)
+        if i is None:
+            i = string_index[value] = len(strings)
+            strings.append(value)
+        return i
+
+    # Node table
+    labels: List[str] = []
+    label_index: Dict[str, int] = {}
+    attr_blobs: List[bytes] = []
+    attr_index: Dict[bytes, int] = {}
+    node_attrs = array('I')
+    node_types = array('i')
+    components: List[bytes] = []
+
+    def attrs_ref(attrs: Dict[str, Any]) -> int:
+        blob = _dumps(attrs)
+        i = attr_index.get(blob)
+        if i is None:
+            i = attr_index[blob] = len(attr_blobs)
+            attr_blobs.append(blob)
+        return i
+
+    for node_id in node_ids:
+        attrs = dict(digraph.nodes[node_id])
+        component = attrs.pop("component", None)
+        node_attrs.append(attrs_ref(attrs))
+        if component is None:
+            node_types.append(-1)
+            components.append(b"")
+            continue
+        label = str(_type_key(component.type))
+        if label not in label_index:
+            label_index[label] = len(labels)
+            labels.append(label)
+        node_types.append(label_index[label])
+        components.append(_dumps(component))
+
+    # Edge arrays; rows keep the insertion order of successors
+    num_nodes = len(node_ids)
+    out_indptr = array('Q', [0])
+    out_indices = array('I')
+    out_attrs = array('I')
+    out_logic = array('b')
+    edge_attr_blobs: List[bytes] = []
+    edge_attr_index: Dict[bytes, int] = {}
+    in_rows: List[List[Tuple[int, int]]] = [[] for _ in range(num_nodes)]
+    for source, node_id in enumerate(node_ids):
+        for target_id, attrs in digraph[node_id].items():
+            target = string_index[target_id]
+            blob = _dumps(dict(attrs))
+            k = edge_attr_index.get(blob)
+            if k is None:
+                k = edge_attr_index[blob] = len(edge_attr_blobs)
+                edge_attr_blobs.append(blob)
+            code = logic_code(attrs.get("logic"))
+            out_indices.append(target)
+            out_attrs.append(k)
+            out_logic.append(code)
+            in_rows[target].append((source, code))
+        out_indptr.append(len(out_indices))
+
+    in_indptr = array('Q', [0])
+    in_indices = array('I')
+    in_logic = array('b')
+    for row in in_rows:
+        for source, code in row:
+            in_indices.append(source)
+            in_logic.append(code)
+        in_indptr.append(len(in_indices))
+
+    # SI hierarchy levels and reachability links
+    level_keys: List[str] = []
+    level_indptr = array('Q', [0])
+    level_nodes = array('I')
+    link_sources = array('I')
+    link_targets = array('I')
+    if isinstance(graph, SIGraph):
+        for level_key, members in graph.hierarchies.items():
+            level_keys.append(level_key)
+            level_nodes.extend(intern(member) for member in members)
+            level_indptr.append(len(level_nodes))
+        for component in graph.components.values():
+            for source, target in _hierarchy_links(component):
+                link_sources.append(intern(source))
+                link_targets.append(intern(target))
+
+    # Node ID hash table
+    size = _table_size(num_nodes)
+    id_table = array('I', [EMPTY_SLOT]) * size
+    for i, node_id in enumerate(node_ids):
+        slot = zlib.crc32(node_id.encode("utf-8")) & (size - 1)
+        while id_table[slot] != EMPTY_SLOT:
+            slot = (slot + 1) & (size - 1)
+        id_table[slot] = i
+
+    writer = _SectionWriter()
+    writer.add_blobs("strings", [s.encode("utf-8") for s in strings])
+    writer.add("id_table", 'I', id_table)
+    writer.add("node_attrs", 'I', node_attrs)
+    writer.add("node_types", 'i', node_types)
+    writer.add_blobs("components", components)
+    writer.add_blobs("attr_table", attr_blobs)
+    writer.add_blobs("edge_attr_table", edge_attr_blobs)
+    writer.add("out_indptr", 'Q', out_indptr)
+    writer.add("out_indices", 'I', out_indices)
+    writer.add("out_attrs", 'I', out_attrs)
+    writer.add("out_logic", 'b', out_logic)
+    writer.add("in_indptr", 'Q', in_indptr)
+    writer.add("in_indices", 'I', in_indices)
+    writer.add("in_logic", 'b', in_logic)
+    writer.add("level_indptr", 'Q', level_indptr)
+    writer.add("level_nodes", 'I', level_nodes)
+    writer.add("link_sources", 'I', link_sources)
+    writer.add("link_targets", 'I', link_targets)
+    writer.write(path, {
+        "version": FORMAT_VERSION,
+        "kind": kind,
+        "byteorder": sys.byteorder,
+        "num_nodes": num_nodes,
+        "num_edges": len(out_indices),
+        "num_components": sum(1 for blob in components if blob),
+        "labels": labels,
+        "levels": level_keys,
+    })
+
+
+class GraphFile:
+    """A graph file mapped into memory.
+
+    Sections are exposed as typed ``memoryview`` objects over the
+    mapping; nothing is copied when the file is opened.
+    """
+
+    def __init__(self, path: str):
+        """Map a graph file.
+
+        Args:
+            path: Path to a file written by ``save_graph``
+
+        Raises:
+            ValueError: If the file is not a graph file this version can read
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.header = self._read_header()
+        except Exception:
+            self._mmap.close()
+            raise
+
+        self.kind: str = self.header["kind"]
+        self.num_nodes: int = self.header["num_nodes"]
+        self.num_edges: int = self.header["num_edges"]
+        self.labels: List[str] = self.header["labels"]
+        self.levels: List[str] = self.header["levels"]
+
+        self._views: List[memoryview] = []
+        section = self._section
+        self.string_offsets = section("strings_offsets")
+        self.strings = section("strings")
+        self.id_table = section("id_table")
+        self.node_attrs = section("node_attrs")
+        self.node_types = section("node_types")
+        self.component_offsets = section("components_offsets")
+        self.components = section("components")
+        self.attr_offsets = section("attr_table_offsets")
+        self.attr_table = section("attr_table")
+        self.edge_attr_offsets = section("edge_attr_table_offsets")
+        self.edge_attr_table = section("edge_attr_table")
+        self.out_indptr = section("out_indptr")
+        self.out_indices = section("out_indices")
+        self.out_attrs = section("out_attrs")
+        self.out_logic = section("out_logic")
+        self.in_indptr = section("in_indptr")
+        self.in_indices = section("in_indices")
+        self.in_logic = section("in_logic")
+        self.level_indptr = section("level_indptr")
+        self.level_nodes = section("level_nodes")
+        self.link_sources = section("link_sources")
+        self.link_targets = section("link_targets")
+
+        # Decoded on first access, per process
+        self._attrs: Dict[int, Dict[str, Any]] = {}
+        self._edge_attrs: Dict[int, Dict[str, Any]] = {}
+        self._components: Dict[int, Any] = {}
+
+    def _read_header(self) -> Dict[str, Any]:
+        buffer = self._mmap
+        if buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path} is not a graph file")
+        (length,) = struct.unpack_from("<I", buffer, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(buffer[start:start + length]))
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported graph file version: {header.get('version')!r}"
+            )
+        if header.get("byteorder") != sys.byteorder:
+            raise ValueError(
+                f"Graph file was written on a {header.get('byteorder')}-endian machine"
+            )
+        return header
+
+    def _section(self, name: str) -> memoryview:
+        offset, typecode, length = self.header["sections"][name]
+        view = memoryview(self._mmap)[offset:offset + length]
+        self._views.append(view)
+        if typecode != 'B':
+            view = view.cast(typecode)
+            self._views.append(view)
+        return view
+
+    def string(self, i: int) -> str:
+        """Get a string from the pool."""
+        return str(self.strings[self.string_offsets[i]:self.string_offsets[i + 1]], "utf-8")
+
+    def index_of(self, node_id: Any) -> Optional[int]:
+        """Get the index of a node, or None if it is not in the graph."""
+        if not isinstance(node_id, str):
+            return None
+        key = node_id.encode("utf-8")
+        table = self.id_table
+        mask = len(table) - 1
+        slot = zlib.crc32(key) & mask
+        offsets = self.string_offsets
+        strings = self.strings
+        while True:
+            i = table[slot]
+            if i == EMPTY_SLOT:
+                return None
+            if strings[offsets[i]:offsets[i + 1]] == key:
+                return i
+            slot = (slot + 1) & mask
+
+    def require(self, node_id: Any) -> int:
+        """Get the index of a node.
+
+        Raises:
+            KeyError: If the node is not in the graph
+        """
+        i = self.index_of(node_id)
+        if i is None:
+            raise KeyError(node_id)
+        return i
+
+    def node_attrs_of(self, i: int) -> Dict[str, Any]:
+        """Get the attributes of node ``i``, including its component."""
+        k = self.node_attrs[i]
+        attrs = self._attrs.get(k)
+        if attrs is None:
+            blob = self.attr_table[self.attr_offsets[k]:self.attr_offsets[k + 1]]
+            attrs = self._attrs[k] = _loads(blob)
+        component = self.component(i)
+        if component is None:
+            return dict(attrs)
+        return {"component": component, **attrs}
+
+    def edge_attrs_of(self, k: int) -> Dict[str, Any]:
+        """Get the attributes of the edge at CSR position ``k``."""
+        a = self.out_attrs[k]
+        attrs = self._edge_attrs.get(a)
+        if attrs is None:
+            blob = self.edge_attr_table[self.edge_attr_offsets[a]:self.edge_attr_offsets[a + 1]]
+            attrs = self._edge_attrs[a] = _loads(blob)
+        return dict(attrs)
+
+    def component(self, i: int) -> Optional[Any]:
+        """Get the component of node ``i``, or None."""
+        component = self._components.get(i)
+        if component is None:
+            start, end = self.component_offsets[i], self.component_offsets[i + 1]
+            if start == end:
+                return None
+            component = self._components[i] = _loads(self.components[start:end])
+        return component
+
+    def close(self) -> None:
+        """Release the mapping; graphs over this file become unusable."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self) -> "GraphFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"GraphFile({self.path!r}, kind={self.kind}, "
+            f"nodes={self.num_nodes}, edges={self.num_edges})"
+        )
+
+
+class _MappedNodeView:
+    """Node view over a graph file, mirroring ``DiGraph.nodes``."""
+
+    __slots__ = ("_file",)
+
+    def __init__(self, graph_file: GraphFile):
+        self._file = graph_file
+
+    def __call__(self) -> "_MappedNodeView":
+        return self
+
+    def __iter__(self) -> Iterator[str]:
+        string = self._file.string
+        return (string(i) for i in range(self._file.num_nodes))
+
+    def __len__(self) -> int:
+        return self._file.num_nodes
+
+    def __contains__(self, node_id: Any) -> bool:
+        return self._file.index_of(node_id) is not None
+
+    def __getitem__(self, node_id: str) -> Dict[str, Any]:
+        return self._file.node_attrs_of(self._file.require(node_id))
+
+
+class _MappedEdgeView:
+    """Edge view over a graph file, mirroring ``DiGraph.edges``."""
+
+    __slots__ = ("_file",)
+
+    def __init__(self, graph_file: GraphFile):
+        self._file = graph_file
+
+    def _positions(self) -> Iterator[Tuple[int, int, int]]:
+        indptr = self._file.out_indptr
+        indices = self._file.out_indices
+        for u in range(self._file.num_nodes):
+            for k in range(indptr[u], indptr[u + 1]):
+                yield u, indices[k], k
+
+    def __call__(self, data: Any = False, default: Any = None) -> List[Tuple]:
+        string = self._file.string
+        if data is False:
+            return list(self)
+        if data is True:
+            return [
+                (string(u), string(v), self._file.edge_attrs_of(k))
+                for u, v, k in self._positions()
+            ]
+        return [
+            (string(u), string(v), self._file.edge_attrs_of(k).get(data, default))
+            for u, v, k in self._positions()
+        ]
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        string = self._file.string
+        for u, v, _ in self._positions():
+            yield (string(u), string(v))
+
+    def __len__(self) -> int:
+        return self._file.num_edges
+
+
+class _MappedAdjacency(Mapping):
+    """Successors of one node with their edge attributes."""
+
+    def __init__(self, graph_file: GraphFile, node: int):
+        self._file = graph_file
+        self._start = graph_file.out_indptr[node]
+        self._end = graph_file.out_indptr[node + 1]
+
+    def _position(self, target: Any) -> Optional[int]:
+        v = self._file.index_of(target)
+        if v is not None:
+            indices = self._file.out_indices
+            for k in range(self._start, self._end):
+                if indices[k] == v:
+                    return k
+        return None
+
+    def __getitem__(self, target: Any) -> Dict[str, Any]:
+        k = self._position(target)
+        if k is None:
+            raise KeyError(target)
+        return self._file.edge_attrs_of(k)
+
+    def __contains__(self, target: Any) -> bool:
+        return self._position(target) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        string = self._file.string
+        indices = self._file.out_indices
+        return (string(indices[k]) for k in range(self._start, self._end))
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+
+class MappedDiGraph:
+    """Read-only directed graph over a graph file.
+
+    Implements the read side of the ``AdjacencyDiGraph`` interface, so
+    the graph classes can query it like any other backend. Attribute
+    dicts are returned as copies.
+    """
+
+    __slots__ = ("graph_file",)
+
+    def __init__(self, graph_file: GraphFile):
+        self.graph_file = graph_file
+
+    @property
+    def nodes(self) -> _MappedNodeView:
+        """Node view supporting iteration, membership and attributes."""
+        return _MappedNodeView(self.graph_file)
+
+    @property
+    def edges(self) -> _MappedEdgeView:
+        """Edge view supporting iteration and ``edges(data=...)``."""
+        return _MappedEdgeView(self.graph_file)
+
+    add_node = add_edge = remove_node = remove_edge = _read_only
+
+    def has_node(self, node_id: Any) -> bool:
+        """Check whether a node exists."""
+        return self.graph_file.index_of(node_id) is not None
+
+    def has_edge(self, source: Any, target: Any) -> bool:
+        """Check whether an edge exists."""
+        u = self.graph_file.index_of(source)
+        return u is not None and target in _MappedAdjacency(self.graph_file, u)
+
+    def in_edges(self, node_id: Any) -> List[Tuple[str, str]]:
+        """Get incoming edges of a node as (source, target) pairs."""
+        i = self.graph_file.index_of(node_id)
+        if i is None:
+            return []
+        return [(source, node_id) for source in self.predecessors(node_id)]
+
+    def out_edges(self, node_id: Any) -> List[Tuple[str, str]]:
+        """Get outgoing edges of a node as (source, target) pairs."""
+        i = self.graph_file.index_of(node_id)
+        if i is None:
+            return []
+        return [(node_id, target) for target in _MappedAdjacency(self.graph_file, i)]
+
+    def neighbors(self, node_id: Any) -> Iterator[str]:
+        """Iterate over successors of a node."""
+        return iter(self[node_id])
+
+    successors = neighbors
+
+    def predecessors(self, node_id: Any) -> Iterator[str]:
+        """Iterate over predecessors of a node."""
+        graph_file = self.graph_file
+        i = graph_file.require(node_id)
+        indices = graph_file.in_indices
+        return (
+            graph_file.string(indices[k])
+            for k in range(graph_file.in_indptr[i], graph_file.in_indptr[i + 1])
+        )
+
+    def number_of_nodes(self) -> int:
+        """Get the number of nodes."""
+        return self.graph_file.num_nodes
+
+    def number_of_edges(self) -> int:
+        """Get the number of edges."""
+        return self.graph_file.num_edges
+
+    def to_networkx(self) -> Any:
+        """Copy the graph into a ``networkx.DiGraph``."""
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        nodes = self.nodes
+        graph.add_nodes_from((node_id, nodes[node_id]) for node_id in nodes)
+        graph.add_edges_from(self.edges(data=True))
+        return graph
+
+    def __getitem__(self, node_id: Any) -> _MappedAdjacency:
+        return _MappedAdjacency(self.graph_file, self.graph_file.require(node_id))
+
+    def __contains__(self, node_id: Any) -> bool:
+        return self.has_node(node_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.nodes)
+
+    def __len__(self) -> int:
+        return self.graph_file.num_nodes
+
+    def __repr__(self) -> str:
+        return (
+            f"MappedDiGraph(nodes={self.number_of_nodes()}, "
+            f"edges={self.number_of_edges()})"
+        )
+
+
+class _MappedComponents(Mapping):
+    """Component ID -> component, decoded on access."""
+
+    def __init__(self, graph_file: GraphFile):
+        self._file = graph_file
+
+    def __getitem__(self, component_id: Any) -> Any:
+        i = self._file.index_of(component_id)
+        component = self._file.component(i) if i is not None else None
+        if component is None:
+            raise KeyError(component_id)
+        return component
+
+    def __iter__(self) -> Iterator[str]:
+        graph_file = self._file
+        offsets = graph_file.component_offsets
+        for i in range(graph_file.num_nodes):
+            if offsets[i] != offsets[i + 1]:
+                yield graph_file.string(i)
+
+    def __len__(self) -> int:
+        return self._file.header["num_components"]
+
+
+class _MappedComponentsByType(Mapping):
+    """Type value -> {component ID: component}, decoded per type on access."""
+
+    def __init__(self, graph_file: GraphFile):
+        self._file = graph_file
+        self._by_type: Dict[str, Dict[str, Any]] = {}
+
+    def __getitem__(self, type_value: Any) -> Dict[str, Any]:
+        label = str(type_value)
+        components = self._by_type.get(label)
+        if components is None:
+            graph_file = self._file
+            if label not in graph_file.labels:
+                raise KeyError(type_value)
+            code = graph_file.labels.index(label)
+            components = self._by_type[label] = {
+                graph_file.string(i): graph_file.component(i)
+                for i, node_type in enumerate(graph_file.node_types)
+                if node_type == code
+            }
+        return components
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._file.labels)
+
+    def __len__(self) -> int:
+        return len(self._file.labels)
+
+
+class _LazyMapping(Mapping):
+    """Mapping derived from a graph file, built on first access."""
+
+    def __init__(self, build: Callable[[], Dict[Any, Any]]):
+        self._build = build
+        self._data: Optional[Dict[Any, Any]] = None
+
+    def _mapping(self) -> Dict[Any, Any]:
+        if self._data is None:
+            self._data = self._build()
+        return self._data
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._mapping()[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._mapping())
+
+    def __len__(self) -> int:
+        return len(self._mapping())
+
+
+class _MappedLevels(Mapping):
+    """Level key -> node IDs of the SI hierarchy."""
+
+    def __init__(self, graph_file: GraphFile):
+        self._file = graph_file
+        self._positions = {key: i for i, key in enumerate(graph_file.levels)}
+
+    def __getitem__(self, level_key: str) -> List[str]:
+        i = self._positions[level_key]
+        graph_file = self._file
+        nodes = graph_file.level_nodes
+        return [
+            graph_file.string(nodes[k])
+            for k in range(graph_file.level_indptr[i], graph_file.level_indptr[i + 1])
+        ]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._file.levels)
+
+    def __len__(self) -> int:
+        return len(self._file.levels)
+
+
+class MappedInterner:
+    """Read-only ``NodeInterner`` over the node IDs of a graph file.
+
+    Node indices in the file serve as the interned IDs.
+    """
+
+    def __init__(self, graph_file: GraphFile):
+        self._file = graph_file
+
+    def id_of(self, key: Any) -> Optional[int]:
+        """Get the ID of a key, or None if it is not a node."""
+        return self._file.index_of(key)
+
+    @property
+    def mapping(self) -> "MappedInterner":
+        """Key -> ID lookups; raises KeyError for unknown keys."""
+        return self
+
+    def __getitem__(self, key: Any) -> int:
+        return self._file.require(key)
+
+    def key_of(self, node_id: int) -> str:
+        """Get the key for an ID."""
+        if not 0 <= node_id < self._file.num_nodes:
+            raise IndexError(node_id)
+        return self._file.string(node_id)
+
+    def keys_of(self, node_ids: Any) -> List[str]:
+        """Map a sequence of IDs back to their keys."""
+        string = self._file.string
+        return [string(i) for i in node_ids]
+
+    intern = _read_only
+
+    def __contains__(self, key: Any) -> bool:
+        return self._file.index_of(key) is not None
+
+    def __len__(self) -> int:
+        return self._file.num_nodes
+
+    def __repr__(self) -> str:
+        return f"MappedInterner(size={len(self)})"
+
+
+class MappedDEGraph(DEGraph):
+    """Read-only DE graph backed by a graph file."""
+
+    def __init__(self, graph_file: GraphFile):
+        # Not DEGraph.__init__, which would build an empty graph to drop
+        self.graph_file = graph_file
+        self.graph = MappedDiGraph(graph_file)
+        self.components = _MappedComponents(graph_file)
+        self.uid = next(_graph_ids)
+        self.revision = 0
+
+    add_component = add_edge = _read_only
+
+    def __repr__(self) -> str:
+        return f"Mapped{super().__repr__()}"
+
+
+class MappedLDGraph(LDGraph):
+    """Read-only LD graph backed by a graph file.
+
+    ``index()`` serves the file's CSR arrays directly, without
+    building anything.
+    """
+
+    def __init__(self, graph_file: GraphFile):
+        # Not LDGraph.__init__, which would build an empty graph to drop
+        self.graph_file = graph_file
+        self.graph = MappedDiGraph(graph_file)
+        self.interner = MappedInterner(graph_file)
+        self._index = GraphIndex(
+            self.interner,
+            CSRAdjacency(graph_file.out_indptr, graph_file.out_indices, graph_file.out_logic),
+            CSRAdjacency(graph_file.in_indptr, graph_file.in_indices, graph_file.in_logic)
+        )
+
+    add_node = add_edge = _read_only
+
+    def index(self) -> GraphIndex:
+        """Get the integer-indexed adjacency stored in the file."""
+        return self._index
+
+    def __repr__(self) -> str:
+        return f"Mapped{super().__repr__()}"
+
+
+class MappedSIGraph(SIGraph):
+    """Read-only SI graph backed by a graph file.
+
+    Type and situation lookups decode only the components of the types
+    they need, the other indexes of ``SIGraph`` are derived from the
+    file on first use, and the reachability index is built from the
+    file's link arrays.
+    """
+
+    def __init__(self, graph_file: GraphFile):
+        # Not SIGraph.__init__, which would build an empty graph to drop
+        self.graph_file = graph_file
+        self.graph = MappedDiGraph(graph_file)
+        self.components = _MappedComponents(graph_file)
+        self.hierarchies = _MappedLevels(graph_file)
+        self._components_by_type = _MappedComponentsByType(graph_file)
+        self._positions = _LazyMapping(self._level_positions)
+        self._reachability: Optional[ReachabilityIndex] = None
+        self._situations = _LazyMapping(self._situation_index)
+
+    add_component = add_root = add_dependency = replace_component = _read_only
+
+    def _level_positions(self) -> Dict[str, Tuple[str, int]]:
+        """Node ID -> (level key, position in that level's list)."""
+        return {
+            node_id: (level_key, position)
+            for level_key, members in self.hierarchies.items()
+            for position, node_id in enumerate(members)
+        }
+
+    def _situation_index(self) -> Dict[str, Dict[str, str]]:
+        """Situation -> {active subsystem: ID of the CND component}."""
+        index: Dict[str, Dict[str, str]] = {}
+        for component in self.find_components_by_type(ComponentType.CND):
+            for subsystem, situation in situation_entries(component):
+                index.setdefault(situation, {})[subsystem] = component.id
+        return index
+
+    def reachability(self) -> ReachabilityIndex:
+        """Get the reachability index of the hierarchy."""
+        if self._reachability is None:
+            graph_file = self.graph_file
+            string = graph_file.string
+            links = [
+                (string(s), string(t))
+                for s, t in zip(graph_file.link_sources, graph_file.link_targets)
+            ]
+            self._reachability = ReachabilityIndex.build(
+                self.graph.nodes(), list(self.graph.edges()) + links
+            )
+        return self._reachability
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert graph to dictionary representation."""
+        result = super().to_dict()
+        result["hierarchies"] = dict(self.hierarchies)
+        return result
+
+    def __repr__(self) -> str:
+        return f"Mapped{super().__repr__()}"
+
+
+MAPPED_GRAPHS = {"DE": MappedDEGraph, "LD": MappedLDGraph, "SI": MappedSIGraph}
+
+
+def load_graph(path: str) -> AnyGraph:
+    """Map a graph file as a read-only graph.
+
+    Args:
+        path: Path to a file written by ``save_graph``
+
+    Returns:
+        MappedDEGraph, MappedLDGraph or MappedSIGraph, by the file's kind
+
+    Raises:
+        ValueError: If the file is not a graph file this version can read
+    """
+    graph_file = GraphFile(path)
+    return MAPPED_GRAPHS[graph_file.kind](graph_file)
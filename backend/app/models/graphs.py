@@ -1,10 +1,68 @@
 """Graph structures for DE, LD, and SI graphs."""
 
-from typing import Any, Dict, List, Optional, Tuple
+from array import array
+from itertools import count as sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from enum import Enum
-import networkx as nx
 from pydantic import BaseModel, Field
 
+from ..instrumentation import timed
+from .graph_backends import create_digraph, to_networkx
+from .graph_index import (
+    CSRAdjacency, GraphIndex, NodeInterner, ReachabilityIndex,
+    LOGIC_CODES, LOGIC_NONE
+)
+
+
+# Process-unique graph identities, so that revisions of different
+# graphs are never confused
+_graph_ids = sequence(1)
+
+
+def _type_key(component_type: Any) -> Any:
+    """Normalize a component type (enum member or value) to its value."""
+    return getattr(component_type, "value", component_type)
+
+
+def subsystems_of(component: Any) -> List[str]:
+    """Get the subsystems an SI component integrates, as node IDs."""
+    members = getattr(component, "subsystems", None)
+    if members is None:
+        primary = getattr(component, "primary", None)
+        members = ([primary] if primary is not None else []) + list(
+            getattr(component, "backups", [])
+        )
+    return [str(member) for member in members]
+
+
+def situation_entries(component: Any) -> List[Tuple[str, str]]:
+    """Get the (subsystem, situation) pairs a CND component activates."""
+    return [
+        (str(subsystem), str(situation))
+        for subsystem, situation in zip(
+            getattr(component, "subsystems", ()),
+            getattr(component, "situations", ())
+        )
+    ]
+
+
+def _level_number(level_key: str) -> int:
+    """Get the level number from a ``Level_<n>`` key."""
+    return int(level_key.rsplit("_", 1)[-1])
+
+
+def _hierarchy_links(component: Any) -> List[Tuple[str, str]]:
+    """Get the reachability links of an SI component.
+
+    Subsystems lead into the component, and the component into its
+    parent.
+    """
+    links = [(member, component.id) for member in subsystems_of(component)]
+    parent = getattr(component, "parent", None)
+    if parent is not None:
+        links.append((component.id, str(parent)))
+    return links
+
 
 class LogicOperator(str, Enum):
     """Logic operators for LD graph."""
@@ -42,18 +100,23 @@ class DEGraph:
     Records the history of design exploration activities.
     """
 
-    def __init__(self):
-        self.graph = nx.DiGraph()
+    def __init__(self, backend: Optional[str] = None):
+        self.graph = create_digraph(backend)
         self.components: Dict[str, Any] = {}
+        # (uid, revision) identifies the graph's current contents
+        self.uid = next(_graph_ids)
+        self.revision = 0
 
     def add_component(self, component: Any) -> None:
         """Add a DE component to the graph."""
         self.graph.add_node(component.id, component=component)
         self.components[component.id] = component
+        self.revision += 1
 
     def add_edge(self, source_id: str, target_id: str, **attrs) -> None:
         """Add an edge between components."""
         self.graph.add_edge(source_id, target_id, **attrs)
+        self.revision += 1
 
     def get_component(self, component_id: str) -> Optional[Any]:
         """Get a component by ID."""
@@ -67,6 +130,11 @@ class DEGraph:
         """Get all edges."""
         return list(self.graph.edges())
 
+    def to_networkx(self) -> Any:
+        """Get the graph as a ``networkx.DiGraph`` for export or analysis."""
+        return to_networkx(self.graph)
+
+    @timed("serialize_de")
     def to_dict(self) -> Dict[str, Any]:
         """Convert graph to dictionary representation."""
         nodes = []
@@ -99,12 +167,16 @@ class LDGraph:
     Represents logical dependencies between systems and situations.
     """
 
-    def __init__(self):
-        self.graph = nx.DiGraph()
+    def __init__(self, backend: Optional[str] = None):
+        self.graph = create_digraph(backend)
+        self.interner = NodeInterner()
+        self._index: Optional[GraphIndex] = None
 
     def add_node(self, node_id: str, data: Any = None, **attrs) -> None:
         """Add a node to the graph."""
         self.graph.add_node(node_id, data=data, **attrs)
+        self.interner.intern(node_id)
+        self._index = None
 
     def add_edge(
         self,
@@ -115,6 +187,37 @@ class LDGraph:
     ) -> None:
         """Add an edge with optional logic operator."""
         self.graph.add_edge(source_id, target_id, logic=logic, **attrs)
+        self.interner.intern(source_id)
+        self.interner.intern(target_id)
+        self._index = None
+
+    def index(self) -> GraphIndex:
+        """Get the integer-indexed adjacency of the graph.
+
+        The index is built in O(n + e) on first use and cached until
+        the graph is modified through ``add_node``/``add_edge``.
+
+        Returns:
+            GraphIndex with outgoing and incoming CSR adjacency
+        """
+        if self._index is None:
+            ids = self.interner.mapping
+            codes = LOGIC_CODES
+            sources = array('l')
+            targets = array('l')
+            logics = array('b')
+            for source, target, logic in self.graph.edges(data='logic'):
+                sources.append(ids[source])
+                targets.append(ids[target])
+                logics.append(codes.get(logic, LOGIC_NONE))
+
+            num_nodes = len(self.interner)
+            self._index = GraphIndex(
+                self.interner,
+                CSRAdjacency.from_edges(num_nodes, sources, targets, logics),
+                CSRAdjacency.from_edges(num_nodes, targets, sources, logics)
+            )
+        return self._index
 
     def get_node_data(self, node_id: str) -> Optional[Any]:
         """Get node data."""
@@ -154,6 +257,11 @@ class LDGraph:
         """Get neighbors of a node."""
         return list(self.graph.neighbors(node_id))
 
+    def to_networkx(self) -> Any:
+        """Get the graph as a ``networkx.DiGraph`` for export or analysis."""
+        return to_networkx(self.graph)
+
+    @timed("serialize_ld")
     def to_dict(self) -> Dict[str, Any]:
         """Convert graph to dictionary representation."""
         nodes = []
@@ -182,30 +290,64 @@ class SIGraph:
     Represents system hierarchy and subsystem relationships.
     """
 
-    def __init__(self):
-        self.graph = nx.DiGraph()
+    def __init__(self, backend: Optional[str] = None):
+        self.graph = create_digraph(backend)
         self.components: Dict[str, Any] = {}
         self.hierarchies: Dict[str, List[str]] = {}  # level -> node_ids
+        # type value -> {component_id: component}, insertion ordered
+        self._components_by_type: Dict[str, Dict[str, Any]] = {}
+        # node_id -> (level key, position in that level's list)
+        self._positions: Dict[str, Tuple[str, int]] = {}
+        # Built on first ancestor/descendant query, then kept current
+        self._reachability: Optional[ReachabilityIndex] = None
+        # situation -> {active subsystem: ID of the CND component}
+        self._situations: Dict[str, Dict[str, str]] = {}
+
+    def _track_level(self, node_id: str, level: int) -> None:
+        """Append a node to its hierarchy level and remember its position."""
+        level_key = f"Level_{level}"
+        if level_key not in self.hierarchies:
+            self.hierarchies[level_key] = []
+        self._positions[node_id] = (level_key, len(self.hierarchies[level_key]))
+        self.hierarchies[level_key].append(node_id)
 
     def add_component(self, component: Any, level: int = 0) -> None:
         """Add an SI component to the graph."""
         self.graph.add_node(component.id, component=component, level=level)
         self.components[component.id] = component
+        self._components_by_type.setdefault(
+            _type_key(component.type), {}
+        )[component.id] = component
 
         # Track hierarchy
-        level_key = f"Level_{level}"
-        if level_key not in self.hierarchies:
-            self.hierarchies[level_key] = []
-        self.hierarchies[level_key].append(component.id)
+        self._track_level(component.id, level)
+        self._index_situations(component)
+
+        if self._reachability is not None:
+            self._reachability.add_node(component.id)
+            for source, target in _hierarchy_links(component):
+                self._reachability.add_edge(source, target)
+
+    def _index_situations(self, component: Any) -> None:
+        """Record which subsystems a CND component activates per situation."""
+        for subsystem, situation in situation_entries(component):
+            self._situations.setdefault(situation, {})[subsystem] = component.id
+
+    def _unindex_situations(self, component: Any) -> None:
+        """Drop a CND component's entries from the situation index."""
+        for subsystem, situation in situation_entries(component):
+            active = self._situations.get(situation, {})
+            if active.get(subsystem) == component.id:
+                del active[subsystem]
+                if not active:
+                    del self._situations[situation]
 
     def add_root(self, node_id: str, level: int = 0) -> None:
         """Add a root node."""
         self.graph.add_node(node_id, level=level, is_root=True)
-
-        level_key = f"Level_{level}"
-        if level_key not in self.hierarchies:
-            self.hierarchies[level_key] = []
-        self.hierarchies[level_key].append(node_id)
+        self._track_level(node_id, level)
+        if self._reachability is not None:
+            self._reachability.add_node(node_id)
 
     def add_dependency(
         self,
@@ -216,6 +358,8 @@ class SIGraph:
     ) -> None:
         """Add a dependency edge."""
         self.graph.add_edge(source_id, target_id, level=level, **attrs)
+        if self._reachability is not None:
+            self._reachability.add_edge(source_id, target_id)
 
     def get_component(self, component_id: str) -> Optional[Any]:
         """Get a component by ID."""
@@ -230,26 +374,180 @@ class SIGraph:
         level_key = f"Level_{level}"
         return self.hierarchies.get(level_key, [])
 
+    def situations(self) -> List[str]:
+        """Get every situation a CND component branches on."""
+        return list(self._situations)
+
+    def active_subsystems(self, situation: Any) -> List[str]:
+        """Get the subsystems CND components activate in a situation.
+
+        Args:
+            situation: The situation
+
+        Returns:
+            Active subsystem node IDs, empty if the situation is unknown
+        """
+        return list(self._situations.get(str(situation), ()))
+
+    def conditions_for(self, situation: Any) -> Dict[str, str]:
+        """Get active subsystems in a situation mapped to their CND component."""
+        return dict(self._situations.get(str(situation), {}))
+
     def find_components_by_type(self, component_type: Any) -> List[Any]:
         """Find components by type."""
-        return [
-            comp for comp in self.components.values()
-            if comp.type == component_type
-        ]
+        return list(
+            self._components_by_type.get(_type_key(component_type), {}).values()
+        )
 
     def replace_component(self, old_component: Any, new_component: Any) -> None:
-        """Replace a component with another."""
-        if old_component.id in self.components:
-            # Get the level
-            level = self.graph.nodes[old_component.id].get('level', 0)
-
-            # Remove old component
-            self.graph.remove_node(old_component.id)
-            del self.components[old_component.id]
-
-            # Add new component
-            self.add_component(new_component, level)
+        """Replace a component with another.
+
+        The new component takes over the old node's level, its position
+        in the hierarchy and all of its incoming and outgoing edges, so
+        a replacement costs O(degree) rather than a graph rebuild.
+        """
+        old_id = old_component.id
+        if old_id not in self.components:
+            return
+
+        level = self.graph.nodes[old_id].get('level', 0)
+        in_edges = [
+            (source, dict(self.graph[source][old_id]))
+            for source, _ in self.graph.in_edges(old_id)
+        ]
+        out_edges = [
+            (target, dict(self.graph[old_id][target]))
+            for _, target in self.graph.out_edges(old_id)
+        ]
 
+        # Remove old component
+        self.graph.remove_node(old_id)
+        del self.components[old_id]
+        del self._components_by_type[_type_key(old_component.type)][old_id]
+        self._unindex_situations(old_component)
+
+        # Add new component in place
+        new_id = new_component.id
+        self.graph.add_node(new_id, component=new_component, level=level)
+        self.components[new_id] = new_component
+        self._components_by_type.setdefault(
+            _type_key(new_component.type), {}
+        )[new_id] = new_component
+        self._index_situations(new_component)
+
+        for source, attrs in in_edges:
+            self.graph.add_edge(source, new_id, **attrs)
+        for target, attrs in out_edges:
+            self.graph.add_edge(new_id, target, **attrs)
+
+        level_key, position = self._positions.pop(old_id)
+        self.hierarchies[level_key][position] = new_id
+        self._positions[new_id] = (level_key, position)
+
+        if self._reachability is not None:
+            old_links = {
+                (new_id if s == old_id else s, new_id if t == old_id else t)
+                for s, t in _hierarchy_links(old_component)
+            }
+            new_links = set(_hierarchy_links(new_component))
+            if old_links - new_links or new_id in self._reachability:
+                # Reachability can shrink, or the new ID already has its
+                # own; rebuild on the next query
+                self._reachability = None
+            else:
+                self._reachability.rename(old_id, new_id)
+                for source, target in new_links - old_links:
+                    self._reachability.add_edge(source, target)
+
+    def bottom_up(self) -> Iterator[Tuple[str, List[str], Optional[Any]]]:
+        """Walk the hierarchy level by level, inputs before what they feed.
+
+        Dependency targets are not listed in ``hierarchies``; their
+        edges carry the target's level and are visited before the
+        level's listed nodes.
+
+        Yields:
+            (node ID, input node IDs, integrating SI component or None).
+            A component yields its parent's node ID, or its own ID if it
+            has no parent.
+        """
+        dependencies: Dict[int, Dict[str, List[str]]] = {}
+        for source, target in self.graph.edges():
+            level = self.graph[source][target].get('level', 0)
+            dependencies.setdefault(level, {}).setdefault(target, []).append(source)
+
+        levels = {_level_number(key): key for key in self.hierarchies}
+        for level in sorted(set(levels) | set(dependencies)):
+            for target, sources in dependencies.get(level, {}).items():
+                yield target, sources, None
+
+            for node_id in self.hierarchies.get(levels.get(level), ()):
+                component = self.components.get(node_id)
+                if component is None:
+                    yield node_id, [], None
+                else:
+                    parent = getattr(component, "parent", None)
+                    node = str(parent) if parent is not None else component.id
+                    yield node, subsystems_of(component), component
+
+    def reachability(self) -> ReachabilityIndex:
+        """Get the reachability index of the hierarchy.
+
+        Reachability follows dependency edges from roots downwards, and
+        through SI components from their subsystems to the component and
+        on to its parent. The index is built on first use and updated
+        incrementally as components and dependencies are added.
+        """
+        if self._reachability is None:
+            links = [
+                link
+                for component in self.components.values()
+                for link in _hierarchy_links(component)
+            ]
+            self._reachability = ReachabilityIndex.build(
+                self.graph.nodes(), list(self.graph.edges()) + links
+            )
+        return self._reachability
+
+    def ancestors(self, node_id: str, roots_only: bool = False) -> List[str]:
+        """Get every node above a node in the hierarchy.
+
+        Args:
+            node_id: Node or component ID
+            roots_only: Only return top-level root nodes
+
+        Returns:
+            IDs of the nodes the given node is reachable from
+
+        Raises:
+            KeyError: If the node is unknown
+        """
+        ancestors = self.reachability().ancestors(node_id)
+        if roots_only:
+            nodes = self.graph.nodes
+            return [
+                a for a in ancestors
+                if a in nodes and nodes[a].get('is_root', False)
+            ]
+        return ancestors
+
+    def descendants(self, node_id: str) -> List[str]:
+        """Get every node beneath a node in the hierarchy.
+
+        Raises:
+            KeyError: If the node is unknown
+        """
+        return self.reachability().descendants(node_id)
+
+    def is_ancestor(self, ancestor_id: str, node_id: str) -> bool:
+        """Whether a node lies above another in the hierarchy."""
+        return self.reachability().reaches(ancestor_id, node_id)
+
+    def to_networkx(self) -> Any:
+        """Get the graph as a ``networkx.DiGraph`` for export or analysis."""
+        return to_networkx(self.graph)
+
+    @timed("serialize_si")
     def to_dict(self) -> Dict[str, Any]:
         """Convert graph to dictionary representation."""
         nodes = []
@@ -0,0 +1,34 @@
+"""Preloading for forking servers.
+
+Under ``gunicorn.conf.py`` the master process imports the app, builds
+the engines and freezes the knowledge base before it forks the
+workers, so the workers share one copy of it instead of each building
+its own.
+
+Sharing only lasts while pages are not written to. The knowledge base
+is frozen so nothing modifies it, and ``gc.freeze()`` moves every
+object alive at fork time into the permanent generation, so the
+workers' garbage collections never touch (and copy) them. Reference
+count updates on objects a worker actually uses still copy those pages.
+"""
+
+import gc
+
+
+def preload() -> None:
+    """Build the engines and freeze shared state; call before forking."""
+    # Collections between now and the fork would only fragment the heap
+    gc.disable()
+
+    from .main import _ENGINE_GETTERS, load_knowledge_base
+
+    for getter in _ENGINE_GETTERS.values():
+        getter()
+    load_knowledge_base().freeze()
+
+    gc.freeze()
+
+
+def after_fork() -> None:
+    """Re-enable garbage collection in a forked worker."""
+    gc.enable()
@@ -0,0 +1,496 @@
+"""In-process Python SDK for scripted design runs (spec section 8.2).
+
+``DesignSession`` drives the interactive exploration engine, knowledge
+base and graph conversion engine directly. Every call returns native
+component and graph objects, so offline pipelines skip the HTTP routes,
+JSON round trips and response model validation entirely.
+
+Example:
+    from app.sdk import DesignSession, KnowledgeBase
+
+    session = DesignSession(initial_system="car_running")
+    session.set_knowledge_base(KnowledgeBase.load("vehicle_control_kb.json"))
+
+    situation = session.assess_situation("obstacle_detected")
+    problem = session.identify_problem()
+    intention = session.establish_intention()
+
+    de_graph = session.get_de_graph()
+    si_graph = session.convert_to_si_graph()
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .models.de_components import (
+    DIComponent, EIComponent, PIComponent, SAComponent, SIComponent
+)
+from .models.graphs import DEGraph, LDGraph, SIGraph
+from .services.configuration_space import ConfigurationSpace
+from .services.graph_conversion import ALTERNATIVE_POLICIES, GraphConversionEngine
+from .services.interactive_exploration import (
+    ExplorationStep, InteractiveExplorationEngine
+)
+from .services.knowledge_base import KnowledgeBase, KnowledgeBaseOverlay
+from .services.reliability import ReliabilityModel
+from .services.side_effects import SideEffectReport
+from .services.subproblem_table import SubproblemTable
+from .services.usage_sketch import UsageSketch
+from .services.work_queue import DEPTH_FIRST
+
+__all__ = ["DesignSession", "KnowledgeBase", "KnowledgeBaseOverlay", "ExplorationStep"]
+
+
+class DesignSession:
+    """Design exploration session running in the calling process.
+
+    Step methods accept an explicit value or fall back to the knowledge
+    base suggestion for the current system, and return the DE component
+    they created.
+    """
+
+    def __init__(
+        self,
+        initial_system: Optional[str] = None,
+        knowledge_base: Optional[KnowledgeBase] = None,
+        domain: Optional[str] = None,
+        backend: Optional[str] = None,
+        subproblems: Optional[SubproblemTable] = None,
+        queue_order: str = DEPTH_FIRST,
+        usage: Optional[UsageSketch] = None
+    ):
+        """Initialize a design session.
+
+        Args:
+            initial_system: Optional system to start exploring right away
+            knowledge_base: Knowledge base for suggestions; defaults to
+                the built-in collision avoidance knowledge. The session
+                works on an overlay, so additions through ``kb`` stay
+                private to the session.
+            domain: Optional free-form domain label
+            backend: Optional graph backend for DE/LD/SI graphs
+            subproblems: Optional memo table of expanded (system,
+                intention) subproblems, shared with sub-sessions
+            queue_order: Order in which pending subsystems are explored
+                ("dfs", "bfs" or "priority")
+            usage: Optional statistics of the designer's choices, ranking
+                the available names; shared with sub-sessions
+        """
+        self.domain = domain
+        self.backend = backend
+        self.subproblems = subproblems if subproblems is not None else SubproblemTable()
+        base = knowledge_base if knowledge_base is not None else KnowledgeBase()
+        self.explorer = InteractiveExplorationEngine(
+            base.overlay(), backend=backend, queue_order=queue_order, usage=usage,
+            subproblems=self.subproblems
+        )
+        self.converter = GraphConversionEngine(
+            backend=backend, subproblems=self.subproblems
+        )
+        # (system, step) pairs auto_explore could not resolve
+        self.unresolved: List[Tuple[str, str]] = []
+
+        if initial_system is not None:
+            self.start(initial_system)
+
+    @property
+    def kb(self) -> KnowledgeBase:
+        """Knowledge base used for suggestions: the session's overlay."""
+        return self.explorer.kb
+
+    @property
+    def step(self) -> ExplorationStep:
+        """Current exploration step."""
+        return self.explorer.current_step
+
+    @property
+    def current_system(self) -> Optional[str]:
+        """System currently being explored."""
+        return self.explorer.current_system
+
+    @property
+    def pending_subsystems(self) -> List[str]:
+        """Subsystems waiting to be explored."""
+        return self.explorer.pending_subsystems
+
+    @property
+    def completed(self) -> bool:
+        """Whether every queued subsystem has been explored."""
+        return self.explorer.current_step == ExplorationStep.COMPLETED
+
+    @property
+    def side_effect_report(self) -> Optional[SideEffectReport]:
+        """Side effects of the latest applied solution."""
+        return self.explorer.side_effect_report
+
+    def set_knowledge_base(self, knowledge_base: KnowledgeBase) -> None:
+        """Use another knowledge base, through a new overlay, for subsequent suggestions."""
+        self.explorer.kb = knowledge_base.overlay()
+
+    def start(self, initial_system: str) -> "DesignSession":
+        """Start (or restart) exploration from an initial system.
+
+        Args:
+            initial_system: The initial system to explore
+
+        Returns:
+            This session, for chaining
+        """
+        self.explorer.begin(initial_system)
+        self.unresolved = []
+        return self
+
+    # Exploration steps. Only values given by the caller count as the
+    # designer's choices in the usage statistics, not knowledge base
+    # suggestions filled in for None.
+
+    def assess_situation(self, situation: Optional[str] = None) -> SIComponent:
+        """Assess the situation of the current system.
+
+        Args:
+            situation: Situation, or None for the knowledge base suggestion
+
+        Returns:
+            The created SI component
+        """
+        given = situation is not None
+        if not given:
+            situation = self._require(
+                self.kb.query_situation(self.current_system), "situation"
+            )
+        return self.explorer.record_situation(situation, learn=given)
+
+    def identify_problem(self, problem: Optional[str] = None) -> PIComponent:
+        """Identify the problem of the current system and situation.
+
+        Args:
+            problem: Problem, or None for the knowledge base suggestion
+
+        Returns:
+            The created PI component
+        """
+        given = problem is not None
+        if not given:
+            problem = self._require(
+                self.kb.query_problem(
+                    self.current_system, self.explorer.current_situation
+                ),
+                "problem"
+            )
+        return self.explorer.record_problem(problem, learn=given)
+
+    def establish_intention(self, intention: Optional[str] = None) -> EIComponent:
+        """Establish an intention for the current problem.
+
+        Args:
+            intention: Intention, or None for the knowledge base suggestion
+
+        Returns:
+            The created EI component
+        """
+        given = intention is not None
+        if not given:
+            intention = self._require(
+                self.kb.query_intention(self.explorer.current_problem),
+                "intention"
+            )
+        return self.explorer.record_intention(intention, learn=given)
+
+    def decompose_intention(
+        self,
+        sub_intentions: Optional[List[str]] = None,
+        sub_systems: Optional[List[str]] = None
+    ) -> DIComponent:
+        """Decompose the current intention into sub-systems.
+
+        Args:
+            sub_intentions: Sub-intentions, or None with ``sub_systems``
+                also None for the knowledge base decomposition
+            sub_systems: Sub-systems to explore next
+
+        Returns:
+            The created DI component
+        """
+        if sub_intentions is None and sub_systems is None:
+            decomposition = self._require(
+                self.kb.query_decomposition(
+                    self.current_system, self.explorer.current_intention
+                ),
+                "decomposition"
+            )
+            sub_intentions = decomposition["intentions"]
+            sub_systems = decomposition["systems"]
+        return self.explorer.record_decomposition(
+            list(sub_intentions or []), list(sub_systems or [])
+        )
+
+    def apply_solution(self, solution: Optional[str] = None) -> SAComponent:
+        """Apply a solution to the current system.
+
+        Its side effects are then in ``side_effect_report``.
+
+        Args:
+            solution: Solution, or None for the first known solution
+
+        Returns:
+            The created SA component
+        """
+        given = solution is not None
+        if not given:
+            solutions = self.kb.query_solutions(self.current_system)
+            solution = self._require(solutions[0] if solutions else None, "solution")
+        return self.explorer.record_solution(solution, learn=given)
+
+    def skip_subsystem(self) -> Optional[str]:
+        """Leave the current system unresolved and move to the next one."""
+        return self.explorer.skip_subsystem()
+
+    def _require(self, value: Any, what: str) -> Any:
+        """Return a knowledge base suggestion or fail if there is none."""
+        if value is None:
+            raise ValueError(
+                f"Knowledge base has no {what} for system {self.current_system!r}"
+            )
+        return value
+
+    # Batch helpers
+
+    def run_steps(self, steps: Iterable[Tuple[Any, ...]]) -> List[Any]:
+        """Run a scripted sequence of steps.
+
+        Args:
+            steps: (step name, *arguments) tuples, where the step name is
+                "situation", "problem", "intention", "decompose",
+                "solution" or "skip"; missing arguments use the knowledge
+                base suggestion
+
+        Returns:
+            The component created by each step (None for "skip")
+        """
+        results = []
+        for step in steps:
+            name, args = step[0], step[1:]
+            action = self._STEP_ACTIONS.get(name)
+            if action is None:
+                raise ValueError(f"Unknown step: {name!r}")
+            results.append(action(self, *args))
+        return results
+
+    _STEP_ACTIONS: Dict[str, Callable[..., Any]] = {
+        "situation": assess_situation,
+        "problem": identify_problem,
+        "intention": establish_intention,
+        "decompose": decompose_intention,
+        "solution": apply_solution,
+        "skip": skip_subsystem,
+    }
+
+    def auto_explore(self, max_steps: Optional[int] = None) -> DEGraph:
+        """Explore using knowledge base suggestions until completion.
+
+        For each system the situation, problem and intention are
+        recorded from the knowledge base. The intention is then
+        decomposed if a decomposition exists, otherwise the first known
+        solution is applied. A system is skipped at the first step the
+        knowledge base cannot answer, and the (system, step) pair is
+        added to ``unresolved``. A (system, intention) pair that is
+        already expanded in this graph is grafted onto its existing DI
+        component instead of being expanded again.
+
+        Args:
+            max_steps: Optional limit on the number of recorded steps
+
+        Returns:
+            The DE graph
+        """
+        steps = 0
+        while not self.completed and (max_steps is None or steps < max_steps):
+            if not self._auto_step():
+                self.unresolved.append(
+                    (self.current_system, self.explorer.current_step.value)
+                )
+                self.skip_subsystem()
+            steps += 1
+        return self.get_de_graph()
+
+    def _auto_step(self) -> bool:
+        """Record the next knowledge base driven step, if any.
+
+        The steps are not counted in the usage statistics, which rank
+        names by the designer's own choices.
+        """
+        explorer = self.explorer
+        kb = self.kb
+        system = explorer.current_system
+        step = explorer.current_step
+
+        if step == ExplorationStep.SITUATION_ASSESSMENT:
+            situation = kb.query_situation(system)
+            if situation is not None:
+                explorer.record_situation(situation, learn=False)
+                return True
+        elif step == ExplorationStep.PROBLEM_IDENTIFICATION:
+            problem = kb.query_problem(system, explorer.current_situation)
+            if problem is not None:
+                explorer.record_problem(problem, learn=False)
+                return True
+        elif step == ExplorationStep.ESTABLISH_INTENTION:
+            intention = kb.query_intention(explorer.current_problem)
+            if intention is not None:
+                explorer.record_intention(intention, learn=False)
+                return True
+
+        if step == ExplorationStep.CHOOSE_PATH:
+            intention = explorer.current_intention
+            root = self.subproblems.expanded_root(
+                system, intention, explorer.de_graph
+            )
+            if root is not None:
+                explorer.graft_subproblem(root)
+                return True
+
+            decomposition = kb.query_decomposition(system, intention)
+            if decomposition is not None:
+                explorer.record_decomposition(
+                    list(decomposition["intentions"]),
+                    list(decomposition["systems"])
+                )
+                return True
+
+            # Only a complete SI/PI/EI chain leads to a solution
+            solutions = kb.query_solutions(system)
+            if solutions:
+                explorer.record_solution(solutions[0], learn=False)
+                return True
+        return False
+
+    def create_sub_session(self, initial_system: Optional[str] = None) -> "DesignSession":
+        """Create a session sharing this session's backend, subproblems and usage.
+
+        The sub-session's overlay sits on this session's, so it sees this
+        session's knowledge while its own additions stay private.
+        """
+        return DesignSession(
+            initial_system=initial_system,
+            knowledge_base=self.kb,
+            domain=self.domain,
+            backend=self.backend,
+            subproblems=self.subproblems,
+            queue_order=self.explorer.work_queue.order,
+            usage=self.explorer.usage
+        )
+
+    def explore_many(
+        self,
+        initial_systems: Sequence[str],
+        max_steps: Optional[int] = None
+    ) -> Dict[str, DEGraph]:
+        """Auto-explore several initial systems in independent sub-sessions.
+
+        Args:
+            initial_systems: Initial systems to explore
+            max_steps: Optional step limit per system
+
+        Returns:
+            DE graph per initial system
+        """
+        return {
+            system: self.create_sub_session(system).auto_explore(max_steps)
+            for system in initial_systems
+        }
+
+    # Graphs
+
+    def get_de_graph(self) -> DEGraph:
+        """Get the DE graph built so far."""
+        return self.explorer.get_graph()
+
+    def convert_to_ld_graph(self) -> LDGraph:
+        """Convert the DE graph to an LD graph."""
+        return self.converter.convert_de_to_ld(self.get_de_graph())
+
+    def convert_to_si_graph(self) -> SIGraph:
+        """Convert the DE graph to an SI graph."""
+        return self.converter.convert_de_to_si(self.get_de_graph())
+
+    def resolve_alternatives(
+        self,
+        si_graph: Optional[SIGraph] = None,
+        selections: Optional[Dict[str, Any]] = None,
+        policy: Union[str, Callable[..., Any], None] = "first"
+    ) -> SIGraph:
+        """Resolve ALT components of an SI graph into BUP components.
+
+        Args:
+            si_graph: SI graph to resolve in place; converted from the
+                DE graph if None
+            selections: Selected subsystem keyed by ALT or parent node ID
+            policy: Policy name ("first", "last"), callable or None
+
+        Returns:
+            The resolved SI graph
+        """
+        if si_graph is None:
+            si_graph = self.convert_to_si_graph()
+        if isinstance(policy, str):
+            policy = ALTERNATIVE_POLICIES[policy]
+        return self.converter.resolve_alternatives(si_graph, selections, policy)
+
+    def configuration_space(self, si_graph: Optional[SIGraph] = None) -> ConfigurationSpace:
+        """Count the configurations of an SI graph.
+
+        Args:
+            si_graph: SI graph to count; converted from the DE graph if None
+
+        Returns:
+            Configuration space with counts and a uniform sampler
+        """
+        if si_graph is None:
+            si_graph = self.convert_to_si_graph()
+        return ConfigurationSpace(si_graph)
+
+    def reliability_model(
+        self,
+        si_graph: Optional[SIGraph] = None,
+        failure_probabilities: Optional[Dict[str, float]] = None,
+        default_failure: float = 0.0
+    ) -> ReliabilityModel:
+        """Compile an SI graph for reliability evaluation.
+
+        Args:
+            si_graph: SI graph to evaluate; converted from the DE graph if None
+            failure_probabilities: Own failure probability by node or
+                component ID, overriding component metadata
+            default_failure: Failure probability of nodes without one
+
+        Returns:
+            Reliability model offering exact and Monte Carlo evaluation
+        """
+        if si_graph is None:
+            si_graph = self.convert_to_si_graph()
+        return ReliabilityModel(si_graph, failure_probabilities, default_failure)
+
+    def save_results(self, path: str, si_graph: Optional[SIGraph] = None) -> None:
+        """Save the DE, LD and SI graphs as one JSON document.
+
+        Args:
+            path: Destination path
+            si_graph: SI graph to save; converted from the DE graph if None
+        """
+        if si_graph is None:
+            si_graph = self.convert_to_si_graph()
+
+        results = {
+            "domain": self.domain,
+            "de": self.get_de_graph().to_dict(),
+            "ld": self.convert_to_ld_graph().to_dict(),
+            "si": si_graph.to_dict(),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2, default=str)
+
+    def __repr__(self) -> str:
+        return (
+            f"DesignSession(system={self.current_system!r}, "
+            f"step={self.step.value}, graph={self.get_de_graph()!r})"
+        )
@@ -0,0 +1,214 @@
+"""Counting and uniform sampling of SI graph configurations.
+
+A configuration fixes every choice an SI graph leaves open:
+
+- EXO: exactly one subsystem
+- ALT: a non-empty subset of subsystems
+- COL, CND: all subsystems
+- BUP: the primary together with its backups
+
+The number of configurations beneath each node follows from the
+counts of its subsystems in closed form (sum for EXO, product of
+``1 + c`` minus the empty subset for ALT, product otherwise), so one
+bottom-up pass over ``SIGraph.hierarchies`` sizes the whole design
+space with arbitrary-precision integers. The same counts drive an exact
+uniform sampler that works top-down without enumerating anything.
+
+Counts are exact when no subsystem is shared between components; a
+shared subsystem is counted once per occurrence, while a sample fixes
+it once.
+"""
+
+import math
+import random
+from typing import Any, Dict, List, Optional
+
+from ..models.graphs import SIGraph, subsystems_of
+from ..models.si_components import ALTComponent, EXOComponent
+from ..instrumentation import timed
+
+# Component ID -> selected subsystems
+Configuration = Dict[str, List[str]]
+
+
+class ConfigurationSpace:
+    """Configuration counts of an SI graph, with a uniform sampler."""
+
+    def __init__(self, si_graph: SIGraph):
+        """Count the configurations beneath every node.
+
+        Args:
+            si_graph: The SI graph
+        """
+        self.si_graph = si_graph
+        # Node ID -> count of the configurations that produce it
+        self.counts: Dict[str, int] = {}
+        # Node ID -> component integrating its subsystems
+        self._producers: Dict[str, Any] = {}
+        # Top-level outputs: nodes no other node builds on
+        self.outputs: List[str] = []
+        self._count()
+
+    @timed("configuration_counting")
+    def _count(self) -> None:
+        """Count bottom-up over the hierarchy levels."""
+        counts = self.counts
+        consumed = set()
+
+        for node_id, inputs, component in self.si_graph.bottom_up():
+            consumed.update(inputs)
+            if component is None:
+                # Root, or node fed by dependencies
+                total = counts.get(node_id, 1)
+                for source in inputs:
+                    total *= counts.get(source, 1)
+                counts[node_id] = total
+                continue
+
+            total = self._combine(component, [counts.get(m, 1) for m in inputs])
+            counts[component.id] = total
+            if node_id != component.id:
+                counts[node_id] = total
+                self._producers[node_id] = component
+                consumed.add(component.id)
+
+        self.outputs = [
+            node_id for node_id in counts if node_id not in consumed
+        ]
+
+    @staticmethod
+    def _combine(component: Any, counts: List[int]) -> int:
+        """Count a component's configurations from its subsystems' counts."""
+        if isinstance(component, EXOComponent):
+            return sum(counts)
+        if isinstance(component, ALTComponent):
+            total = 1
+            for c in counts:
+                total *= 1 + c
+            return total - 1
+        total = 1
+        for c in counts:
+            total *= c
+        return total
+
+    @property
+    def total(self) -> int:
+        """Number of configurations of the whole SI graph."""
+        total = 1
+        for node_id in self.outputs:
+            total *= self.counts[node_id]
+        return total
+
+    def count(self, node_id: str) -> int:
+        """Number of configurations beneath a node or component.
+
+        Raises:
+            KeyError: If the node is unknown
+        """
+        return self.counts[node_id]
+
+    def sample(
+        self,
+        rng: Optional[random.Random] = None,
+        node_id: Optional[str] = None
+    ) -> Configuration:
+        """Draw a configuration uniformly at random.
+
+        EXO picks subsystem ``i`` with probability ``c_i / sum(c)``; ALT
+        keeps subsystem ``i`` with probability ``c_i / (1 + c_i)`` and
+        rejects the empty subset, which makes every non-empty subset as
+        likely as the number of configurations it leads to. Draws use
+        exact integer arithmetic, so huge counts stay uniform.
+
+        Args:
+            rng: Random number generator
+            node_id: Sample beneath this node only (default: whole graph)
+
+        Returns:
+            Selected subsystems of every component in the configuration
+
+        Raises:
+            ValueError: If there is no configuration to sample
+            KeyError: If the node is unknown
+        """
+        if (self.count(node_id) if node_id is not None else self.total) == 0:
+            raise ValueError("The SI graph has no configurations")
+        rng = rng or random.Random()
+        graph = self.si_graph.graph
+        configuration: Configuration = {}
+        stack = [node_id] if node_id is not None else list(self.outputs)
+        visited = set()
+
+        while stack:
+            current = stack.pop()
+            if current in visited:
+                continue
+            visited.add(current)
+
+            component = (
+                self._producers.get(current) or
+                self.si_graph.components.get(current)
+            )
+            if component is None:
+                if current in graph:
+                    stack.extend(graph.predecessors(current))
+                continue
+
+            selected = self._select(component, rng)
+            configuration[component.id] = selected
+            stack.extend(selected)
+
+        return configuration
+
+    def _select(self, component: Any, rng: random.Random) -> List[str]:
+        """Choose the subsystems of one component."""
+        members = subsystems_of(component)
+        counts = [self.counts.get(m, 1) for m in members]
+
+        if isinstance(component, EXOComponent):
+            pick = rng.randrange(sum(counts))
+            for member, c in zip(members, counts):
+                if pick < c:
+                    return [member]
+                pick -= c
+
+        if isinstance(component, ALTComponent):
+            while True:
+                selected = [
+                    member for member, c in zip(members, counts)
+                    if rng.randrange(1 + c) != 0
+                ]
+                if selected:
+                    return selected
+
+        return members
+
+    def samples(self, n: int, rng: Optional[random.Random] = None) -> List[Configuration]:
+        """Draw ``n`` independent uniform configurations."""
+        rng = rng or random.Random()
+        return [self.sample(rng) for _ in range(n)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the configuration counts to dictionary representation.
+
+        Counts are given as decimal strings since they exceed the
+        precision of JSON numbers; counts too long to print are given
+        only through ``log10``.
+        """
+        total = self.total
+        return {
+            "total": _decimal(total),
+            "log10": math.log10(total) if total > 0 else None,
+            "outputs": {
+                node_id: _decimal(self.counts[node_id]) for node_id in self.outputs
+            },
+        }
+
+
+def _decimal(value: int) -> Optional[str]:
+    """Format a count as a decimal string, or None if it is too long."""
+    try:
+        return str(value)
+    except ValueError:
+        # Beyond the interpreter's integer string conversion limit
+        return None
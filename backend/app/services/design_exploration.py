@@ -7,6 +7,9 @@ from ..models.de_components import (
     SIComponent, PIComponent, EIComponent,
     DIComponent, CBComponent, SAComponent
 )
+from .design_search import CostFunction, DesignSearch, SearchResult
+from .graph_conversion import GraphConversionEngine
+from .side_effects import DesignSideEffects, SideEffectReport
 
 
 class State(str, Enum):
@@ -47,6 +50,12 @@ class DesignExplorationEngine:
         self.current_intention: Optional[Any] = None
         self.candidate_solutions: list = []
         self.component_counter = 0
+        # Side effects of the latest applied solution
+        self.side_effect_report: Optional[SideEffectReport] = None
+
+        # LD view of the design kept current by assess_side_effects
+        self._converter = GraphConversionEngine()
+        self._side_effects: Optional[DesignSideEffects] = None
 
     def _generate_component_id(self, prefix: str) -> str:
         """Generate unique component ID."""
@@ -76,6 +85,60 @@ class DesignExplorationEngine:
 
         return self.de_graph
 
+    def search(
+        self,
+        initial_system: Any,
+        cost_fn: Optional[CostFunction] = None,
+        beam_width: Optional[int] = None,
+        max_nodes: int = 10000,
+        time_budget: Optional[float] = None
+    ) -> SearchResult:
+        """Search the knowledge base design space for a low-cost design.
+
+        Runs best-first search, or beam search when ``beam_width`` is
+        given, over decomposition and solution choices. The best design
+        found becomes the engine's DE graph.
+
+        Args:
+            initial_system: The initial system to design
+            cost_fn: Cost of adding one DE component (default: 1, i.e.
+                the design's component count)
+            beam_width: Optional beam width
+            max_nodes: Maximum number of search nodes to expand
+            time_budget: Optional wall-clock budget in seconds
+
+        Returns:
+            Search result with the best design and search statistics
+
+        Raises:
+            ValueError: If the engine has no knowledge base, or the beam
+                width is less than 1
+        """
+        if self.kb is None:
+            raise ValueError("Design search requires a knowledge base")
+
+        self.current_system = initial_system
+        self.current_state = State.SEARCHING
+
+        searcher = DesignSearch(self.kb, cost_fn=cost_fn)
+        result = searcher.search(
+            initial_system,
+            beam_width=beam_width,
+            max_nodes=max_nodes,
+            time_budget=time_budget
+        )
+
+        if result.node is not None:
+            # Only the kept design's components take engine IDs
+            self.de_graph = result.node.to_de_graph(
+                id_factory=self._generate_component_id
+            )
+            self._side_effects = None
+            self.side_effect_report = None
+        self.current_state = State.END if result.complete else State.SEARCHING
+
+        return result
+
     def _execute_exploration_sequence(self):
         """Execute a sample exploration sequence."""
         # This is a simplified version for demonstration
@@ -262,7 +325,9 @@ class DesignExplorationEngine:
         solution: Any,
         subsystem: Optional[Any] = None
     ) -> SAComponent:
-        """Execute solution assignment.
+        """Execute solution assignment and assess its side effects.
+
+        The report is kept in ``side_effect_report``.
 
         Args:
             system: The system to apply solution to
@@ -272,6 +337,7 @@ class DesignExplorationEngine:
         Returns:
             SAComponent instance
         """
+        self.current_state = State.APPLYING_SOLUTION
         if subsystem is None:
             subsystem = f"{system}_{solution}"
 
@@ -281,9 +347,38 @@ class DesignExplorationEngine:
             solution=solution,
             subsystem=subsystem
         )
+        self.side_effect_report = self.assess_side_effects(component)
 
         return component
 
+    def assess_side_effects(self, component: Any) -> SideEffectReport:
+        """Assess which parts of the design a new component affects.
+
+        The component's LD fragment is added to an LD view of the
+        design, and only the nodes downstream of the change are
+        re-evaluated. The LD view is built on first use from the DE
+        graph, and then updated incrementally with the components added
+        since.
+
+        Args:
+            component: The DE component just added (typically an SA)
+
+        Returns:
+            Report of the affected LD nodes
+        """
+        self.current_state = State.ASSESS_SIDE_EFFECT
+
+        if self._side_effects is None:
+            self._side_effects = DesignSideEffects(self.de_graph, self._converter)
+        report = self._side_effects.assess(component)
+
+        if report.has_side_effects:
+            self.current_state = State.SIDE_EFFECT_IDENTIFIED
+        else:
+            self.current_state = State.SUBSYSTEM_FOUND
+
+        return report
+
     def get_graph(self) -> DEGraph:
         """Get the current DE graph."""
         return self.de_graph
@@ -298,3 +393,5 @@ class DesignExplorationEngine:
         self.current_intention = None
         self.candidate_solutions = []
         self.component_counter = 0
+        self.side_effect_report = None
+        self._side_effects = None
@@ -0,0 +1,423 @@
+"""Best-first and beam search over the design space.
+
+A search node is a partial design: the DE components chosen so far
+(stored as a chain of steps back to the root) and the systems still
+open. Expanding a node resolves its next open system with every choice
+the knowledge base offers -- decomposing its intention or applying one
+of its solutions -- and each child costs its parent's cost plus the
+cost of the components it adds. Nodes whose resolved systems and open
+systems match a cheaper node are dominated and pruned. Only the design
+returned is materialized as a DE graph.
+"""
+
+import heapq
+import time
+from itertools import count as sequence
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from ..models.graphs import DEGraph
+from ..models.de_components import (
+    SIComponent, PIComponent, EIComponent, DIComponent, SAComponent
+)
+from ..instrumentation import count, timed
+from .knowledge_base import KnowledgeBase
+
+# Cost of adding one DE component to a design; must not be negative
+CostFunction = Callable[[Any], float]
+
+# (system, ID of the DI component that spawned it, depth)
+OpenSystem = Tuple[str, Optional[str], int]
+
+
+def component_count_cost(component: Any) -> float:
+    """Default cost: number of DE components in the design."""
+    return 1.0
+
+
+def solution_count_cost(component: Any) -> float:
+    """Cost counting applied solutions, preferring fewer solutions."""
+    return 1.0 if isinstance(component, SAComponent) else 0.0
+
+
+class SearchNode:
+    """Partial design reached by the search.
+
+    Each node stores only the components and edges added by its own
+    step and a pointer to its parent, so generating a child is O(1) in
+    the size of the design.
+    """
+
+    __slots__ = (
+        "parent", "components", "edges", "open_systems", "resolved",
+        "depth", "cost"
+    )
+
+    def __init__(
+        self,
+        parent: Optional["SearchNode"],
+        components: List[Any],
+        edges: List[Tuple[str, str]],
+        open_systems: Tuple[OpenSystem, ...],
+        resolved: FrozenSet[str]
+    ):
+        self.parent = parent
+        self.components = components
+        self.edges = edges
+        self.open_systems = open_systems
+        self.resolved = resolved
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.cost = 0.0
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether every system of the design is resolved."""
+        return not self.open_systems
+
+    def signature(self) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+        """Key under which partial designs compete for dominance.
+
+        Two designs that resolved the same systems and still have the
+        same systems open only differ in how they resolved them, so for
+        a cost that never decreases as a design grows the cheaper one
+        dominates.
+        """
+        return (
+            self.resolved,
+            tuple(sorted(system for system, _, _ in self.open_systems))
+        )
+
+    def steps(self) -> List["SearchNode"]:
+        """Get the chain of nodes from the root to this node."""
+        chain = []
+        node: Optional[SearchNode] = self
+        while node is not None:
+            chain.append(node)
+            node = node.parent
+        chain.reverse()
+        return chain
+
+    def to_de_graph(
+        self,
+        backend: Optional[str] = None,
+        id_factory: Optional[Callable[[str], str]] = None
+    ) -> DEGraph:
+        """Materialize the partial design as a DE graph.
+
+        Args:
+            backend: Optional graph backend
+            id_factory: Optional generator of fresh component IDs from a
+                prefix; components are renumbered with it in design order
+
+        Returns:
+            The DE graph
+        """
+        graph = DEGraph(backend=backend)
+        ids: Dict[str, str] = {}
+        for node in self.steps():
+            for component in node.components:
+                if id_factory is not None:
+                    new_id = id_factory(component.id.split("_", 1)[0])
+                    ids[component.id] = new_id
+                    component = component.model_copy(update={"id": new_id})
+                graph.add_component(component)
+            for source_id, target_id in node.edges:
+                graph.add_edge(ids.get(source_id, source_id), ids.get(target_id, target_id))
+        return graph
+
+
+def _progress_key(node: SearchNode) -> Tuple[int, float]:
+    """Ordering of partial designs: fewest open systems, then cost."""
+    return (len(node.open_systems), node.cost)
+
+
+class SearchResult:
+    """Outcome of a design search."""
+
+    def __init__(
+        self,
+        node: Optional[SearchNode],
+        complete: bool,
+        expanded: int,
+        generated: int,
+        pruned: int,
+        elapsed: float
+    ):
+        self.node = node
+        self.complete = complete
+        self.expanded = expanded
+        self.generated = generated
+        self.pruned = pruned
+        self.elapsed = elapsed
+
+    @property
+    def graph(self) -> Optional[DEGraph]:
+        """DE graph of the best design found."""
+        return self.node.to_de_graph() if self.node is not None else None
+
+    @property
+    def cost(self) -> Optional[float]:
+        """Cost of the best design found."""
+        return self.node.cost if self.node is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert search statistics to dictionary representation."""
+        return {
+            "complete": self.complete,
+            "cost": self.cost,
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "pruned": self.pruned,
+            "elapsed_ms": self.elapsed * 1000.0,
+        }
+
+
+class DesignSearch:
+    """Knowledge base driven search for low-cost designs."""
+
+    def __init__(
+        self,
+        knowledge_base: KnowledgeBase,
+        cost_fn: Optional[CostFunction] = None,
+        max_depth: int = 32
+    ):
+        """Initialize the search.
+
+        Args:
+            knowledge_base: Knowledge base providing the choices
+            cost_fn: Cost of adding one DE component to a design; a
+                design costs the sum over its components
+            max_depth: Decomposition depth beyond which systems are left
+                unresolved (guards against cyclic decompositions)
+        """
+        self.kb = knowledge_base
+        self.cost_fn = cost_fn or component_count_cost
+        self.max_depth = max_depth
+
+        # Search-local component IDs; materializing a design with an
+        # ID factory renumbers only the components it keeps
+        ids = sequence(1)
+        self._new_id = lambda prefix: f"{prefix}_{next(ids)}"
+
+    def _expand(self, node: SearchNode) -> List[SearchNode]:
+        """Generate one child per choice for the node's next open system."""
+        (system, parent_id, depth), rest = node.open_systems[0], node.open_systems[1:]
+        if system in node.resolved:
+            # Already resolved through another decomposition
+            return [SearchNode(node, [], [], rest, node.resolved)]
+        resolved = node.resolved | {system}
+
+        # The KB-known situation -> problem -> intention chain of the system
+        chain: List[Any] = []
+        situation = self.kb.query_situation(system)
+        if situation is not None:
+            chain.append(SIComponent(
+                id=self._new_id("SI"), system=system, situation=situation
+            ))
+        problem = self.kb.query_problem(system, situation) if situation else None
+        if problem is not None:
+            chain.append(PIComponent(
+                id=self._new_id("PI"), system=system, problem=problem
+            ))
+        intention = self.kb.query_intention(problem) if problem else None
+        if intention is not None:
+            chain.append(EIComponent(
+                id=self._new_id("EI"), system=system, problem=problem,
+                intention=intention
+            ))
+
+        # Choices: decompose the intention or apply one of the solutions
+        choices: List[Tuple[Any, Tuple[OpenSystem, ...]]] = []
+        decomposition = (
+            self.kb.query_decomposition(system, intention)
+            if intention is not None and depth < self.max_depth else None
+        )
+        if decomposition is not None:
+            di_comp = DIComponent(
+                id=self._new_id("DI"),
+                system=system,
+                intention=intention,
+                sub_intentions=list(decomposition["intentions"]),
+                sub_systems=list(decomposition["systems"])
+            )
+            children = tuple(
+                (sub_system, di_comp.id, depth + 1)
+                for sub_system in decomposition["systems"]
+                if sub_system not in resolved
+            )
+            choices.append((di_comp, children + rest))
+
+        for solution in self.kb.query_solutions(system):
+            sa_comp = SAComponent(
+                id=self._new_id("SA"),
+                system=system,
+                solution=solution,
+                subsystem=f"{system}_{solution}"
+            )
+            choices.append((sa_comp, rest))
+
+        if not choices:
+            # Nothing known: the system stays unresolved
+            choices.append((None, rest))
+
+        chain_edges = []
+        previous = parent_id
+        for component in chain:
+            if previous is not None:
+                chain_edges.append((previous, component.id))
+            previous = component.id
+
+        children_nodes = []
+        for choice, open_systems in choices:
+            components = list(chain)
+            edges = list(chain_edges)
+            if choice is not None:
+                components.append(choice)
+                if previous is not None:
+                    edges.append((previous, choice.id))
+            children_nodes.append(
+                SearchNode(node, components, edges, open_systems, resolved)
+            )
+        return children_nodes
+
+    @timed("design_search")
+    def search(
+        self,
+        initial_system: str,
+        beam_width: Optional[int] = None,
+        max_nodes: int = 10000,
+        time_budget: Optional[float] = None
+    ) -> SearchResult:
+        """Search for the lowest-cost complete design.
+
+        Without a beam width the search is best-first: the cheapest
+        partial design is always expanded next, and the first complete
+        design popped is optimal for non-decreasing costs. With a beam
+        width only the ``beam_width`` cheapest designs of each level are
+        kept, which bounds memory for spaces far too large to enumerate.
+
+        Args:
+            initial_system: The system to design
+            beam_width: Optional beam width
+            max_nodes: Maximum number of nodes to expand
+            time_budget: Optional wall-clock budget in seconds
+
+        Returns:
+            The best complete design, or the best partial design if the
+            budget ran out first
+
+        Raises:
+            ValueError: If the beam width is less than 1
+        """
+        if beam_width is not None and beam_width < 1:
+            raise ValueError(f"Beam width must be at least 1, got {beam_width}")
+        started = time.perf_counter()
+        deadline = started + time_budget if time_budget is not None else None
+        root = SearchNode(None, [], [], ((initial_system, None, 0),), frozenset())
+        cost_fn = self.cost_fn
+
+        stats = {"expanded": 0, "generated": 0, "pruned": 0}
+        best_by_signature: Dict[Any, float] = {root.signature(): root.cost}
+
+        def admit(child: SearchNode) -> bool:
+            child.cost = child.parent.cost + sum(
+                cost_fn(component) for component in child.components
+            )
+            stats["generated"] += 1
+            key = child.signature()
+            best = best_by_signature.get(key)
+            if best is not None and best <= child.cost:
+                stats["pruned"] += 1
+                return False
+            best_by_signature[key] = child.cost
+            return True
+
+        def out_of_budget() -> bool:
+            return (
+                stats["expanded"] >= max_nodes or
+                (deadline is not None and time.perf_counter() >= deadline)
+            )
+
+        if beam_width is None:
+            node, complete = self._best_first(root, admit, out_of_budget, stats)
+        else:
+            node, complete = self._beam(root, beam_width, admit, out_of_budget, stats)
+
+        count("search_nodes_expanded", stats["expanded"])
+        count("search_nodes_pruned", stats["pruned"])
+
+        return SearchResult(
+            node, complete, stats["expanded"], stats["generated"],
+            stats["pruned"], time.perf_counter() - started
+        )
+
+    def _best_first(
+        self,
+        root: SearchNode,
+        admit: Callable[[SearchNode], bool],
+        out_of_budget: Callable[[], bool],
+        stats: Dict[str, int]
+    ) -> Tuple[SearchNode, bool]:
+        """Best-first search; returns (node, complete)."""
+        tie = sequence()
+        heap = [(root.cost, next(tie), root)]
+        best_partial = root
+
+        while heap:
+            _, _, node = heapq.heappop(heap)
+            if node.is_complete:
+                return node, True
+            if _progress_key(node) < _progress_key(best_partial):
+                best_partial = node
+            if out_of_budget():
+                break
+
+            stats["expanded"] += 1
+            for child in self._expand(node):
+                if admit(child):
+                    heapq.heappush(heap, (child.cost, next(tie), child))
+
+        return best_partial, False
+
+    def _beam(
+        self,
+        root: SearchNode,
+        beam_width: int,
+        admit: Callable[[SearchNode], bool],
+        out_of_budget: Callable[[], bool],
+        stats: Dict[str, int]
+    ) -> Tuple[SearchNode, bool]:
+        """Beam search; returns (node, complete)."""
+        beam = [root]
+        best_complete: Optional[SearchNode] = None
+        best_partial = root
+
+        while beam and not out_of_budget():
+            candidates = []
+            for node in beam:
+                if out_of_budget():
+                    break
+                stats["expanded"] += 1
+                for child in self._expand(node):
+                    if not admit(child):
+                        continue
+                    if child.is_complete:
+                        if best_complete is None or child.cost < best_complete.cost:
+                            best_complete = child
+                    else:
+                        candidates.append(child)
+
+            candidates.sort(key=lambda n: n.cost)
+            beam = candidates[:beam_width]
+            if beam and _progress_key(beam[0]) < _progress_key(best_partial):
+                best_partial = beam[0]
+
+            # Nothing left in the beam can beat the best complete design
+            if best_complete is not None and (
+                not beam or beam[0].cost >= best_complete.cost
+            ):
+                break
+
+        if best_complete is not None:
+            return best_complete, True
+        return best_partial, False
+
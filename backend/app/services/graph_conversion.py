@@ -1,7 +1,12 @@
 """Graph Conversion Engine for transforming DE -> LD -> SI graphs."""
 
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 from ..models.graphs import DEGraph, LDGraph, SIGraph, LogicOperator
+from ..models.graph_index import (
+    GraphIndex,
+    LOGIC_NONE, LOGIC_AND, LOGIC_OR, LOGIC_XOR
+)
 from ..models.de_components import (
     SIComponent, PIComponent, EIComponent,
     DIComponent, CBComponent, SAComponent
@@ -11,6 +16,28 @@ from ..models.si_components import (
     ALTComponent, EXOComponent
 )
 from ..models.component import ComponentType
+from .. import instrumentation
+from ..instrumentation import count, timed
+from .subproblem_table import LDFragment, SubproblemTable
+
+
+# Fields each DE component type's LD fragment is built from
+_FRAGMENT_FIELDS: Dict[type, Tuple[str, ...]] = {
+    SIComponent: ("system", "situation"),
+    PIComponent: ("system", "problem"),
+    EIComponent: ("system", "problem", "intention"),
+    DIComponent: ("system", "intention", "sub_intentions", "sub_systems"),
+    CBComponent: ("system", "intention", "situation"),
+    SAComponent: ("system", "solution", "subsystem"),
+}
+
+
+def _fragment_key(component: Any) -> Tuple[Any, ...]:
+    """Key a component's LD fragment by its ID and the content it is built from."""
+    values = [getattr(component, name) for name in _FRAGMENT_FIELDS.get(type(component), ())]
+    return (component.id, type(component)) + tuple(
+        tuple(value) if isinstance(value, list) else value for value in values
+    )
 
 
 class GraphConversionEngine:
@@ -19,112 +46,188 @@ class GraphConversionEngine:
     Performs the transformation: DE Graph -> LD Graph -> SI Graph
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        subproblems: Optional[SubproblemTable] = None,
+        max_fragments: int = 65536
+    ):
+        """Initialize the graph conversion engine.
+
+        Args:
+            backend: Optional graph backend for produced LD/SI graphs
+            subproblems: Optional subproblem table shared with other
+                engines or exploration sessions
+            max_fragments: Maximum number of memoized component LD
+                fragments; the least recently used are evicted
+        """
         self.component_counter = 0
+        self.backend = backend
+        self.subproblems = subproblems if subproblems is not None else SubproblemTable()
+        self.max_fragments = max_fragments
+        # Component ID + content -> LD fragment
+        self._fragments: "OrderedDict[Tuple[Any, ...], LDFragment]" = OrderedDict()
 
     def _generate_id(self, prefix: str) -> str:
         """Generate unique ID."""
         self.component_counter += 1
         return f"{prefix}_{self.component_counter}"
 
+    @timed("ld_construction")
     def convert_de_to_ld(self, de_graph: DEGraph) -> LDGraph:
         """Convert DE graph to LD graph.
 
+        Each component's LD fragment is memoized by the engine, keyed by
+        the component's ID and content, and DI fragments are shared
+        through the subproblem table, so repeated conversions and
+        repeated (system, intention) subproblems are not translated
+        again.
+
         Args:
             de_graph: Design Exploration graph
 
         Returns:
             Logical Dependency graph
         """
-        ld_graph = LDGraph()
+        ld_graph = LDGraph(backend=self.backend)
+        reused = 0
 
+        fragments = self._fragments
         for component in de_graph.get_components():
-            if isinstance(component, SIComponent):
-                # SI: System -> (System, Situation)
-                sys_id = str(component.system)
-                eval_sys_id = f"{component.system}_{component.situation}"
-
-                ld_graph.add_node(sys_id, data=component.system)
-                ld_graph.add_node(
-                    eval_sys_id,
-                    data=(component.system, component.situation)
-                )
-                ld_graph.add_edge(sys_id, eval_sys_id)
-
-            elif isinstance(component, PIComponent):
-                # PI: System -> Problem
-                sys_id = str(component.system)
-                prob_id = str(component.problem)
-
-                ld_graph.add_node(sys_id, data=component.system)
-                ld_graph.add_node(prob_id, data=component.problem)
-                ld_graph.add_edge(sys_id, prob_id)
-
-            elif isinstance(component, EIComponent):
-                # EI: (System, Problem) -> Intention
-                sys_prob_id = f"{component.system}_{component.problem}"
-                int_id = str(component.intention)
-
-                ld_graph.add_node(
-                    sys_prob_id,
-                    data=(component.system, component.problem)
-                )
-                ld_graph.add_node(int_id, data=component.intention)
-                ld_graph.add_edge(
-                    sys_prob_id,
-                    int_id,
-                    logic=LogicOperator.AND
-                )
-
-            elif isinstance(component, DIComponent):
-                # DI: (System, Intention) -> {(Intentionk, Systemk)}
-                source_id = f"{component.system}_{component.intention}"
-                ld_graph.add_node(
-                    source_id,
-                    data=(component.system, component.intention)
-                )
-
-                for sub_int, sub_sys in zip(
-                    component.sub_intentions,
-                    component.sub_systems
-                ):
-                    target_id = f"{sub_int}_{sub_sys}"
-                    ld_graph.add_node(target_id, data=(sub_int, sub_sys))
-                    ld_graph.add_edge(
-                        source_id,
-                        target_id,
-                        logic=LogicOperator.AND
-                    )
+            key = _fragment_key(component)
+            if key in fragments:
+                reused += 1
+
+            nodes, edges = self.ld_fragment(component, key)
+            # CB branches are tagged with the situation they apply in
+            attrs = (
+                {"situation": component.situation}
+                if isinstance(component, CBComponent) else {}
+            )
+            for node_id, data in nodes:
+                ld_graph.add_node(node_id, data=data)
+            for source_id, target_id, logic in edges:
+                ld_graph.add_edge(source_id, target_id, logic=logic, **attrs)
+
+        if instrumentation.active():
+            count("de_components_processed", len(de_graph.components))
+            count("ld_fragments_reused", reused)
+            count("ld_nodes_processed", len(ld_graph.interner))
+            count("ld_edges_processed", ld_graph.graph.number_of_edges())
 
-            elif isinstance(component, CBComponent):
-                # CB: (System, Intention, Situation) -> (Intention, Situation)
-                source_id = f"{component.system}_{component.intention}_{component.situation}"
-                target_id = f"{component.intention}_{component.situation}"
-
-                ld_graph.add_node(
-                    source_id,
-                    data=(component.system, component.intention, component.situation)
-                )
-                ld_graph.add_node(
-                    target_id,
-                    data=(component.intention, component.situation)
-                )
-                ld_graph.add_edge(source_id, target_id)
-
-            elif isinstance(component, SAComponent):
-                # SA: (System, Solution) -> SubSystem
-                source_id = f"{component.system}_{component.solution}"
-                target_id = str(component.subsystem)
+        return ld_graph
 
-                ld_graph.add_node(
-                    source_id,
-                    data=(component.system, component.solution)
-                )
-                ld_graph.add_node(target_id, data=component.subsystem)
-                ld_graph.add_edge(source_id, target_id)
+    def ld_fragment(
+        self,
+        component: Any,
+        key: Optional[Tuple[Any, ...]] = None
+    ) -> LDFragment:
+        """Get the LD nodes and edges a DE component converts to.
 
-        return ld_graph
+        Args:
+            component: DE component
+            key: Its memo key, if already computed
 
+        Returns:
+            (node ID, node data) pairs and (source, target, logic) triples
+        """
+        if key is None:
+            key = _fragment_key(component)
+        fragments = self._fragments
+        fragment = fragments.get(key)
+        if fragment is not None:
+            fragments.move_to_end(key)
+            return fragment
+
+        fragment = fragments[key] = self._ld_fragment(component)
+        while len(fragments) > self.max_fragments:
+            fragments.popitem(last=False)
+        return fragment
+
+    def _ld_fragment(self, component: Any) -> LDFragment:
+        """Build or share the LD fragment of a DE component."""
+        if isinstance(component, DIComponent):
+            entry = self.subproblems.put(
+                component.system,
+                component.intention,
+                component.sub_intentions,
+                component.sub_systems
+            )
+            if entry.ld_fragment is None:
+                entry.ld_fragment = self._build_ld_fragment(component)
+            return entry.ld_fragment
+
+        return self._build_ld_fragment(component)
+
+    def _build_ld_fragment(self, component: Any) -> LDFragment:
+        """Translate a DE component into LD nodes and edges."""
+        nodes: List[Tuple[str, Any]] = []
+        edges: List[Tuple[str, str, Optional[LogicOperator]]] = []
+
+        if isinstance(component, SIComponent):
+            # SI: System -> (System, Situation)
+            sys_id = str(component.system)
+            eval_sys_id = f"{component.system}_{component.situation}"
+
+            nodes.append((sys_id, component.system))
+            nodes.append((eval_sys_id, (component.system, component.situation)))
+            edges.append((sys_id, eval_sys_id, None))
+
+        elif isinstance(component, PIComponent):
+            # PI: System -> Problem
+            sys_id = str(component.system)
+            prob_id = str(component.problem)
+
+            nodes.append((sys_id, component.system))
+            nodes.append((prob_id, component.problem))
+            edges.append((sys_id, prob_id, None))
+
+        elif isinstance(component, EIComponent):
+            # EI: (System, Problem) -> Intention
+            sys_prob_id = f"{component.system}_{component.problem}"
+            int_id = str(component.intention)
+
+            nodes.append((sys_prob_id, (component.system, component.problem)))
+            nodes.append((int_id, component.intention))
+            edges.append((sys_prob_id, int_id, LogicOperator.AND))
+
+        elif isinstance(component, DIComponent):
+            # DI: (System, Intention) -> {(Intentionk, Systemk)}
+            source_id = f"{component.system}_{component.intention}"
+            nodes.append((source_id, (component.system, component.intention)))
+
+            for sub_int, sub_sys in zip(
+                component.sub_intentions,
+                component.sub_systems
+            ):
+                target_id = f"{sub_int}_{sub_sys}"
+                nodes.append((target_id, (sub_int, sub_sys)))
+                edges.append((source_id, target_id, LogicOperator.AND))
+
+        elif isinstance(component, CBComponent):
+            # CB: (System, Intention, Situation) -> (Intention, Situation)
+            source_id = f"{component.system}_{component.intention}_{component.situation}"
+            target_id = f"{component.intention}_{component.situation}"
+
+            nodes.append((
+                source_id,
+                (component.system, component.intention, component.situation)
+            ))
+            nodes.append((target_id, (component.intention, component.situation)))
+            edges.append((source_id, target_id, None))
+
+        elif isinstance(component, SAComponent):
+            # SA: (System, Solution) -> SubSystem
+            source_id = f"{component.system}_{component.solution}"
+            target_id = str(component.subsystem)
+
+            nodes.append((source_id, (component.system, component.solution)))
+            nodes.append((target_id, component.subsystem))
+            edges.append((source_id, target_id, None))
+
+        return nodes, edges
+
+    @timed("ld_simplification")
     def simplify_ld_graph(self, ld_graph: LDGraph) -> LDGraph:
         """Simplify LD graph by removing intermediate nodes.
 
@@ -134,7 +237,7 @@ class GraphConversionEngine:
         Returns:
             Simplified LD graph
         """
-        simplified = LDGraph()
+        simplified = LDGraph(backend=self.backend)
 
         # Extract system and situation nodes only
         for node_id in ld_graph.get_nodes():
@@ -151,10 +254,14 @@ class GraphConversionEngine:
 
             if (self._is_system_or_situation(source_data) and
                     self._is_system_or_situation(target_data)):
+                attrs = (
+                    {"situation": edge['situation']} if 'situation' in edge else {}
+                )
                 simplified.add_edge(
                     edge['source'],
                     edge['target'],
-                    logic=edge.get('logic')
+                    logic=edge.get('logic'),
+                    **attrs
                 )
 
         return simplified
@@ -181,41 +288,55 @@ class GraphConversionEngine:
         Returns:
             Dictionary mapping level names to node lists
         """
-        hierarchies = {}
+        index = ld_graph.index()
+        levels = self._extract_levels(index)
 
-        # Simple topological sort for hierarchy levels
-        visited = set()
-        level = 0
+        return {
+            f"Level_{level}": index.interner.keys_of(node_ids)
+            for level, node_ids in enumerate(levels)
+        }
 
-        # Start with nodes that have no incoming edges (roots)
-        roots = []
-        for node_id in ld_graph.get_nodes():
-            if len(ld_graph.get_in_edges(node_id)) == 0:
-                roots.append(node_id)
+    @timed("hierarchy_extraction")
+    def _extract_levels(self, index: GraphIndex) -> List[List[int]]:
+        """Compute hierarchy levels over interned node IDs.
+
+        Args:
+            index: Integer-indexed adjacency of the LD graph
 
-        if roots:
-            hierarchies[f"Level_{level}"] = roots
-            visited.update(roots)
-            level += 1
+        Returns:
+            List of levels, each a list of node IDs
+        """
+        in_ptr = index.in_adj.indptr
+        out_ptr = index.out_adj.indptr
+        out_idx = index.out_adj.indices
+        visited = bytearray(index.num_nodes)
+
+        # Start with nodes that have no incoming edges (roots)
+        roots = [
+            i for i in range(index.num_nodes)
+            if in_ptr[i] == in_ptr[i + 1]
+        ]
+        if not roots:
+            return []
+        for i in roots:
+            visited[i] = 1
 
         # Process remaining nodes level by level
+        levels = [roots]
         current_level = roots
         while current_level:
             next_level = []
-            for node_id in current_level:
-                for neighbor in ld_graph.get_neighbors(node_id):
-                    if neighbor not in visited:
-                        next_level.append(neighbor)
-                        visited.add(neighbor)
+            for i in current_level:
+                for j in out_idx[out_ptr[i]:out_ptr[i + 1]]:
+                    if not visited[j]:
+                        visited[j] = 1
+                        next_level.append(j)
 
             if next_level:
-                hierarchies[f"Level_{level}"] = list(set(next_level))
-                level += 1
-                current_level = next_level
-            else:
-                current_level = []
+                levels.append(next_level)
+            current_level = next_level
 
-        return hierarchies
+        return levels
 
     def extract_si_components(
         self,
@@ -231,47 +352,80 @@ class GraphConversionEngine:
         Returns:
             Systems Integration graph
         """
-        si_graph = SIGraph()
+        index = ld_graph.index()
+        id_of = index.interner.id_of
+
+        levels = [
+            (int(level_name.split('_')[1]), [id_of(n) for n in node_ids])
+            for level_name, node_ids in hierarchies.items()
+        ]
+
+        si_graph = self._build_si_graph(index, levels)
+        self._extract_conditions(ld_graph, si_graph)
+        return si_graph
 
-        for level_name, node_ids in hierarchies.items():
-            level_num = int(level_name.split('_')[1])
+    @timed("si_extraction")
+    def _build_si_graph(
+        self,
+        index: GraphIndex,
+        levels: List[Tuple[int, List[int]]]
+    ) -> SIGraph:
+        """Build the SI graph from interned hierarchy levels.
 
-            for node_id in node_ids:
-                in_edges = ld_graph.get_in_edges(node_id)
+        Each node is classified from its incoming CSR row, so the pass
+        is O(n + e). Node IDs are mapped back to their string keys only
+        when they are written into the SI graph.
 
-                if len(in_edges) == 0:
+        Args:
+            index: Integer-indexed adjacency of the LD graph
+            levels: (level number, node IDs) pairs
+
+        Returns:
+            Systems Integration graph
+        """
+        si_graph = SIGraph(backend=self.backend)
+        key_of = index.interner.key_of
+        in_ptr = index.in_adj.indptr
+        in_idx = index.in_adj.indices
+        in_logic = index.in_adj.data
+
+        for level_num, node_ids in levels:
+            for i in node_ids:
+                start, end = in_ptr[i], in_ptr[i + 1]
+                node_id = key_of(i)
+
+                if start == end:
                     # Root node
                     si_graph.add_root(node_id, level_num)
 
-                elif len(in_edges) == 1:
+                elif end - start == 1:
                     # Simple dependency
-                    edge = in_edges[0]
                     si_graph.add_dependency(
-                        edge['source'],
+                        key_of(in_idx[start]),
                         node_id,
                         level_num
                     )
 
                 else:
                     # Multiple inputs - determine SI component type
-                    logic = self._determine_logic(in_edges)
-                    subsystems = [e['source'] for e in in_edges]
+                    logic = self._determine_logic_code(in_logic[start:end])
+                    subsystems = [key_of(j) for j in in_idx[start:end]]
 
-                    if logic == LogicOperator.AND:
+                    if logic == LOGIC_AND:
                         # Collaboration
                         comp = COLComponent(
                             id=self._generate_id("COL"),
                             subsystems=subsystems,
                             parent=node_id
                         )
-                    elif logic == LogicOperator.OR:
+                    elif logic == LOGIC_OR:
                         # Alternative
                         comp = ALTComponent(
                             id=self._generate_id("ALT"),
                             subsystems=subsystems,
                             parent=node_id
                         )
-                    elif logic == LogicOperator.XOR:
+                    elif logic == LOGIC_XOR:
                         # Exclusive
                         comp = EXOComponent(
                             id=self._generate_id("EXO"),
@@ -288,21 +442,26 @@ class GraphConversionEngine:
 
                     si_graph.add_component(comp, level_num)
 
+        if instrumentation.active():
+            count("si_nodes_processed", index.num_nodes)
+            count("si_edges_processed", index.num_edges)
+            count("si_components_created", len(si_graph.components))
+
         return si_graph
 
-    def _determine_logic(self, edges: List[Dict[str, Any]]) -> LogicOperator:
-        """Determine logic operator from edges."""
-        logics = [e.get('logic') for e in edges]
+    def _determine_logic_code(self, codes: Sequence[int]) -> int:
+        """Determine logic operator code from interned edge logic codes."""
+        present = {c for c in codes if c != LOGIC_NONE}
 
-        if all(l == LogicOperator.AND for l in logics if l):
-            return LogicOperator.AND
-        elif all(l == LogicOperator.OR for l in logics if l):
-            return LogicOperator.OR
-        elif all(l == LogicOperator.XOR for l in logics if l):
-            return LogicOperator.XOR
+        if not present or present == {LOGIC_AND}:
+            return LOGIC_AND
+        elif present == {LOGIC_OR}:
+            return LOGIC_OR
+        elif present == {LOGIC_XOR}:
+            return LOGIC_XOR
         else:
             # Default to OR for mixed or unspecified
-            return LogicOperator.OR
+            return LOGIC_OR
 
     def convert_de_to_si(self, de_graph: DEGraph) -> SIGraph:
         """Full conversion pipeline from DE to SI graph.
@@ -319,10 +478,144 @@ class GraphConversionEngine:
         # Step 2: Simplify LD graph
         simplified_ld = self.simplify_ld_graph(ld_graph)
 
-        # Step 3: Extract hierarchies
-        hierarchies = self.extract_hierarchies(simplified_ld)
+        # Step 3: Extract hierarchies (over interned node IDs)
+        index = simplified_ld.index()
+        levels = self._extract_levels(index)
 
         # Step 4: Extract SI components
-        si_graph = self.extract_si_components(simplified_ld, hierarchies)
+        si_graph = self._build_si_graph(index, list(enumerate(levels)))
+
+        # Step 5: Group CB branches into CND components
+        self._extract_conditions(simplified_ld, si_graph)
 
         return si_graph
+
+    @timed("condition_extraction")
+    def _extract_conditions(self, ld_graph: LDGraph, si_graph: SIGraph) -> None:
+        """Add a CND component per branched (system, intention).
+
+        LD edges tagged with a situation come from CB branches. The
+        branches of one (system, intention) divide its role between the
+        branch targets, one per situation, so they form a CND component
+        whose parent is the (system, intention) node.
+
+        Args:
+            ld_graph: LD graph with situation-tagged branch edges
+            si_graph: SI graph to add the CND components to
+        """
+        graph = ld_graph.graph
+        branches: Dict[str, List[Tuple[str, Any]]] = {}
+        for source, target in graph.edges():
+            attrs = graph[source][target]
+            if 'situation' not in attrs:
+                continue
+            data = ld_graph.get_node_data(source)
+            if isinstance(data, tuple) and len(data) == 3:
+                parent = f"{data[0]}_{data[1]}"
+            else:
+                parent = source
+            branches.setdefault(parent, []).append((target, attrs['situation']))
+
+        for parent, targets in branches.items():
+            # Same level as the deepest branch target, which the
+            # target's incoming dependency edges carry
+            level = 0
+            for target, _ in targets:
+                if target in si_graph.graph:
+                    for source in si_graph.graph.predecessors(target):
+                        level = max(
+                            level, si_graph.graph[source][target].get('level', 0)
+                        )
+
+            si_graph.add_component(
+                CNDComponent(
+                    id=self._generate_id("CND"),
+                    subsystems=[target for target, _ in targets],
+                    situations=[situation for _, situation in targets],
+                    parent=parent
+                ),
+                level
+            )
+
+        if instrumentation.active():
+            count("cnd_components_created", len(branches))
+
+    @timed("alternative_resolution")
+    def resolve_alternatives(
+        self,
+        si_graph: SIGraph,
+        selections: Optional[Dict[str, Any]] = None,
+        policy: Optional[Callable[[ALTComponent], Optional[Any]]] = None
+    ) -> SIGraph:
+        """Resolve ALT components into BUP components (spec 6.2.6).
+
+        The selected subsystem of each ALT becomes the primary of a new
+        BUP component and the remaining subsystems become its backups.
+        All ALTs are resolved in one pass over the graph's type index,
+        and each replacement keeps the node's edges and hierarchy
+        position, so the stage is linear in the number of alternatives.
+
+        Args:
+            si_graph: Systems Integration graph, modified in place
+            selections: Selected subsystem keyed by ALT component ID or
+                by the ALT's parent node ID
+            policy: Fallback chooser called with the ALT component for
+                alternatives without a selection; returning None leaves
+                the ALT unresolved
+
+        Returns:
+            The same SI graph with resolved alternatives
+
+        Raises:
+            ValueError: If a selection is not one of the ALT's subsystems;
+                the graph is then left unchanged
+        """
+        selections = selections or {}
+
+        # Choose and validate every selection before touching the graph,
+        # so an invalid one leaves it unchanged
+        chosen = []
+        for alt in si_graph.find_components_by_type(ComponentType.ALT):
+            selected = selections.get(alt.id, selections.get(alt.parent))
+            if selected is None and policy is not None:
+                selected = policy(alt)
+            if selected is None:
+                continue
+
+            if selected not in alt.subsystems:
+                raise ValueError(
+                    f"Selection {selected!r} is not a subsystem of {alt.id}"
+                )
+            chosen.append((alt, selected))
+
+        for alt, selected in chosen:
+            backup = BUPComponent(
+                id=self._generate_id("BUP"),
+                primary=selected,
+                backups=[s for s in alt.subsystems if s != selected],
+                parent=alt.parent,
+                metadata={**alt.metadata, "resolved_from": alt.id}
+            )
+            si_graph.replace_component(alt, backup)
+
+        if instrumentation.active():
+            count("alternatives_resolved", len(chosen))
+
+        return si_graph
+
+
+def select_first(alt: ALTComponent) -> Optional[Any]:
+    """Policy choosing the first subsystem of an alternative."""
+    return alt.subsystems[0] if alt.subsystems else None
+
+
+def select_last(alt: ALTComponent) -> Optional[Any]:
+    """Policy choosing the last subsystem of an alternative."""
+    return alt.subsystems[-1] if alt.subsystems else None
+
+
+# Named selection policies for resolve_alternatives
+ALTERNATIVE_POLICIES: Dict[str, Callable[[ALTComponent], Optional[Any]]] = {
+    "first": select_first,
+    "last": select_last,
+}
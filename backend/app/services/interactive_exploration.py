@@ -1,13 +1,26 @@
 """Interactive Design Exploration Service."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from enum import Enum
-from ..models.graphs import DEGraph
+from ..models.graphs import DEGraph, GraphType
 from ..models.de_components import (
     SIComponent, PIComponent, EIComponent,
     DIComponent, CBComponent, SAComponent
 )
+from .graph_conversion import GraphConversionEngine
 from .knowledge_base import KnowledgeBase
+from .side_effects import DesignSideEffects, SideEffectReport
+from .subproblem_table import SubproblemTable
+from .usage_sketch import UsageSketch
+from .work_queue import DEPTH_FIRST, WorkQueue
+
+# Number of ranked knowledge base candidates suggested at each step
+SUGGESTION_LIMIT = 5
+# Number of known names offered to choose from at each step
+AVAILABLE_LIMIT = 50
+# Number of pending subsystems listed, with their suggested situations,
+# after a branch ends
+PENDING_PREVIEW = 10
 
 
 class ExplorationStep(str, Enum):
@@ -27,16 +40,41 @@ class InteractiveExplorationEngine:
 
     Provides step-by-step guidance for design exploration,
     allowing users to make decisions at each step.
+
+    Each step's response carries only the components and edges the step
+    added (``added``) and bounded lists of names and pending subsystems,
+    so its cost does not grow with the design or the knowledge base.
+    Pass ``include_graph=True`` or call ``get_current_state`` for the
+    whole graph.
     """
 
-    def __init__(self, knowledge_base: Optional[KnowledgeBase] = None):
+    def __init__(
+        self,
+        knowledge_base: Optional[KnowledgeBase] = None,
+        backend: Optional[str] = None,
+        queue_order: str = DEPTH_FIRST,
+        usage: Optional[UsageSketch] = None,
+        subproblems: Optional[SubproblemTable] = None
+    ):
         """Initialize the interactive exploration engine.
 
         Args:
             knowledge_base: Optional knowledge base for suggestions
+            backend: Optional graph backend for the DE graph
+            queue_order: Order in which pending subsystems are explored
+                ("dfs", "bfs" or "priority")
+            usage: Optional usage statistics to record the designer's
+                choices in and rank the available names by; kept across
+                explorations
+            subproblems: Optional memo table of expanded (system,
+                intention) subproblems, e.g. shared with a conversion
+                engine
         """
         self.kb = knowledge_base or KnowledgeBase()
-        self.de_graph = DEGraph()
+        self.usage = usage if usage is not None else UsageSketch()
+        self.subproblems = subproblems if subproblems is not None else SubproblemTable()
+        self.backend = backend
+        self.de_graph = DEGraph(backend=backend)
         self.current_step = ExplorationStep.INIT
         self.component_counter = 0
 
@@ -45,48 +83,175 @@ class InteractiveExplorationEngine:
         self.current_situation: Optional[str] = None
         self.current_problem: Optional[str] = None
         self.current_intention: Optional[str] = None
-        self.pending_subsystems: List[str] = []
+        # Subsystems awaiting exploration with their spawning DI component
+        self.work_queue = WorkQueue(queue_order)
+
+        # Latest component of the current system's chain, the DI
+        # component that spawned the current system and its depth
+        self._frontier_id: Optional[str] = None
+        self._system_parent_id: Optional[str] = None
+        self._system_depth = 0
+        # Components and edges added by the step in progress
+        self._step_added: Optional[Tuple[List[Any], List[Tuple[str, str, Dict[str, Any]]]]] = None
+
+        # Side effects of the latest applied solution, assessed on an LD
+        # view of the DE graph
+        self.side_effect_report: Optional[SideEffectReport] = None
+        self._converter = GraphConversionEngine(backend=backend, subproblems=self.subproblems)
+        self._side_effects = DesignSideEffects(self.de_graph, self._converter)
+
+    @property
+    def pending_subsystems(self) -> List[str]:
+        """Snapshot of the pending subsystems in exploration order."""
+        return self.work_queue.snapshot()
 
     def _generate_component_id(self, prefix: str) -> str:
         """Generate unique component ID."""
         self.component_counter += 1
         return f"{prefix}_{self.component_counter}"
 
-    def start_exploration(self, initial_system: str) -> Dict[str, Any]:
-        """Start a new design exploration.
+    def _link_from(self, source_id: Optional[str], component: Any) -> None:
+        """Add a component linked from its logical parent.
 
-        Args:
-            initial_system: The initial system to explore
+        The component becomes the frontier of the current system's
+        chain, so linking the next step is O(1).
+        """
+        self.de_graph.add_component(component)
+        if self._step_added is not None:
+            self._step_added[0].append(component)
+        if source_id is not None:
+            self._add_edge(source_id, component.id)
+        self._frontier_id = component.id
+
+    def _add_edge(self, source_id: str, target_id: str, **attrs) -> None:
+        """Add an edge to the DE graph."""
+        self.de_graph.add_edge(source_id, target_id, **attrs)
+        if self._step_added is not None:
+            self._step_added[1].append((source_id, target_id, attrs))
+
+    def _start_step(self) -> None:
+        """Start collecting the components and edges a step adds."""
+        self._step_added = ([], [])
+
+    def _graph_fields(self, include_graph: bool) -> Dict[str, Any]:
+        """Get the components and edges the step added, and the graph if asked."""
+        components, edges = self._step_added or ([], [])
+        self._step_added = None
+        fields: Dict[str, Any] = {
+            "added": {
+                "type": GraphType.DE.value,
+                "nodes": [component.to_dict() for component in components],
+                "edges": [
+                    {"source": source, "target": target, **attrs}
+                    for source, target, attrs in edges
+                ],
+            }
+        }
+        if include_graph:
+            fields["graph"] = self.de_graph.to_dict()
+        return fields
+
+    def _available(self, step: str, context: Any, view: str) -> List[str]:
+        """Get known names of a view to choose from.
+
+        The names most chosen in the context come first, then the others
+        in sorted order, at most ``AVAILABLE_LIMIT`` in all.
+        """
+        names = [
+            name for name, _ in self.usage.top(step, context)
+            if self.kb.has_name(view, name)
+        ][:AVAILABLE_LIMIT]
+        chosen = set(names)
+        for name in self.kb.get_names(view, AVAILABLE_LIMIT + len(chosen)):
+            if len(names) >= AVAILABLE_LIMIT:
+                break
+            if name not in chosen:
+                names.append(name)
+        return names
+
+    def _advance_to_next_subsystem(self) -> Optional[str]:
+        """Move on to the next pending subsystem, or complete.
 
         Returns:
-            Dictionary with next step information
+            The next subsystem, or None if exploration is completed
         """
-        self.de_graph = DEGraph()
-        self.current_system = initial_system
-        self.current_step = ExplorationStep.SITUATION_ASSESSMENT
-        self.component_counter = 0
-        self.pending_subsystems = []
+        if self.work_queue:
+            item = self.work_queue.pop()
+            self._system_parent_id = item.parent_id
+            self._system_depth = item.depth
+            self._frontier_id = item.parent_id
+            self.current_system = item.system
+            self.current_step = ExplorationStep.SITUATION_ASSESSMENT
+            return item.system
+
+        self.current_step = ExplorationStep.COMPLETED
+        return None
+
+    def _next_subsystem_response(self, include_graph: bool) -> Dict[str, Any]:
+        """Build the response after a branch of the exploration ends."""
+        if self.current_step == ExplorationStep.COMPLETED:
+            return {
+                "step": self.current_step.value,
+                "message": "Design exploration completed!",
+                **self._graph_fields(include_graph)
+            }
 
-        # Get suggested situation from KB
-        suggested_situation = self.kb.query_situation(initial_system)
+        next_system = self.current_system
+        suggested_situations = self.kb.query_situations(next_system, SUGGESTION_LIMIT)
+        pending = self.work_queue.head(PENDING_PREVIEW)
 
         return {
             "step": self.current_step.value,
-            "system": self.current_system,
-            "suggested_situation": suggested_situation,
-            "available_situations": self.kb.get_all_situations(),
-            "message": f"Assess the situation for system: {initial_system}",
-            "graph": self.de_graph.to_dict()
+            "system": next_system,
+            "suggested_situation": suggested_situations[0] if suggested_situations else None,
+            "suggested_situations": suggested_situations,
+            "available_situations": self._available("situation", next_system, "situations"),
+            "pending_subsystems": pending,
+            "pending_count": len(self.work_queue),
+            "pending_situations": dict(zip(
+                pending, self.kb.query_situations_batch(pending, SUGGESTION_LIMIT)
+            )),
+            "message": f"Explore subsystem: {next_system}",
+            **self._graph_fields(include_graph)
         }
 
-    def assess_situation(self, situation: str) -> Dict[str, Any]:
-        """Execute situation assessment step.
+    def begin(self, initial_system: str, queue_order: Optional[str] = None) -> None:
+        """Reset state and begin exploring an initial system.
+
+        Args:
+            initial_system: The initial system to explore
+            queue_order: Optional new order for pending subsystems
+
+        Raises:
+            ValueError: If the queue order is unknown; the current
+                exploration is then left as it was
+        """
+        work_queue = WorkQueue(queue_order or self.work_queue.order)
+        self.de_graph = DEGraph(backend=self.backend)
+        self.current_system = initial_system
+        self.current_situation = None
+        self.current_problem = None
+        self.current_intention = None
+        self.current_step = ExplorationStep.SITUATION_ASSESSMENT
+        self.component_counter = 0
+        self.work_queue = work_queue
+        self._frontier_id = None
+        self._system_parent_id = None
+        self._system_depth = 0
+        self.side_effect_report = None
+        self._side_effects = DesignSideEffects(self.de_graph, self._converter)
+
+    def record_situation(self, situation: str, learn: bool = True) -> SIComponent:
+        """Record a situation assessment for the current system.
 
         Args:
             situation: The situation to assess
+            learn: Whether to count the choice in the usage statistics;
+                False for steps taken automatically rather than by the
+                designer
 
         Returns:
-            Dictionary with next step information
+            The created SI component
         """
         # Create SI component
         si_comp = SIComponent(
@@ -94,36 +259,26 @@ class InteractiveExplorationEngine:
             system=self.current_system,
             situation=situation
         )
-        self.de_graph.add_component(si_comp)
+        # A situation starts the chain of the system and hangs off the
+        # DI component that spawned it (if any)
+        self._link_from(self._system_parent_id, si_comp)
+        if learn:
+            self.usage.record("situation", self.current_system, situation)
         self.current_situation = situation
 
         # Move to problem identification
         self.current_step = ExplorationStep.PROBLEM_IDENTIFICATION
+        return si_comp
 
-        # Get suggested problem from KB
-        suggested_problem = self.kb.query_problem(
-            self.current_system,
-            situation
-        )
-
-        return {
-            "step": self.current_step.value,
-            "system": self.current_system,
-            "situation": situation,
-            "suggested_problem": suggested_problem,
-            "available_problems": self.kb.get_all_problems(),
-            "message": f"Identify problems for system in situation: {situation}",
-            "graph": self.de_graph.to_dict()
-        }
-
-    def identify_problem(self, problem: str) -> Dict[str, Any]:
-        """Execute problem identification step.
+    def record_problem(self, problem: str, learn: bool = True) -> PIComponent:
+        """Record an identified problem for the current system.
 
         Args:
             problem: The identified problem
+            learn: Whether to count the choice in the usage statistics
 
         Returns:
-            Dictionary with next step information
+            The created PI component
         """
         # Create PI component
         pi_comp = PIComponent(
@@ -131,38 +286,24 @@ class InteractiveExplorationEngine:
             system=self.current_system,
             problem=problem
         )
-        self.de_graph.add_component(pi_comp)
-
-        # Add edge from previous component
-        prev_components = self.de_graph.get_components()
-        if len(prev_components) > 1:
-            self.de_graph.add_edge(prev_components[-2].id, pi_comp.id)
-
+        self._link_from(self._frontier_id, pi_comp)
+        if learn:
+            self.usage.record("problem", (self.current_system, self.current_situation), problem)
         self.current_problem = problem
 
         # Move to intention establishment
         self.current_step = ExplorationStep.ESTABLISH_INTENTION
+        return pi_comp
 
-        # Get suggested intention from KB
-        suggested_intention = self.kb.query_intention(problem)
-
-        return {
-            "step": self.current_step.value,
-            "problem": problem,
-            "suggested_intention": suggested_intention,
-            "available_intentions": self.kb.get_all_intentions(),
-            "message": f"Establish intention to solve problem: {problem}",
-            "graph": self.de_graph.to_dict()
-        }
-
-    def establish_intention(self, intention: str) -> Dict[str, Any]:
-        """Execute intention establishment step.
+    def record_intention(self, intention: str, learn: bool = True) -> EIComponent:
+        """Record an established intention for the current problem.
 
         Args:
             intention: The established intention
+            learn: Whether to count the choice in the usage statistics
 
         Returns:
-            Dictionary with next step information
+            The created EI component
         """
         # Create EI component
         ei_comp = EIComponent(
@@ -171,51 +312,31 @@ class InteractiveExplorationEngine:
             problem=self.current_problem,
             intention=intention
         )
-        self.de_graph.add_component(ei_comp)
-
-        # Add edge from previous component
-        prev_components = self.de_graph.get_components()
-        if len(prev_components) > 1:
-            self.de_graph.add_edge(prev_components[-2].id, ei_comp.id)
-
+        self._link_from(self._frontier_id, ei_comp)
+        if learn:
+            self.usage.record("intention", self.current_problem, intention)
         self.current_intention = intention
 
-        # Check if decomposition is available
-        decomposition = self.kb.query_decomposition(
-            self.current_system,
-            intention
-        )
-
-        # Check if solutions are available
-        solutions = self.kb.query_solutions(self.current_system)
-
         # Move to path choice
         self.current_step = ExplorationStep.CHOOSE_PATH
+        return ei_comp
 
-        return {
-            "step": self.current_step.value,
-            "intention": intention,
-            "can_decompose": decomposition is not None,
-            "can_apply_solution": len(solutions) > 0,
-            "suggested_decomposition": decomposition,
-            "available_solutions": solutions,
-            "message": f"Choose next step: decompose intention or apply solution?",
-            "graph": self.de_graph.to_dict()
-        }
-
-    def decompose_intention(
+    def record_decomposition(
         self,
         sub_intentions: List[str],
         sub_systems: List[str]
-    ) -> Dict[str, Any]:
-        """Execute intention decomposition step.
+    ) -> DIComponent:
+        """Record an intention decomposition and queue its sub-systems.
+
+        The DI component is recorded in the subproblem table as the
+        expansion of the current (system, intention) in this graph.
 
         Args:
             sub_intentions: List of sub-intentions
             sub_systems: List of sub-systems
 
         Returns:
-            Dictionary with next step information
+            The created DI component
         """
         # Create DI component
         di_comp = DIComponent(
@@ -225,49 +346,29 @@ class InteractiveExplorationEngine:
             sub_intentions=sub_intentions,
             sub_systems=sub_systems
         )
-        self.de_graph.add_component(di_comp)
-
-        # Add edge from previous component
-        prev_components = self.de_graph.get_components()
-        if len(prev_components) > 1:
-            self.de_graph.add_edge(prev_components[-2].id, di_comp.id)
+        self._link_from(self._frontier_id, di_comp)
+        self.subproblems.record_expansion(di_comp, self.de_graph)
 
-        # Add subsystems to pending list for further exploration
-        self.pending_subsystems = sub_systems.copy()
+        # Queue subsystems for further exploration, keeping any
+        # subsystems still pending from earlier decompositions
+        self.work_queue.push_many(sub_systems, di_comp.id, self._system_depth + 1)
 
-        # If there are subsystems to explore, start with the first one
-        if self.pending_subsystems:
-            next_system = self.pending_subsystems.pop(0)
-            self.current_system = next_system
-            self.current_step = ExplorationStep.SITUATION_ASSESSMENT
-
-            suggested_situation = self.kb.query_situation(next_system)
+        # Continue with the next subsystem in queue order
+        self._advance_to_next_subsystem()
+        return di_comp
 
-            return {
-                "step": self.current_step.value,
-                "system": next_system,
-                "suggested_situation": suggested_situation,
-                "available_situations": self.kb.get_all_situations(),
-                "pending_subsystems": self.pending_subsystems,
-                "message": f"Explore subsystem: {next_system}",
-                "graph": self.de_graph.to_dict()
-            }
-        else:
-            self.current_step = ExplorationStep.COMPLETED
-            return {
-                "step": self.current_step.value,
-                "message": "Design exploration completed!",
-                "graph": self.de_graph.to_dict()
-            }
+    def record_solution(self, solution: str, learn: bool = True) -> SAComponent:
+        """Record a solution applied to the current system.
 
-    def apply_solution(self, solution: str) -> Dict[str, Any]:
-        """Execute solution application step.
+        Its side effects on the design are assessed and kept in
+        ``side_effect_report``.
 
         Args:
             solution: The solution to apply
+            learn: Whether to count the choice in the usage statistics
 
         Returns:
-            Dictionary with next step information
+            The created SA component
         """
         subsystem = f"{self.current_system}_{solution}"
 
@@ -278,40 +379,214 @@ class InteractiveExplorationEngine:
             solution=solution,
             subsystem=subsystem
         )
-        self.de_graph.add_component(sa_comp)
-
-        # Add edge from previous component
-        prev_components = self.de_graph.get_components()
-        if len(prev_components) > 1:
-            self.de_graph.add_edge(prev_components[-2].id, sa_comp.id)
+        self._link_from(self._frontier_id, sa_comp)
+        self.side_effect_report = self._side_effects.assess(sa_comp)
+        if learn:
+            self.usage.record("solution", self.current_system, solution)
 
         # Check if there are more pending subsystems
-        if self.pending_subsystems:
-            next_system = self.pending_subsystems.pop(0)
-            self.current_system = next_system
-            self.current_step = ExplorationStep.SITUATION_ASSESSMENT
+        self._advance_to_next_subsystem()
+        return sa_comp
 
-            suggested_situation = self.kb.query_situation(next_system)
+    def graft_subproblem(self, di_component_id: str) -> Optional[str]:
+        """Reuse an already expanded decomposition for the current system.
 
-            return {
-                "step": self.current_step.value,
-                "system": next_system,
-                "suggested_situation": suggested_situation,
-                "available_situations": self.kb.get_all_situations(),
-                "pending_subsystems": self.pending_subsystems,
-                "message": f"Explore subsystem: {next_system}",
-                "graph": self.de_graph.to_dict()
-            }
+        Links the latest component to the DI component that already
+        expands the current (system, intention), so its subtree is
+        shared by reference, and moves on without queuing its
+        sub-systems again.
+
+        Args:
+            di_component_id: ID of the existing DI component
+
+        Returns:
+            The next subsystem, or None if exploration is completed
+        """
+        if self._frontier_id is not None:
+            self._add_edge(self._frontier_id, di_component_id, grafted=True)
+        return self._advance_to_next_subsystem()
+
+    def skip_subsystem(self) -> Optional[str]:
+        """Leave the current system unresolved and move on.
+
+        Returns:
+            The next subsystem, or None if exploration is completed
+        """
+        return self._advance_to_next_subsystem()
+
+    def start_exploration(
+        self,
+        initial_system: str,
+        queue_order: Optional[str] = None,
+        include_graph: bool = False
+    ) -> Dict[str, Any]:
+        """Start a new design exploration.
+
+        Args:
+            initial_system: The initial system to explore
+            queue_order: Optional order for pending subsystems
+                ("dfs", "bfs" or "priority")
+            include_graph: Whether to include the whole DE graph
+
+        Returns:
+            Dictionary with next step information
+        """
+        self.begin(initial_system, queue_order)
+        self._start_step()
+
+        # Get suggested situations from KB
+        suggested_situations = self.kb.query_situations(initial_system, SUGGESTION_LIMIT)
+
+        return {
+            "step": self.current_step.value,
+            "system": self.current_system,
+            "suggested_situation": suggested_situations[0] if suggested_situations else None,
+            "suggested_situations": suggested_situations,
+            "available_situations": self._available("situation", initial_system, "situations"),
+            "message": f"Assess the situation for system: {initial_system}",
+            **self._graph_fields(include_graph)
+        }
+
+    def assess_situation(self, situation: str, include_graph: bool = False) -> Dict[str, Any]:
+        """Execute situation assessment step.
+
+        Args:
+            situation: The situation to assess
+            include_graph: Whether to include the whole DE graph
+
+        Returns:
+            Dictionary with next step information
+        """
+        self._start_step()
+        self.record_situation(situation)
+
+        # Get suggested problems from KB
+        suggested_problems = self.kb.query_problems(
+            self.current_system,
+            situation,
+            SUGGESTION_LIMIT
+        )
+
+        return {
+            "step": self.current_step.value,
+            "system": self.current_system,
+            "situation": situation,
+            "suggested_problem": suggested_problems[0] if suggested_problems else None,
+            "suggested_problems": suggested_problems,
+            "available_problems": self._available(
+                "problem", (self.current_system, situation), "problems"
+            ),
+            "message": f"Identify problems for system in situation: {situation}",
+            **self._graph_fields(include_graph)
+        }
+
+    def identify_problem(self, problem: str, include_graph: bool = False) -> Dict[str, Any]:
+        """Execute problem identification step.
+
+        Args:
+            problem: The identified problem
+            include_graph: Whether to include the whole DE graph
+
+        Returns:
+            Dictionary with next step information
+        """
+        self._start_step()
+        self.record_problem(problem)
+
+        # Get suggested intentions from KB
+        suggested_intentions = self.kb.query_intentions(problem, SUGGESTION_LIMIT)
+
+        return {
+            "step": self.current_step.value,
+            "problem": problem,
+            "suggested_intention": suggested_intentions[0] if suggested_intentions else None,
+            "suggested_intentions": suggested_intentions,
+            "available_intentions": self._available("intention", problem, "intentions"),
+            "message": f"Establish intention to solve problem: {problem}",
+            **self._graph_fields(include_graph)
+        }
+
+    def establish_intention(self, intention: str, include_graph: bool = False) -> Dict[str, Any]:
+        """Execute intention establishment step.
+
+        Args:
+            intention: The established intention
+            include_graph: Whether to include the whole DE graph
+
+        Returns:
+            Dictionary with next step information
+        """
+        self._start_step()
+        self.record_intention(intention)
+
+        # Check if decomposition is available
+        decomposition = self.kb.query_decomposition(
+            self.current_system,
+            intention
+        )
+
+        # Check if solutions are available
+        solutions = self.kb.query_solutions(self.current_system)
+
+        return {
+            "step": self.current_step.value,
+            "intention": intention,
+            "can_decompose": decomposition is not None,
+            "can_apply_solution": len(solutions) > 0,
+            "suggested_decomposition": decomposition,
+            "available_solutions": self.usage.rank("solution", self.current_system, solutions),
+            "message": f"Choose next step: decompose intention or apply solution?",
+            **self._graph_fields(include_graph)
+        }
+
+    def decompose_intention(
+        self,
+        sub_intentions: List[str],
+        sub_systems: List[str],
+        include_graph: bool = False
+    ) -> Dict[str, Any]:
+        """Execute intention decomposition step.
+
+        If the same decomposition of the current (system, intention) is
+        already expanded in this graph, it is grafted instead of being
+        expanded again.
+
+        Args:
+            sub_intentions: List of sub-intentions
+            sub_systems: List of sub-systems
+            include_graph: Whether to include the whole DE graph
+
+        Returns:
+            Dictionary with next step information
+        """
+        self._start_step()
+        entry = self.subproblems.get(self.current_system, self.current_intention)
+        root = entry.roots.get(self.de_graph) if entry is not None else None
+        if root is not None and entry.matches(sub_intentions, sub_systems):
+            self.graft_subproblem(root)
         else:
-            self.current_step = ExplorationStep.COMPLETED
-            return {
-                "step": self.current_step.value,
-                "message": "Design exploration completed!",
-                "graph": self.de_graph.to_dict()
-            }
+            self.record_decomposition(sub_intentions, sub_systems)
+        return self._next_subsystem_response(include_graph)
+
+    def apply_solution(self, solution: str, include_graph: bool = False) -> Dict[str, Any]:
+        """Execute solution application step.
+
+        Args:
+            solution: The solution to apply
+            include_graph: Whether to include the whole DE graph
+
+        Returns:
+            Dictionary with next step information, including the side
+            effects of the solution
+        """
+        self._start_step()
+        self.record_solution(solution)
+        response = self._next_subsystem_response(include_graph)
+        response["side_effects"] = self.side_effect_report.to_dict()
+        return response
 
     def get_current_state(self) -> Dict[str, Any]:
-        """Get current exploration state.
+        """Get current exploration state, with the whole DE graph.
 
         Returns:
             Dictionary with current state information
@@ -332,11 +607,16 @@ class InteractiveExplorationEngine:
 
     def reset(self):
         """Reset the exploration state."""
-        self.de_graph = DEGraph()
+        self.de_graph = DEGraph(backend=self.backend)
         self.current_step = ExplorationStep.INIT
         self.component_counter = 0
         self.current_system = None
         self.current_situation = None
         self.current_problem = None
         self.current_intention = None
-        self.pending_subsystems = []
+        self.work_queue.clear()
+        self._frontier_id = None
+        self._system_parent_id = None
+        self._system_depth = 0
+        self.side_effect_report = None
+        self._side_effects = DesignSideEffects(self.de_graph, self._converter)
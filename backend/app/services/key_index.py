@@ -0,0 +1,159 @@
+"""Normalized and fuzzy matching of knowledge base keys.
+
+Designers write "obstacle detected", "Obstacle-Detected" or
+"obstacle_detected" for the same situation. ``normalize_key`` maps all
+of them to one form (Unicode NFKC, case-folded, runs of whitespace and
+separators turned into a single "_"), so lookups can fall back to it
+when the exact key misses.
+
+``TrigramIndex`` ranks near matches ("colision risk" ->
+"collision_risk") by the Dice coefficient of their character trigram
+sets. Candidates are gathered only from the postings of the query's
+rarest trigrams (prefix filtering): a name reaching the similarity
+threshold must share at least ``t`` of the query's ``m`` trigrams, so
+it appears in one of any ``m - t + 1`` of their posting lists. The cost
+of a query thus depends on those postings, not on the vocabulary size.
+"""
+
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+# Similarity below which suggestions are dropped
+MIN_SIMILARITY = 0.4
+
+_SEPARATORS = re.compile(r"[\s_\-.]+")
+
+
+def normalize_key(value: Any) -> Any:
+    """Normalize a key, or each part of a tuple key.
+
+    Args:
+        value: Key to normalize
+
+    Returns:
+        Normalized string, or tuple of normalized strings
+    """
+    if isinstance(value, tuple):
+        return tuple(normalize_key(part) for part in value)
+    text = unicodedata.normalize("NFKC", str(value)).casefold()
+    return _SEPARATORS.sub("_", text).strip("_")
+
+
+def trigrams(normalized: str) -> Set[str]:
+    """Get the character trigrams of a normalized key, padded at both ends."""
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Trigram postings over a vocabulary of names, for ranked suggestions."""
+
+    def __init__(self, names: Iterable[Any] = ()):
+        """Index names.
+
+        Args:
+            names: Names to index; several may share a normalized form
+        """
+        # normalized form -> names
+        self._names: Dict[str, List[Any]] = {}
+        # normalized form -> number of its trigrams
+        self._sizes: Dict[str, int] = {}
+        # trigram -> normalized forms containing it
+        self._postings: Dict[str, Set[str]] = {}
+        for name in names:
+            self.add(name)
+
+    def add(self, name: Any) -> None:
+        """Index one more name."""
+        normalized = normalize_key(name)
+        names = self._names.get(normalized)
+        if names is not None:
+            names.append(name)
+            return
+        self._names[normalized] = [name]
+        grams = trigrams(normalized)
+        self._sizes[normalized] = len(grams)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(normalized)
+
+    def remove(self, name: Any) -> None:
+        """Stop indexing a name.
+
+        Raises:
+            KeyError: If the name is not indexed
+        """
+        normalized = normalize_key(name)
+        names = self._names.get(normalized)
+        if names is None or name not in names:
+            raise KeyError(name)
+        names.remove(name)
+        if names:
+            return
+        del self._names[normalized]
+        del self._sizes[normalized]
+        for gram in trigrams(normalized):
+            posting = self._postings[gram]
+            posting.discard(normalized)
+            if not posting:
+                del self._postings[gram]
+
+    def lookup(self, value: Any) -> List[Any]:
+        """Get the names whose normalized form equals the value's."""
+        return list(self._names.get(normalize_key(value), ()))
+
+    def suggest(
+        self,
+        value: Any,
+        limit: int = 5,
+        min_similarity: float = MIN_SIMILARITY
+    ) -> List[Tuple[Any, float]]:
+        """Rank the names most similar to a value.
+
+        Args:
+            value: Misspelled or partial name
+            limit: Maximum number of suggestions
+            min_similarity: Lowest Dice coefficient to suggest, in (0, 1]
+
+        Returns:
+            (name, similarity) pairs, most similar first
+        """
+        grams = trigrams(normalize_key(value))
+        m = len(grams)
+        # 2c / (m + n) >= s with c <= n gives c >= s * m / (2 - s)
+        needed = max(1, math.ceil(min_similarity * m / (2.0 - min_similarity) - 1e-9))
+        postings = self._postings
+        rarest = sorted(grams, key=lambda gram: len(postings.get(gram, ())))
+
+        # Every candidate is in one of the rarest postings; the other grams
+        # are only probed for the candidates
+        shared_counts: Counter = Counter()
+        for gram in rarest[:m - needed + 1]:
+            shared_counts.update(postings.get(gram, ()))
+        rest = [postings.get(gram, ()) for gram in rarest[m - needed + 1:]]
+
+        sizes = self._sizes
+        scored = []
+        for normalized, shared in shared_counts.items():
+            for posting in rest:
+                if normalized in posting:
+                    shared += 1
+            similarity = 2.0 * shared / (m + sizes[normalized])
+            if similarity >= min_similarity:
+                scored.append((similarity, normalized))
+
+        results: List[Tuple[Any, float]] = []
+        best = heapq.nsmallest(limit, scored, key=lambda item: (-item[0], item[1]))
+        for similarity, normalized in best:
+            for name in self._names[normalized]:
+                results.append((name, similarity))
+        return results[:limit]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        return f"TrigramIndex(names={len(self._names)}, trigrams={len(self._postings)})"
@@ -1,6 +1,95 @@
 """Knowledge Base for design exploration."""
 
-from typing import Any, Dict, List, Optional
+import heapq
+import json
+import sys
+from bisect import bisect_left, insort
+from itertools import count as sequence
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .. import instrumentation
+from ..instrumentation import count
+from .key_index import TrigramIndex, normalize_key
+from .ranked_candidates import DEFAULT_WEIGHT, RankedCandidates
+
+
+def _record_lookup(relation: str, result: Any) -> Any:
+    """Count a knowledge base lookup as a hit or miss."""
+    if instrumentation.active():
+        count(
+            "kb_lookups",
+            labels=(("relation", relation), ("result", "miss" if not result else "hit"))
+        )
+    return result
+
+
+def _record_lookups(relation: str, results: List[Any]) -> List[Any]:
+    """Count a batch of knowledge base lookups as hits and misses."""
+    if not instrumentation.active():
+        return results
+    hits = sum(1 for result in results if result)
+    for result, value in (("hit", hits), ("miss", len(results) - hits)):
+        if value:
+            count("kb_lookups", value, (("relation", relation), ("result", result)))
+    return results
+
+
+# Process-unique knowledge base identities
+_kb_ids = sequence(1)
+
+
+def _intern(value: Any) -> Any:
+    """Intern strings, and the strings in lists, so each is stored once."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return [_intern(item) for item in value]
+    if isinstance(value, RankedCandidates):
+        return RankedCandidates((_intern(name), weight) for name, weight in value.by_age())
+    return value
+
+
+def _ranked(entries: Dict[Any, str]) -> Dict[Any, RankedCandidates]:
+    """Turn single-valued entries into ranked candidates."""
+    return {key: RankedCandidates.single(value) for key, value in entries.items()}
+
+
+# Relations stored in ``_<relation>`` dicts, and the name views
+# ``get_all_<view>`` lists
+RELATIONS = ("situations", "problems", "intentions", "decompositions", "solutions")
+VIEWS = ("systems", "situations", "problems", "intentions")
+# Relations whose entries are ``RankedCandidates``
+RANKED_RELATIONS = ("situations", "problems", "intentions")
+
+
+def _contributions(relation: str, key: Any, value: Any) -> List[Tuple[str, Any]]:
+    """Get the (view, name) pairs one relation entry adds to the name views."""
+    if relation == "situations":
+        return [("systems", key)] + [("situations", name) for name in value]
+    if relation == "problems":
+        return [("problems", name) for name in value]
+    if relation == "intentions":
+        return [("intentions", name) for name in value]
+    if relation == "decompositions":
+        return [("intentions", name) for name in value["intentions"]] + [
+            ("systems", name) for name in value["systems"]
+        ]
+    return [("systems", key)]
+
+
+def _export_candidates(candidates: RankedCandidates) -> Any:
+    """Export ranked candidates in the ``to_dict`` format."""
+    pairs = candidates.by_age()
+    if len(pairs) == 1 and pairs[0][1] == DEFAULT_WEIGHT:
+        return pairs[0][0]
+    return dict(pairs)
+
+
+def _import_candidates(value: Any) -> RankedCandidates:
+    """Import ranked candidates from the ``to_dict`` format."""
+    if isinstance(value, dict):
+        return RankedCandidates(value.items())
+    return RankedCandidates.single(value)
 
 
 class KnowledgeBase:
@@ -8,40 +97,63 @@ class KnowledgeBase:
 
     This class provides queries for situations, problems, intentions,
     solutions, and decompositions during design exploration.
+
+    A system may be in several situations, a (system, situation) may pose
+    several problems and a problem may call for several intentions; each
+    has a weight. ``query_situation`` and friends return the best
+    candidate, ``query_situations`` and friends the top ``k``.
     """
 
-    def __init__(self):
-        """Initialize knowledge base with predefined data."""
+    def __init__(self, load_defaults: bool = True):
+        """Initialize knowledge base with predefined data.
+
+        Args:
+            load_defaults: Whether to load the collision avoidance example
+        """
         self._situations = {}
         self._problems = {}
         self._intentions = {}
         self._solutions = {}
         self._decompositions = {}
+        # (uid, revision) identifies the knowledge base's current contents
+        self.uid = next(_kb_ids)
+        self.revision = 0
+        self.frozen = False
+        # view -> name -> occurrences, and view -> sorted names; built on
+        # first use, then kept current by ``_set``
+        self._view_counts: Optional[Dict[str, Dict[Any, int]]] = None
+        self._view_names: Dict[str, List[Any]] = {}
+        # relation -> normalized key -> key, built on first miss
+        self._normalized_keys: Dict[str, Dict[Any, Any]] = {}
+        # view -> trigram index of its names, built on first use, then
+        # kept current with the names
+        self._trigram_indexes: Dict[str, TrigramIndex] = {}
 
         # Load default knowledge
-        self._load_collision_avoidance_knowledge()
+        if load_defaults:
+            self._load_collision_avoidance_knowledge()
 
     def _load_collision_avoidance_knowledge(self):
         """Load knowledge for collision avoidance system example."""
 
         # Situations
-        self._situations = {
+        self._situations = _ranked({
             "car_running": "obstacle_detected",
             "auto_maneuvering_system": "normal_driving",
             "human_maneuvering_system": "low_visibility",
-        }
+        })
 
         # Problems
-        self._problems = {
+        self._problems = _ranked({
             ("car_running", "obstacle_detected"): "collision_risk",
             ("human_maneuvering_system", "low_visibility"): "visibility_impaired",
-        }
+        })
 
         # Intentions
-        self._intentions = {
+        self._intentions = _ranked({
             "collision_risk": "avoid_collision",
             "visibility_impaired": "support_driver_in_low_visibility",
-        }
+        })
 
         # Decompositions
         self._decompositions = {
@@ -69,9 +181,9 @@ class KnowledgeBase:
             system: The system to query
 
         Returns:
-            Situation string or None
+            Best ranked situation string or None
         """
-        return self._situations.get(str(system))
+        return _record_lookup("situation", self._best("situations", str(system)))
 
     def query_problem(self, system: Any, situation: Any) -> Optional[str]:
         """Query problem for a given system and situation.
@@ -81,10 +193,10 @@ class KnowledgeBase:
             situation: The situation
 
         Returns:
-            Problem string or None
+            Best ranked problem string or None
         """
         key = (str(system), str(situation))
-        return self._problems.get(key)
+        return _record_lookup("problem", self._best("problems", key))
 
     def query_intention(self, problem: Any) -> Optional[str]:
         """Query intention for a given problem.
@@ -93,9 +205,107 @@ class KnowledgeBase:
             problem: The problem to solve
 
         Returns:
-            Intention string or None
+            Best ranked intention string or None
+        """
+        return _record_lookup("intention", self._best("intentions", str(problem)))
+
+    def query_situations(self, system: Any, k: Optional[int] = None) -> List[str]:
+        """Query the highest ranked situations of a system.
+
+        Args:
+            system: The system to query
+            k: Maximum number of situations (all if None)
+
+        Returns:
+            Situations, best first
+        """
+        return _record_lookup("situation", self._top("situations", str(system), k))
+
+    def query_problems(
+        self,
+        system: Any,
+        situation: Any,
+        k: Optional[int] = None
+    ) -> List[str]:
+        """Query the highest ranked problems of a system in a situation.
+
+        Args:
+            system: The system
+            situation: The situation
+            k: Maximum number of problems (all if None)
+
+        Returns:
+            Problems, best first
         """
-        return self._intentions.get(str(problem))
+        key = (str(system), str(situation))
+        return _record_lookup("problem", self._top("problems", key, k))
+
+    def query_intentions(self, problem: Any, k: Optional[int] = None) -> List[str]:
+        """Query the highest ranked intentions for a problem.
+
+        Args:
+            problem: The problem to solve
+            k: Maximum number of intentions (all if None)
+
+        Returns:
+            Intentions, best first
+        """
+        return _record_lookup("intention", self._top("intentions", str(problem), k))
+
+    def query_situations_batch(
+        self,
+        systems: Iterable[Any],
+        k: Optional[int] = None
+    ) -> List[List[str]]:
+        """Query the highest ranked situations of many systems at once.
+
+        Args:
+            systems: Systems to query
+            k: Maximum number of situations per system (all if None)
+
+        Returns:
+            Situations of each system, best first, in the given order
+        """
+        return _record_lookups("situation", [
+            self._top("situations", str(system), k) for system in systems
+        ])
+
+    def query_problems_batch(
+        self,
+        pairs: Iterable[Tuple[Any, Any]],
+        k: Optional[int] = None
+    ) -> List[List[str]]:
+        """Query the highest ranked problems of many (system, situation) pairs.
+
+        Args:
+            pairs: (system, situation) pairs to query
+            k: Maximum number of problems per pair (all if None)
+
+        Returns:
+            Problems of each pair, best first, in the given order
+        """
+        return _record_lookups("problem", [
+            self._top("problems", (str(system), str(situation)), k)
+            for system, situation in pairs
+        ])
+
+    def query_intentions_batch(
+        self,
+        problems: Iterable[Any],
+        k: Optional[int] = None
+    ) -> List[List[str]]:
+        """Query the highest ranked intentions for many problems at once.
+
+        Args:
+            problems: Problems to query
+            k: Maximum number of intentions per problem (all if None)
+
+        Returns:
+            Intentions for each problem, best first, in the given order
+        """
+        return _record_lookups("intention", [
+            self._top("intentions", str(problem), k) for problem in problems
+        ])
 
     def query_decomposition(
         self,
@@ -112,7 +322,7 @@ class KnowledgeBase:
             Dictionary with 'intentions' and 'systems' lists
         """
         key = (str(system), str(intention))
-        return self._decompositions.get(key)
+        return _record_lookup("decomposition", self._lookup("decompositions", key))
 
     def query_solutions(self, system: Any) -> List[str]:
         """Query available solutions for a given system.
@@ -123,19 +333,30 @@ class KnowledgeBase:
         Returns:
             List of solution strings
         """
-        return self._solutions.get(str(system), [])
+        solutions = self._lookup("solutions", str(system))
+        return _record_lookup("solutions", solutions if solutions is not None else [])
 
-    def add_situation(self, system: str, situation: str):
-        """Add a situation to the knowledge base."""
-        self._situations[system] = situation
+    def add_situation(self, system: str, situation: str, weight: float = DEFAULT_WEIGHT):
+        """Add a situation to the knowledge base.
 
-    def add_problem(self, system: str, situation: str, problem: str):
-        """Add a problem to the knowledge base."""
-        self._problems[(system, situation)] = problem
+        Among equally weighted situations of a system, the one added last
+        ranks first; adding a known situation again updates its weight.
+        """
+        self._add_candidate("situations", system, situation, weight)
 
-    def add_intention(self, problem: str, intention: str):
-        """Add an intention to the knowledge base."""
-        self._intentions[problem] = intention
+    def add_problem(
+        self,
+        system: str,
+        situation: str,
+        problem: str,
+        weight: float = DEFAULT_WEIGHT
+    ):
+        """Add a problem to the knowledge base (ranked like situations)."""
+        self._add_candidate("problems", (system, situation), problem, weight)
+
+    def add_intention(self, problem: str, intention: str, weight: float = DEFAULT_WEIGHT):
+        """Add an intention to the knowledge base (ranked like situations)."""
+        self._add_candidate("intentions", problem, intention, weight)
 
     def add_decomposition(
         self,
@@ -145,47 +366,538 @@ class KnowledgeBase:
         sub_systems: List[str]
     ):
         """Add a decomposition to the knowledge base."""
-        self._decompositions[(system, intention)] = {
+        self._set("decompositions", (system, intention), {
             "intentions": sub_intentions,
             "systems": sub_systems
-        }
+        })
 
     def add_solutions(self, system: str, solutions: List[str]):
         """Add solutions to the knowledge base."""
-        self._solutions[system] = solutions
+        self._set("solutions", system, solutions)
+
+    def _check_writable(self) -> None:
+        if self.frozen:
+            raise TypeError("The knowledge base is frozen")
+
+    def _get(self, relation: str, key: Any) -> Any:
+        """Look up one entry of a relation."""
+        return getattr(self, "_" + relation).get(key)
+
+    def _set(self, relation: str, key: Any, value: Any) -> None:
+        """Store one entry of a relation."""
+        self._check_writable()
+        entries = getattr(self, "_" + relation)
+        if self._view_counts is not None:
+            old = entries.get(key)
+            for view, name in _contributions(relation, key, value):
+                self._adjust_view(view, name, 1)
+            if old is not None:
+                for view, name in _contributions(relation, key, old):
+                    self._adjust_view(view, name, -1)
+        entries[key] = value
+        if relation in self._normalized_keys:
+            self._normalized_keys[relation].setdefault(normalize_key(key), key)
+        self.revision += 1
+
+    def _add_candidate(self, relation: str, key: Any, name: Any, weight: float) -> None:
+        """Add a candidate to a ranked relation entry.
+
+        An entry of this knowledge base's own is updated in place; one
+        read through from elsewhere (an overlay's base) is copied first.
+        """
+        candidates = getattr(self, "_" + relation).get(key)
+        if candidates is not None:
+            self._extend(relation, candidates, name, weight)
+            return
+        candidates = self._get(relation, key)
+        if candidates is None:
+            candidates = RankedCandidates.single(name, weight)
+        else:
+            candidates = candidates.with_candidate(name, weight)
+        self._set(relation, key, candidates)
+
+    def _extend(
+        self,
+        relation: str,
+        candidates: RankedCandidates,
+        name: Any,
+        weight: float
+    ) -> None:
+        """Add a candidate in place to an entry of this knowledge base."""
+        self._check_writable()
+        # A ranked relation's candidates make up the view of the same name
+        if self._view_counts is not None and candidates.weight(name) is None:
+            self._adjust_view(relation, name, 1)
+        candidates.add(name, weight)
+        self.revision += 1
+
+    def _best(self, relation: str, key: Any) -> Optional[str]:
+        """Look up the best candidate of a ranked relation entry."""
+        candidates = self._lookup(relation, key)
+        return candidates.best if candidates is not None else None
+
+    def _top(self, relation: str, key: Any, k: Optional[int]) -> List[str]:
+        """Look up the top ``k`` candidates of a ranked relation entry."""
+        candidates = self._lookup(relation, key)
+        return candidates.top(k) if candidates is not None else []
+
+    def _lookup(self, relation: str, key: Any) -> Any:
+        """Look up an entry by its exact key, else by its normalized key."""
+        value = self._get(relation, key)
+        if value is None:
+            value = self._get_normalized(relation, normalize_key(key))
+        return value
+
+    def _normalized(self, relation: str) -> Dict[Any, Any]:
+        """Get the normalized key -> key index of a relation."""
+        index = self._normalized_keys.get(relation)
+        if index is None:
+            index = self._normalized_keys[relation] = {}
+            for key in getattr(self, "_" + relation):
+                index.setdefault(normalize_key(key), key)
+        return index
+
+    def _get_normalized(self, relation: str, normalized: Any) -> Any:
+        """Look up an entry by its normalized key."""
+        key = self._normalized(relation).get(normalized)
+        return None if key is None else self._get(relation, key)
+
+    def _entries(self, relation: str) -> Dict[Any, Any]:
+        """Get every entry of a relation."""
+        return getattr(self, "_" + relation)
+
+    def _views(self) -> Dict[str, Dict[Any, int]]:
+        """Count the names in each view; built once, then kept current."""
+        if self._view_counts is None:
+            counts: Dict[str, Dict[Any, int]] = {view: {} for view in VIEWS}
+            for relation in RELATIONS:
+                for key, value in self._entries(relation).items():
+                    for view, name in _contributions(relation, key, value):
+                        counts[view][name] = counts[view].get(name, 0) + 1
+            self._view_names = {view: sorted(counts[view]) for view in VIEWS}
+            self._view_counts = counts
+        return self._view_counts
+
+    def _adjust_view(self, view: str, name: Any, delta: int) -> None:
+        """Change a name's occurrences in a view by one entry's worth."""
+        counts = self._view_counts[view]
+        before = counts.get(name, 0)
+        after = before + delta
+        if after:
+            counts[name] = after
+        else:
+            del counts[name]
+        if not before:
+            self._name_added(view, name)
+        elif not after:
+            self._name_removed(view, name)
+
+    def _name_added(self, view: str, name: Any) -> None:
+        """Keep the views current when a name enters one."""
+        insort(self._view_names[view], name)
+        index = self._trigram_indexes.get(view)
+        if index is not None:
+            index.add(name)
+
+    def _name_removed(self, view: str, name: Any) -> None:
+        """Keep the views current when a name leaves one."""
+        names = self._view_names[view]
+        del names[bisect_left(names, name)]
+        index = self._trigram_indexes.get(view)
+        if index is not None:
+            index.remove(name)
+
+    def _count(self, view: str, name: Any) -> int:
+        """Number of entries contributing a name to a view."""
+        return self._views()[view].get(name, 0)
+
+    def _names(self, view: str) -> List[Any]:
+        """Sorted names of a view; shared, callers must copy."""
+        self._views()
+        return self._view_names[view]
+
+    def _trigram_index(self, view: str) -> TrigramIndex:
+        """Get the trigram index of a view's names."""
+        index = self._trigram_indexes.get(view)
+        if index is None:
+            index = self._trigram_indexes[view] = TrigramIndex(self._names(view))
+        return index
+
+    def suggest(
+        self,
+        term: Any,
+        view: str = "systems",
+        limit: int = 5
+    ) -> List[Tuple[Any, float]]:
+        """Suggest known names similar to a possibly misspelled term.
+
+        Args:
+            term: Name as the designer wrote it
+            view: "systems", "situations", "problems" or "intentions"
+            limit: Maximum number of suggestions
+
+        Returns:
+            (name, similarity) pairs, most similar first
+
+        Raises:
+            ValueError: If the view is unknown
+        """
+        if view not in VIEWS:
+            raise ValueError(f"Unknown view: {view!r} (expected one of {VIEWS})")
+        return self._trigram_index(view).suggest(term, limit)
+
+    def overlay(self) -> "KnowledgeBaseOverlay":
+        """Create a private, writable layer over this knowledge base.
+
+        Returns:
+            Overlay whose additions are invisible to this knowledge base
+        """
+        return KnowledgeBaseOverlay(self)
+
+    def freeze(self) -> "KnowledgeBase":
+        """Make the knowledge base read-only and compact it for sharing.
+
+        Strings are interned so that each name is stored once, and the
+        indexes behind ``get_all_*``, normalized lookups and ``suggest``
+        are built up front. Freeze a
+        knowledge base before forking worker processes from it: since
+        nothing writes to it afterwards, its pages stay shared between
+        the workers (see ``app.preload``).
+
+        Returns:
+            The knowledge base itself
+        """
+        self._situations = {_intern(k): _intern(v) for k, v in self._situations.items()}
+        self._problems = {
+            (_intern(k[0]), _intern(k[1])): _intern(v) for k, v in self._problems.items()
+        }
+        self._intentions = {_intern(k): _intern(v) for k, v in self._intentions.items()}
+        self._decompositions = {
+            (_intern(k[0]), _intern(k[1])): {
+                "intentions": _intern(v["intentions"]),
+                "systems": _intern(v["systems"]),
+            }
+            for k, v in self._decompositions.items()
+        }
+        self._solutions = {_intern(k): _intern(v) for k, v in self._solutions.items()}
+        self.frozen = True
+        # Built now, over the interned names, so that forked workers
+        # share them too
+        self._view_counts = None
+        self._trigram_indexes = {}
+        self._views()
+        self._normalized_keys = {}
+        for relation in RELATIONS:
+            self._normalized(relation)
+        for view in VIEWS:
+            self._trigram_index(view)
+        return self
 
     def get_all_systems(self) -> List[str]:
         """Get all known systems."""
-        systems = set()
-        systems.update(self._situations.keys())
-        for decomp in self._decompositions.values():
-            systems.update(decomp["systems"])
-        systems.update(self._solutions.keys())
-        return sorted(list(systems))
+        return list(self._names("systems"))
 
     def get_all_situations(self) -> List[str]:
         """Get all known situations."""
-        return sorted(list(set(self._situations.values())))
+        return list(self._names("situations"))
 
     def get_all_problems(self) -> List[str]:
         """Get all known problems."""
-        return sorted(list(set(self._problems.values())))
+        return list(self._names("problems"))
 
     def get_all_intentions(self) -> List[str]:
         """Get all known intentions."""
-        intentions = set(self._intentions.values())
-        for decomp in self._decompositions.values():
-            intentions.update(decomp["intentions"])
-        return sorted(list(intentions))
+        return list(self._names("intentions"))
+
+    def get_names(self, view: str, limit: Optional[int] = None) -> List[str]:
+        """Get the first known names of a view, in sorted order.
+
+        Args:
+            view: "systems", "situations", "problems" or "intentions"
+            limit: Maximum number of names (all if None)
+
+        Returns:
+            Sorted names
+
+        Raises:
+            ValueError: If the view is unknown
+        """
+        if view not in VIEWS:
+            raise ValueError(f"Unknown view: {view!r} (expected one of {VIEWS})")
+        names = self._names(view)
+        return list(names if limit is None else names[:limit])
+
+    def has_name(self, view: str, name: Any) -> bool:
+        """Check whether a name is known in a view."""
+        return self._count(view, name) > 0
 
     def to_dict(self) -> Dict[str, Any]:
-        """Export knowledge base as dictionary."""
+        """Export knowledge base as dictionary.
+
+        A ranked entry with a single default-weight candidate is exported
+        as that name; otherwise as a ``{name: weight}`` mapping, oldest
+        candidate first.
+        """
         return {
-            "situations": self._situations,
-            "problems": {f"{k[0]},{k[1]}": v for k, v in self._problems.items()},
-            "intentions": self._intentions,
+            "situations": {
+                k: _export_candidates(v) for k, v in self._entries("situations").items()
+            },
+            "problems": {
+                f"{k[0]},{k[1]}": _export_candidates(v)
+                for k, v in self._entries("problems").items()
+            },
+            "intentions": {
+                k: _export_candidates(v) for k, v in self._entries("intentions").items()
+            },
             "decompositions": {
-                f"{k[0]},{k[1]}": v for k, v in self._decompositions.items()
+                f"{k[0]},{k[1]}": v for k, v in self._entries("decompositions").items()
             },
-            "solutions": self._solutions,
+            "solutions": self._entries("solutions"),
         }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "KnowledgeBase":
+        """Create a knowledge base from its ``to_dict`` representation.
+
+        Args:
+            data: Dictionary as produced by ``to_dict``
+
+        Returns:
+            Knowledge base holding exactly the given knowledge
+        """
+        kb = cls(load_defaults=False)
+
+        for system, situations in data.get("situations", {}).items():
+            kb._set("situations", system, _import_candidates(situations))
+        for key, problems in data.get("problems", {}).items():
+            system, situation = key.split(",", 1)
+            kb._set("problems", (system, situation), _import_candidates(problems))
+        for problem, intentions in data.get("intentions", {}).items():
+            kb._set("intentions", problem, _import_candidates(intentions))
+        for key, decomp in data.get("decompositions", {}).items():
+            system, intention = key.split(",", 1)
+            kb.add_decomposition(
+                system, intention, decomp["intentions"], decomp["systems"]
+            )
+        for system, solutions in data.get("solutions", {}).items():
+            kb.add_solutions(system, solutions)
+
+        return kb
+
+    @classmethod
+    def load(cls, path: str) -> "KnowledgeBase":
+        """Load a knowledge base from a JSON file.
+
+        Args:
+            path: Path to a JSON file in the ``to_dict`` format
+
+        Returns:
+            Loaded knowledge base
+        """
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def save(self, path: str) -> None:
+        """Save the knowledge base as a JSON file.
+
+        Args:
+            path: Destination path
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+class KnowledgeBaseOverlay(KnowledgeBase):
+    """Copy-on-write layer over a shared knowledge base.
+
+    Additions go into the overlay's own relation dicts; lookups check
+    them first and fall through to the base, so each query stays one or
+    two dict lookups and the base is never copied. The ``get_all_*``
+    views keep per-view occurrence deltas that each ``add_*`` updates in
+    time proportional to the entry. The merged sorted names are built
+    from the base's on first use and then updated name by name.
+
+    The base is meant to be shared and left alone (e.g. frozen). If it
+    does change, the overlay recounts its own entries against it on the
+    next query.
+    """
+
+    def __init__(self, base: KnowledgeBase):
+        """Create an empty overlay.
+
+        Args:
+            base: Knowledge base to layer over
+        """
+        self.base = base
+        self._situations = {}
+        self._problems = {}
+        self._intentions = {}
+        self._solutions = {}
+        self._decompositions = {}
+        self.uid = next(_kb_ids)
+        self._own_revision = 0
+        self.frozen = False
+        # view -> name -> change in occurrences relative to the base
+        self._deltas: Dict[str, Dict[Any, int]] = {view: {} for view in VIEWS}
+        self._deltas_base_revision = base.revision
+        # view -> merged sorted names, built on first use
+        self._merged: Dict[str, List[Any]] = {}
+        self._view_counts = None
+        self._view_names = {}
+        self._normalized_keys = {}
+        # view -> trigram index of the names the overlay adds, and view ->
+        # base names it removes; built on first use
+        self._trigram_indexes = {}
+        self._removed: Dict[str, Set[Any]] = {}
+
+    @property
+    def revision(self) -> int:
+        """Changes with every addition to the overlay or its base."""
+        return self._own_revision + self.base.revision
+
+    def _get(self, relation: str, key: Any) -> Any:
+        value = getattr(self, "_" + relation).get(key)
+        return value if value is not None else self.base._get(relation, key)
+
+    def _set(self, relation: str, key: Any, value: Any) -> None:
+        self._check_writable()
+        self._sync_deltas()
+        self._count_entry(relation, key, self._get(relation, key), value)
+        getattr(self, "_" + relation)[key] = value
+        if relation in self._normalized_keys:
+            self._normalized_keys[relation].setdefault(normalize_key(key), key)
+        self._own_revision += 1
+
+    def _extend(
+        self,
+        relation: str,
+        candidates: RankedCandidates,
+        name: Any,
+        weight: float
+    ) -> None:
+        self._check_writable()
+        self._sync_deltas()
+        if candidates.weight(name) is None:
+            self._adjust_view(relation, name, 1)
+        candidates.add(name, weight)
+        self._own_revision += 1
+
+    def _get_normalized(self, relation: str, normalized: Any) -> Any:
+        key = self._normalized(relation).get(normalized)
+        if key is not None:
+            return getattr(self, "_" + relation)[key]
+        return self.base._get_normalized(relation, normalized)
+
+    def _entries(self, relation: str) -> Dict[Any, Any]:
+        return {**self.base._entries(relation), **getattr(self, "_" + relation)}
+
+    def _count_entry(self, relation: str, key: Any, old: Any, new: Any) -> None:
+        """Account for an entry replacing ``old`` (None if absent) with ``new``."""
+        for view, name in _contributions(relation, key, new):
+            self._adjust_view(view, name, 1)
+        if old is not None:
+            for view, name in _contributions(relation, key, old):
+                self._adjust_view(view, name, -1)
+
+    def _adjust_view(self, view: str, name: Any, delta: int) -> None:
+        deltas = self._deltas[view]
+        before = deltas.get(name, 0)
+        after = before + delta
+        if after:
+            deltas[name] = after
+        else:
+            del deltas[name]
+
+        base_count = self.base._count(view, name)
+        if not base_count + before and base_count + after:
+            self._name_added(view, name)
+        elif base_count + before and not base_count + after:
+            self._name_removed(view, name)
+
+    def _name_added(self, view: str, name: Any) -> None:
+        names = self._merged.get(view)
+        if names is not None:
+            insort(names, name)
+        if view in self._removed:
+            if self.base._count(view, name):
+                self._removed[view].discard(name)
+            else:
+                self._trigram_indexes[view].add(name)
+
+    def _name_removed(self, view: str, name: Any) -> None:
+        names = self._merged.get(view)
+        if names is not None:
+            del names[bisect_left(names, name)]
+        if view in self._removed:
+            if self.base._count(view, name):
+                self._removed[view].add(name)
+            else:
+                self._trigram_indexes[view].remove(name)
+
+    def _sync_deltas(self) -> None:
+        """Recount the overlay's entries if the base changed underneath."""
+        if self._deltas_base_revision == self.base.revision:
+            return
+        self._deltas = {view: {} for view in VIEWS}
+        self._merged = {}
+        self._trigram_indexes = {}
+        self._removed = {}
+        for relation in RELATIONS:
+            for key, value in getattr(self, "_" + relation).items():
+                self._count_entry(relation, key, self.base._get(relation, key), value)
+        self._deltas_base_revision = self.base.revision
+
+    def _count(self, view: str, name: Any) -> int:
+        self._sync_deltas()
+        return self.base._count(view, name) + self._deltas[view].get(name, 0)
+
+    def _changes(self, view: str) -> Tuple[List[Any], Set[Any]]:
+        """Get the names the overlay adds to and removes from a base view."""
+        self._sync_deltas()
+        added = []
+        removed = set()
+        for name, delta in self._deltas[view].items():
+            base_count = self.base._count(view, name)
+            if base_count == 0 and delta > 0:
+                added.append(name)
+            elif base_count > 0 and base_count + delta == 0:
+                removed.add(name)
+        return added, removed
+
+    def _names(self, view: str) -> List[Any]:
+        self._sync_deltas()
+        names = self._merged.get(view)
+        if names is None:
+            added, removed = self._changes(view)
+            names = [name for name in self.base._names(view) if name not in removed]
+            if added:
+                names = list(heapq.merge(names, sorted(added)))
+            self._merged[view] = names
+        return names
+
+    def suggest(
+        self,
+        term: Any,
+        view: str = "systems",
+        limit: int = 5
+    ) -> List[Tuple[Any, float]]:
+        if view not in VIEWS:
+            raise ValueError(f"Unknown view: {view!r} (expected one of {VIEWS})")
+        self._sync_deltas()
+        removed = self._removed.get(view)
+        if removed is None:
+            added, removed = self._changes(view)
+            self._trigram_indexes[view] = TrigramIndex(added)
+            self._removed[view] = removed
+
+        suggestions = [
+            (name, similarity)
+            for name, similarity in self.base.suggest(term, view, limit + len(removed))
+            if name not in removed
+        ] + self._trigram_indexes[view].suggest(term, limit)
+        suggestions.sort(key=lambda item: -item[1])
+        return suggestions[:limit]
+
+    def __repr__(self) -> str:
+        entries = sum(len(getattr(self, "_" + relation)) for relation in RELATIONS)
+        return f"KnowledgeBaseOverlay(entries={entries}, base={self.base!r})"
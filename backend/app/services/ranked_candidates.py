@@ -0,0 +1,145 @@
+"""Weighted, ranked candidate values for one knowledge base key.
+
+A system can be in several situations, a situation can pose several
+problems and a problem can be met with several intentions. Each such
+key maps to a ``RankedCandidates``: its candidates with their weights,
+ranked by weight and, among equal weights, most recently added first.
+The ranking is computed when the candidates are written, so reading the
+best candidate or the top ``k`` is a slice, however many candidates a
+key has.
+
+A value is changed in place by ``add``, which only the knowledge base
+owning it calls. ``with_candidate`` returns a changed copy instead, which
+lets overlays replace a base entry without touching it.
+"""
+
+from bisect import bisect_left
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+# Weight of candidates added without one
+DEFAULT_WEIGHT = 1.0
+
+
+class RankedCandidates:
+    """Candidates of one key, ranked by weight and then recency."""
+
+    __slots__ = ("_names", "_weights", "_ages", "_keys", "_next_age")
+
+    def __init__(self, pairs: Iterable[Tuple[Any, float]] = ()):
+        """Rank candidates.
+
+        Args:
+            pairs: (name, weight) pairs, oldest first; a repeated name
+                takes its latest weight and counts as added last
+        """
+        latest = {}
+        for name, weight in pairs:
+            latest.pop(name, None)
+            latest[name] = float(weight)
+        # Sort keys (-weight, -age) in rank order, and names alongside
+        ranked = sorted(
+            ((-weight, -age), name) for age, (name, weight) in enumerate(latest.items())
+        )
+        self._keys: List[Tuple[float, int]] = [key for key, _ in ranked]
+        self._names: List[Any] = [name for _, name in ranked]
+        self._weights = latest
+        self._ages = {name: age for age, name in enumerate(latest)}
+        self._next_age = len(latest)
+
+    @classmethod
+    def single(cls, name: Any, weight: float = DEFAULT_WEIGHT) -> "RankedCandidates":
+        """Create candidates holding one name."""
+        candidates = cls.__new__(cls)
+        candidates._keys = [(-float(weight), 0)]
+        candidates._names = [name]
+        candidates._weights = {name: float(weight)}
+        candidates._ages = {name: 0}
+        candidates._next_age = 1
+        return candidates
+
+    def add(self, name: Any, weight: float = DEFAULT_WEIGHT) -> None:
+        """Add a candidate, or re-weight a name, in place.
+
+        The name counts as the most recently added. Runs in logarithmic
+        time plus one shift of the ranked lists.
+
+        Args:
+            name: Candidate name
+            weight: Its weight
+        """
+        keys = self._keys
+        names = self._names
+        if name in self._weights:
+            i = bisect_left(keys, (-self._weights[name], -self._ages.pop(name)))
+            del keys[i]
+            del names[i]
+            del self._weights[name]
+
+        age = self._next_age
+        self._next_age += 1
+        key = (-float(weight), -age)
+        i = bisect_left(keys, key)
+        keys.insert(i, key)
+        names.insert(i, name)
+        self._weights[name] = float(weight)
+        self._ages[name] = age
+
+    def copy(self) -> "RankedCandidates":
+        """Get an independent copy of these candidates."""
+        candidates = RankedCandidates.__new__(RankedCandidates)
+        candidates._keys = list(self._keys)
+        candidates._names = list(self._names)
+        candidates._weights = dict(self._weights)
+        candidates._ages = dict(self._ages)
+        candidates._next_age = self._next_age
+        return candidates
+
+    def with_candidate(self, name: Any, weight: float = DEFAULT_WEIGHT) -> "RankedCandidates":
+        """Get these candidates plus one more, or with a name re-weighted.
+
+        Copies the candidates, so runs in time linear in their number;
+        use ``add`` to change a value in place.
+
+        Args:
+            name: Candidate name
+            weight: Its weight
+
+        Returns:
+            New candidates; this value is unchanged
+        """
+        candidates = self.copy()
+        candidates.add(name, weight)
+        return candidates
+
+    @property
+    def best(self) -> Optional[Any]:
+        """The highest ranked candidate."""
+        return self._names[0] if self._names else None
+
+    def top(self, k: Optional[int] = None) -> List[Any]:
+        """Get the ``k`` highest ranked candidates (all if None)."""
+        return list(self._names if k is None else self._names[:k])
+
+    def weight(self, name: Any) -> Optional[float]:
+        """Get a candidate's weight, or None if it is not a candidate."""
+        return self._weights.get(name)
+
+    def by_age(self) -> List[Tuple[Any, float]]:
+        """Get (name, weight) pairs oldest first, as accepted by the constructor."""
+        return sorted(self._weights.items(), key=lambda item: self._ages[item[0]])
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, RankedCandidates):
+            return NotImplemented
+        return self.by_age() == other.by_age()
+
+    def __repr__(self) -> str:
+        shown = ", ".join(f"{name!r}: {self._weights[name]:g}" for name in self._names[:5])
+        more = f", ... ({len(self._names)} total)" if len(self._names) > 5 else ""
+        return f"RankedCandidates({{{shown}{more}}})"
@@ -0,0 +1,339 @@
+"""Incremental side-effect propagation over LD graphs.
+
+Every LD node carries a "realized" value. Roots are realized facts
+(all roots by default). Any other node is evaluated from its inputs
+according to the logic of its incoming edges: AND needs every input,
+OR any input, XOR exactly one; mixed logic is treated as OR, as in SI
+component extraction.
+
+When the graph changes, only the changed nodes are marked dirty. Dirty
+nodes are re-evaluated in topological rank order, and their successors
+are marked only if the value actually changed (early cutoff). The cost
+of a side-effect check is therefore proportional to the affected
+region, not to the whole design.
+"""
+
+import heapq
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..models.graphs import DEGraph, LDGraph
+from ..instrumentation import count, timed
+
+# Bound on re-evaluations of a node within one propagation, so that
+# oscillating cycles (e.g. through XOR) terminate
+MAX_EVALUATIONS_PER_NODE = 4
+
+
+class SideEffectReport:
+    """Nodes affected by one change to the LD graph."""
+
+    def __init__(
+        self,
+        changed: Dict[str, bool],
+        evaluated: List[str],
+        sources: List[str],
+        ld_graph: LDGraph
+    ):
+        self.changed = changed
+        self.evaluated = evaluated
+        self.sources = sources
+        self._ld_graph = ld_graph
+
+    @property
+    def side_effects(self) -> Dict[str, bool]:
+        """Changed nodes other than the ones the change touched directly."""
+        sources = set(self.sources)
+        return {
+            node_id: value for node_id, value in self.changed.items()
+            if node_id not in sources
+        }
+
+    @property
+    def has_side_effects(self) -> bool:
+        """Whether the change affected any node it did not touch."""
+        return bool(self.side_effects)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert report to dictionary representation."""
+        get_data = self._ld_graph.get_node_data
+        return {
+            "sources": self.sources,
+            "changed": [
+                {"id": node_id, "data": get_data(node_id), "realized": value}
+                for node_id, value in self.changed.items()
+            ],
+            "side_effects": list(self.side_effects),
+            "evaluated": len(self.evaluated),
+        }
+
+
+class SideEffectPropagator:
+    """Tracks realized values of LD nodes and propagates changes.
+
+    Mutate the LD graph through this class (``add_node``, ``add_edge``,
+    ``apply_fragment``, ``set_fact``) so that values and ranks stay
+    current without re-evaluating the whole graph.
+    """
+
+    def __init__(
+        self,
+        ld_graph: LDGraph,
+        facts: Optional[Dict[str, bool]] = None,
+        default_fact: bool = True
+    ):
+        """Initialize the propagator and evaluate the graph once.
+
+        Args:
+            ld_graph: The LD graph to track
+            facts: Explicit realized values of root nodes
+            default_fact: Value of roots without an explicit fact
+        """
+        self.ld_graph = ld_graph
+        self.facts: Dict[str, bool] = dict(facts or {})
+        self.default_fact = default_fact
+        self._value: Dict[str, bool] = {}
+        self._rank: Dict[str, int] = {}
+        self.rebuild()
+
+    def value(self, node_id: str) -> Optional[bool]:
+        """Get the realized value of a node."""
+        return self._value.get(node_id)
+
+    def rebuild(self) -> None:
+        """Rank and evaluate the whole graph from scratch."""
+        self._rank_all()
+        self._value = {}
+        self._propagate(list(self.ld_graph.graph.nodes()), record=False)
+
+    def _rank_all(self) -> None:
+        """Rank every node topologically."""
+        graph = self.ld_graph.graph
+        in_degree = {node_id: 0 for node_id in graph.nodes()}
+        for _, target in graph.edges():
+            in_degree[target] += 1
+
+        # Kahn's algorithm; nodes on cycles are ranked after the rest
+        ready = [node_id for node_id, d in in_degree.items() if d == 0]
+        self._rank = {}
+        rank = 0
+        while ready:
+            next_ready = []
+            for node_id in ready:
+                self._rank[node_id] = rank
+                for successor in graph.successors(node_id):
+                    in_degree[successor] -= 1
+                    if in_degree[successor] == 0:
+                        next_ready.append(successor)
+            ready = next_ready
+            rank += 1
+        for node_id in in_degree:
+            self._rank.setdefault(node_id, rank)
+
+    def _evaluate(self, node_id: str) -> bool:
+        """Evaluate a node from its inputs."""
+        graph = self.ld_graph.graph
+        predecessors = [
+            source for source in graph.predecessors(node_id)
+            if source != node_id
+        ]
+        if not predecessors:
+            return self.facts.get(node_id, self.default_fact)
+
+        logics = set()
+        realized = 0
+        for source in predecessors:
+            logic = graph[source][node_id].get('logic')
+            if logic is not None:
+                logics.add(getattr(logic, "value", logic))
+            if self._value.get(source, False):
+                realized += 1
+
+        if not logics or logics == {"AND"}:
+            return realized == len(predecessors)
+        if logics == {"XOR"}:
+            return realized == 1
+        # OR, or mixed logic
+        return realized > 0
+
+    def _raise_rank(self, source: str, target: str) -> None:
+        """Keep ranks topological after adding the edge source -> target.
+
+        Ranks are raised depth first along the nodes downstream of the
+        edge. If the raise runs into a cycle, whether through the new
+        edge or an existing one, the whole graph is re-ranked instead.
+        """
+        if source == target:
+            # Self-loops do not take part in evaluation
+            return
+        graph = self.ld_graph.graph
+        # (node, rank, leaving); the nodes on the current path are the
+        # ones whose leaving entry is still on the stack
+        stack = [(target, self._rank.get(source, 0) + 1, False)]
+        on_path: Set[str] = {source}
+        while stack:
+            node_id, rank, leaving = stack.pop()
+            if leaving:
+                on_path.discard(node_id)
+                continue
+            if self._rank.get(node_id, -1) >= rank:
+                # Already ranked after its new predecessor
+                continue
+            if node_id in on_path:
+                self._rank_all()
+                return
+            self._rank[node_id] = rank
+            on_path.add(node_id)
+            stack.append((node_id, rank, True))
+            for successor in graph.successors(node_id):
+                stack.append((successor, rank + 1, False))
+
+    def _propagate(
+        self,
+        dirty: Iterable[str],
+        record: bool = True
+    ) -> Tuple[Dict[str, bool], List[str]]:
+        """Re-evaluate dirty nodes in rank order with early cutoff."""
+        graph = self.ld_graph.graph
+        heap = []
+        queued: Set[str] = set()
+        for node_id in dirty:
+            if node_id not in queued:
+                queued.add(node_id)
+                heapq.heappush(heap, (self._rank.get(node_id, 0), node_id))
+
+        changed: Dict[str, bool] = {}
+        evaluated: List[str] = []
+        evaluations: Dict[str, int] = {}
+
+        while heap:
+            _, node_id = heapq.heappop(heap)
+            queued.discard(node_id)
+            if evaluations.get(node_id, 0) >= MAX_EVALUATIONS_PER_NODE:
+                continue
+            evaluations[node_id] = evaluations.get(node_id, 0) + 1
+
+            new_value = self._evaluate(node_id)
+            evaluated.append(node_id)
+            old_value = self._value.get(node_id)
+            self._value[node_id] = new_value
+            if old_value == new_value:
+                # Early cutoff: downstream nodes are unaffected
+                continue
+
+            if record:
+                changed[node_id] = new_value
+            for successor in graph.successors(node_id):
+                if successor not in queued:
+                    queued.add(successor)
+                    heapq.heappush(heap, (self._rank.get(successor, 0), successor))
+
+        return changed, evaluated
+
+    def _report(self, sources: List[str]) -> SideEffectReport:
+        """Propagate from changed nodes and build the report."""
+        changed, evaluated = self._propagate(sources)
+        count("side_effect_nodes_evaluated", len(evaluated))
+        return SideEffectReport(changed, evaluated, sources, self.ld_graph)
+
+    @timed("side_effect_propagation")
+    def apply_fragment(
+        self,
+        nodes: Iterable[Tuple[str, Any]],
+        edges: Iterable[Tuple[str, str, Any]]
+    ) -> SideEffectReport:
+        """Add LD nodes and edges as one change and propagate.
+
+        Args:
+            nodes: (node ID, node data) pairs
+            edges: (source, target, logic) triples
+
+        Returns:
+            Report of the nodes affected by the change
+        """
+        graph = self.ld_graph.graph
+        sources: List[str] = []
+
+        for node_id, data in nodes:
+            if node_id not in graph.nodes:
+                self.ld_graph.add_node(node_id, data=data)
+                self._rank[node_id] = 0
+                sources.append(node_id)
+
+        for source, target, logic in edges:
+            if graph.has_edge(source, target):
+                continue
+            self.ld_graph.add_edge(source, target, logic=logic)
+            for node_id in (source, target):
+                if node_id not in self._rank:
+                    # Endpoint created by the edge
+                    self._rank[node_id] = 0
+                    sources.append(node_id)
+            self._raise_rank(source, target)
+            sources.append(target)
+
+        return self._report(list(dict.fromkeys(sources)))
+
+    def add_node(self, node_id: str, data: Any = None) -> SideEffectReport:
+        """Add a node and propagate."""
+        return self.apply_fragment([(node_id, data)], [])
+
+    def add_edge(self, source: str, target: str, logic: Any = None) -> SideEffectReport:
+        """Add an edge and propagate."""
+        return self.apply_fragment([], [(source, target, logic)])
+
+    def set_fact(self, node_id: str, realized: bool) -> SideEffectReport:
+        """Set whether a root node is realized and propagate."""
+        self.facts[node_id] = realized
+        return self._report([node_id])
+
+
+class DesignSideEffects:
+    """Side effects of the components added to a growing DE graph.
+
+    Keeps an LD view of the DE graph, built on first use from the
+    components already in it. Before each assessment, the view is
+    brought up to date with the components added since the last one, so
+    callers only need to assess the components whose effects they want
+    reported. DE graphs only ever gain components, in insertion order.
+    """
+
+    def __init__(self, de_graph: DEGraph, converter: Any):
+        """Initialize the tracker.
+
+        Args:
+            de_graph: The DE graph to track
+            converter: Graph conversion engine providing LD fragments
+        """
+        self.de_graph = de_graph
+        self.converter = converter
+        self._propagator: Optional[SideEffectPropagator] = None
+        # Number of DE components already in the LD view
+        self._synced = 0
+
+    def assess(self, component: Any) -> SideEffectReport:
+        """Add a component's LD fragment to the view and propagate.
+
+        Args:
+            component: DE component, whether or not already in the graph
+
+        Returns:
+            Report of the LD nodes the component affected
+        """
+        components = self.de_graph.components
+        if self._propagator is None:
+            before = DEGraph()
+            for existing in components.values():
+                if existing.id != component.id:
+                    before.add_component(existing)
+            self._propagator = SideEffectPropagator(
+                self.converter.convert_de_to_ld(before)
+            )
+        else:
+            for existing in islice(components.values(), self._synced, None):
+                if existing.id != component.id:
+                    self._propagator.apply_fragment(*self.converter.ld_fragment(existing))
+        self._synced = len(components)
+
+        nodes, edges = self.converter.ld_fragment(component)
+        return self._propagator.apply_fragment(nodes, edges)
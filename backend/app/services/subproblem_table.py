@@ -0,0 +1,197 @@
+"""Memo table for repeated (system, intention) subproblems.
+
+The same ``(system, intention)`` pair returned by
+``KnowledgeBase.query_decomposition`` typically appears under many
+parents. A ``SubproblemTable`` remembers, per pair, the decomposition
+that was expanded, the LD fragment it converts to, and the DI component
+where it is already expanded in each live DE graph. Exploration grafts a
+repeated subproblem onto that DI instead of expanding it again, and
+conversion reuses the fragment, so work is proportional to the number
+of distinct subproblems rather than to their occurrences.
+"""
+
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .. import instrumentation
+from ..instrumentation import count
+
+SubproblemKey = Tuple[str, str]
+
+# (node ID, node data) pairs and (source, target, logic) triples
+LDFragment = Tuple[
+    List[Tuple[str, Any]],
+    List[Tuple[str, str, Any]]
+]
+
+
+class Subproblem:
+    """Memoized expansion of one (system, intention) pair."""
+
+    __slots__ = (
+        "system", "intention", "sub_intentions", "sub_systems",
+        "ld_fragment", "roots"
+    )
+
+    def __init__(
+        self,
+        system: str,
+        intention: str,
+        sub_intentions: List[Any],
+        sub_systems: List[Any]
+    ):
+        self.system = system
+        self.intention = intention
+        self.sub_intentions = list(sub_intentions)
+        self.sub_systems = list(sub_systems)
+        self.ld_fragment: Optional[LDFragment] = None
+        # DE graph -> ID of the DI component expanding this subproblem
+        self.roots: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+
+    def matches(self, sub_intentions: List[Any], sub_systems: List[Any]) -> bool:
+        """Check whether a decomposition is the memoized one."""
+        return (
+            list(sub_intentions) == self.sub_intentions and
+            list(sub_systems) == self.sub_systems
+        )
+
+
+class SubproblemTable:
+    """Bounded LRU table of subproblems keyed by (system, intention).
+
+    The table can be shared by several exploration sessions and
+    conversion engines; the least recently used entries are evicted
+    once ``max_entries`` is exceeded.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        """Initialize the table.
+
+        Args:
+            max_entries: Maximum number of subproblems kept
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[SubproblemKey, Subproblem]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(system: Any, intention: Any) -> SubproblemKey:
+        """Build the table key for a system and intention."""
+        return (str(system), str(intention))
+
+    def get(self, system: Any, intention: Any) -> Optional[Subproblem]:
+        """Look up a subproblem, marking it as recently used.
+
+        Args:
+            system: The decomposed system
+            intention: The decomposed intention
+
+        Returns:
+            The memoized subproblem or None
+        """
+        key = self.key(system, intention)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            if instrumentation.active():
+                count("subproblem_lookups", labels=(("result", "miss"),))
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        if instrumentation.active():
+            count("subproblem_lookups", labels=(("result", "hit"),))
+        return entry
+
+    def put(
+        self,
+        system: Any,
+        intention: Any,
+        sub_intentions: List[Any],
+        sub_systems: List[Any]
+    ) -> Subproblem:
+        """Get or create the subproblem for a decomposition.
+
+        An existing entry whose decomposition differs is replaced.
+
+        Args:
+            system: The decomposed system
+            intention: The decomposed intention
+            sub_intentions: Sub-intentions of the decomposition
+            sub_systems: Sub-systems of the decomposition
+
+        Returns:
+            The memoized subproblem
+        """
+        key = self.key(system, intention)
+        entry = self._entries.get(key)
+        if entry is not None and entry.matches(sub_intentions, sub_systems):
+            self._entries.move_to_end(key)
+            return entry
+
+        entry = Subproblem(key[0], key[1], sub_intentions, sub_systems)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def expanded_root(self, system: Any, intention: Any, graph: Any) -> Optional[str]:
+        """Get the DI component already expanding a subproblem in a graph.
+
+        Args:
+            system: The decomposed system
+            intention: The decomposed intention
+            graph: The DE graph being explored
+
+        Returns:
+            DI component ID, or None if not yet expanded in that graph
+        """
+        entry = self.get(system, intention)
+        if entry is None:
+            return None
+        return entry.roots.get(graph)
+
+    def record_expansion(self, di_component: Any, graph: Any) -> Subproblem:
+        """Record a DI component as the expansion of its subproblem.
+
+        Args:
+            di_component: The DI component that was recorded
+            graph: The DE graph it was recorded in
+
+        Returns:
+            The memoized subproblem
+        """
+        entry = self.put(
+            di_component.system,
+            di_component.intention,
+            di_component.sub_intentions,
+            di_component.sub_systems
+        )
+        entry.roots.setdefault(graph, di_component.id)
+        return entry
+
+    def clear(self) -> None:
+        """Remove all subproblems."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction statistics."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __contains__(self, key: SubproblemKey) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
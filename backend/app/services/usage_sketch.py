@@ -0,0 +1,196 @@
+"""Bounded-memory statistics of what designers choose.
+
+Every choice made during interactive exploration (a situation for a
+system, a problem for a system in a situation, ...) is counted in a
+``CountMinSketch`` keyed by ``(step, context, choice)``. The sketch is a
+fixed ``depth`` x ``width`` table of counters, so its size does not grow
+with the number of sessions or distinct choices; estimates may
+overcount through hash collisions but never undercount.
+
+Alongside, ``UsageSketch`` keeps the ``top_k`` most chosen names of each
+context (heavy hitters by sketch estimate) for at most ``max_contexts``
+recently used contexts. Those tables are what suggestion lists are
+re-ranked by.
+"""
+
+import random
+import zlib
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+# Mersenne prime for the row hash functions
+_PRIME = (1 << 61) - 1
+
+
+def _key_bytes(key: Any) -> bytes:
+    """Encode a key (a string or a tuple of strings) for hashing."""
+    if isinstance(key, tuple):
+        return "\x1f".join(_key_bytes(part).decode("utf-8") for part in key).encode("utf-8")
+    return str(key).encode("utf-8")
+
+
+class CountMinSketch:
+    """Approximate counts of a stream of keys in fixed memory.
+
+    With total count ``N``, an estimate exceeds the true count by more
+    than ``e * N / width`` with probability at most ``exp(-depth)``.
+    Increments are conservative (only the counters at the current
+    minimum grow), which keeps overcounting well below that bound.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4, seed: int = 0):
+        """Initialize an empty sketch.
+
+        Args:
+            width: Counters per row
+            depth: Rows, each with its own hash function
+            seed: Seed of the hash functions
+        """
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be positive")
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._counters = array("Q", bytes(8 * width * depth))
+        rng = random.Random(seed)
+        self._hashes = [
+            (rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(depth)
+        ]
+
+    def _cells(self, key: Any) -> List[int]:
+        """Get the counter index of a key in each row."""
+        h = zlib.crc32(_key_bytes(key))
+        width = self.width
+        return [
+            row * width + ((a * h + b) % _PRIME) % width
+            for row, (a, b) in enumerate(self._hashes)
+        ]
+
+    def add(self, key: Any, amount: int = 1) -> int:
+        """Count a key.
+
+        Args:
+            key: Key to count
+            amount: Occurrences to add
+
+        Returns:
+            The key's new estimated count
+        """
+        counters = self._counters
+        cells = self._cells(key)
+        estimate = min(counters[cell] for cell in cells) + amount
+        for cell in cells:
+            if counters[cell] < estimate:
+                counters[cell] = estimate
+        self.total += amount
+        return estimate
+
+    def estimate(self, key: Any) -> int:
+        """Get a key's estimated count."""
+        counters = self._counters
+        return min(counters[cell] for cell in self._cells(key))
+
+    def __repr__(self) -> str:
+        return f"CountMinSketch(width={self.width}, depth={self.depth}, total={self.total})"
+
+
+class UsageSketch:
+    """Counts of designers' choices per context, in bounded memory.
+
+    A context is whatever a choice was made for: the system for a
+    situation, (system, situation) for a problem, the problem for an
+    intention. One instance can be shared by every exploration session
+    of a process, so suggestions improve with traffic.
+    """
+
+    def __init__(
+        self,
+        width: int = 2048,
+        depth: int = 4,
+        top_k: int = 16,
+        max_contexts: int = 4096,
+        seed: int = 0
+    ):
+        """Initialize empty usage statistics.
+
+        Args:
+            width: Counters per row of the count-min sketch
+            depth: Rows of the count-min sketch
+            top_k: Most chosen names kept per context
+            max_contexts: Contexts whose most chosen names are kept; the
+                least recently updated are evicted
+            seed: Seed of the sketch's hash functions
+        """
+        self.sketch = CountMinSketch(width, depth, seed)
+        self.top_k = top_k
+        self.max_contexts = max_contexts
+        # (step, context) -> name -> estimated count
+        self._heavy: "OrderedDict[Tuple[str, Any], Dict[Any, int]]" = OrderedDict()
+        self.evictions = 0
+
+    def record(self, step: str, context: Any, choice: Any) -> None:
+        """Count one choice.
+
+        Args:
+            step: Exploration step, e.g. "situation"
+            context: What the choice was made for
+            choice: The chosen name
+        """
+        key = (step, context)
+        estimate = self.sketch.add((step, context, choice))
+
+        heavy = self._heavy.get(key)
+        if heavy is None:
+            heavy = self._heavy[key] = {}
+            while len(self._heavy) > self.max_contexts:
+                self._heavy.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._heavy.move_to_end(key)
+
+        if choice in heavy or len(heavy) < self.top_k:
+            heavy[choice] = estimate
+            return
+        weakest = min(heavy, key=heavy.__getitem__)
+        if estimate > heavy[weakest]:
+            del heavy[weakest]
+            heavy[choice] = estimate
+
+    def estimate(self, step: str, context: Any, choice: Any) -> int:
+        """Get the estimated number of times a choice was made."""
+        return self.sketch.estimate((step, context, choice))
+
+    def top(self, step: str, context: Any) -> List[Tuple[Any, int]]:
+        """Get the most chosen names of a context.
+
+        Returns:
+            (name, estimated count) pairs, most chosen first
+        """
+        heavy = self._heavy.get((step, context), {})
+        return sorted(heavy.items(), key=lambda item: (-item[1], str(item[0])))
+
+    def rank(self, step: str, context: Any, names: List[Any]) -> List[Any]:
+        """Re-rank names so that the context's most chosen come first.
+
+        Args:
+            step: Exploration step
+            context: What the names are offered for
+            names: Names in their default order
+
+        Returns:
+            The most chosen of the names, most chosen first, followed by
+            the others in their given order
+        """
+        heavy = self._heavy.get((step, context))
+        if not heavy:
+            return names
+        offered = set(names)
+        first = [name for name, _ in self.top(step, context) if name in offered]
+        return first + [name for name in names if name not in heavy]
+
+    def __repr__(self) -> str:
+        return (
+            f"UsageSketch(choices={self.sketch.total}, contexts={len(self._heavy)}, "
+            f"top_k={self.top_k})"
+        )
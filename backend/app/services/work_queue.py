@@ -0,0 +1,162 @@
+"""Hierarchical work queue for subsystems awaiting exploration."""
+
+from bisect import insort
+from itertools import count as sequence
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+DEPTH_FIRST = "dfs"
+BREADTH_FIRST = "bfs"
+PRIORITY = "priority"
+
+QUEUE_ORDERS = (DEPTH_FIRST, BREADTH_FIRST, PRIORITY)
+
+
+class WorkItem:
+    """A subsystem waiting to be explored."""
+
+    __slots__ = ("system", "parent_id", "depth", "priority")
+
+    def __init__(
+        self,
+        system: str,
+        parent_id: Optional[str] = None,
+        depth: int = 0,
+        priority: float = 0.0
+    ):
+        self.system = system
+        self.parent_id = parent_id
+        self.depth = depth
+        self.priority = priority
+
+    def __repr__(self) -> str:
+        return (
+            f"WorkItem(system={self.system!r}, parent_id={self.parent_id!r}, "
+            f"depth={self.depth})"
+        )
+
+
+class WorkQueue:
+    """Sorted queue of subsystems with a configurable order.
+
+    - ``dfs``: the most recently decomposed system's subsystems come
+      first, in the order they were given, so each branch is finished
+      before its siblings.
+    - ``bfs``: subsystems are explored level by level, first in first
+      out.
+    - ``priority``: lowest priority value first, ties first in first
+      out. Priorities come from ``priority_fn`` (default: depth).
+
+    Items are kept sorted with the next one last, so pop is O(1), push
+    is a binary search plus one list insertion, and the first ``k``
+    items in exploration order are read in O(k) without sorting.
+    Nothing queued is ever dropped.
+    """
+
+    def __init__(
+        self,
+        order: str = DEPTH_FIRST,
+        priority_fn: Optional[Callable[[WorkItem], float]] = None
+    ):
+        """Initialize the queue.
+
+        Args:
+            order: "dfs", "bfs" or "priority"
+            priority_fn: Priority of an item for the "priority" order
+
+        Raises:
+            ValueError: If the order is unknown
+        """
+        if order not in QUEUE_ORDERS:
+            raise ValueError(
+                f"Unknown queue order: {order!r} (expected one of {QUEUE_ORDERS})"
+            )
+        self.order = order
+        self.priority_fn = priority_fn or (lambda item: item.depth)
+        # (negated order key, item), in reverse exploration order
+        self._entries: List[Tuple[Tuple[Any, ...], WorkItem]] = []
+        self._sequence = sequence()
+        self._batch = sequence()
+
+    def push(
+        self,
+        system: str,
+        parent_id: Optional[str] = None,
+        depth: int = 0
+    ) -> WorkItem:
+        """Queue a single subsystem.
+
+        Args:
+            system: The subsystem to explore
+            parent_id: ID of the component that spawned it
+            depth: Depth in the decomposition hierarchy
+
+        Returns:
+            The queued item
+        """
+        return self.push_many([system], parent_id, depth)[0]
+
+    def push_many(
+        self,
+        systems: Iterable[str],
+        parent_id: Optional[str] = None,
+        depth: int = 0
+    ) -> List[WorkItem]:
+        """Queue the subsystems of one decomposition, keeping their order.
+
+        Args:
+            systems: The subsystems to explore
+            parent_id: ID of the component that spawned them
+            depth: Depth in the decomposition hierarchy
+
+        Returns:
+            The queued items
+        """
+        batch = next(self._batch)
+        items = []
+        for system in systems:
+            item = WorkItem(system, parent_id, depth)
+            seq = next(self._sequence)
+
+            if self.order == DEPTH_FIRST:
+                key = (-batch, seq)
+            elif self.order == BREADTH_FIRST:
+                key = (seq,)
+            else:
+                item.priority = self.priority_fn(item)
+                key = (item.priority, seq)
+
+            insort(self._entries, (tuple(-part for part in key), item))
+            items.append(item)
+        return items
+
+    def pop(self) -> WorkItem:
+        """Remove and return the next subsystem.
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        return self._entries.pop()[1]
+
+    def peek(self) -> Optional[WorkItem]:
+        """Get the next subsystem without removing it."""
+        return self._entries[-1][1] if self._entries else None
+
+    def head(self, k: int) -> List[str]:
+        """Get the next ``k`` queued subsystems in exploration order."""
+        if k <= 0:
+            return []
+        return [item.system for _, item in reversed(self._entries[-k:])]
+
+    def snapshot(self) -> List[str]:
+        """Get the queued subsystems in the order they will be explored."""
+        return [item.system for _, item in reversed(self._entries)]
+
+    def clear(self) -> None:
+        """Remove all queued subsystems."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
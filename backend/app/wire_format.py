@@ -0,0 +1,221 @@
+"""Compact wire format for graph payloads.
+
+Graph JSON repeats the same keys ("source", "target", "type", ...) and
+the same system names on every node and edge. The compact format sends
+every string once, in a string table, and every distinct set of keys
+once, in a shape table. Consecutive records with the same shape form a
+run whose values are stored column by column, which also lets gzip
+find the repetition between neighbouring records:
+
+    {
+      "format": "cdss-compact/1",
+      "strings": ["DesignExploration", "id", "type", ...],
+      "shapes": [[-2, -3, ...], ...],        # key references
+      "type": -1,
+      "nodes": [[shape, count, column, column, ...], ...],
+      "edges": [[shape, count, column, column, ...], ...],
+      "hierarchies": value or null
+    }
+
+Values are tagged so that they survive without a schema:
+
+- string -> ``-1 - index`` into ``strings`` (a negative integer)
+- non-negative number -> itself
+- negative number -> ``[0, number]``
+- list or tuple -> ``[1, value, ...]``
+- dict -> ``[2, shape, value, ...]``, its keys stored as a shape
+- true, false, null -> themselves
+
+Clients opt in with ``Accept: application/vnd.cdss.graph+json``; the
+document is gzip-compressed when the client accepts gzip.
+"""
+
+import gzip
+import json
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+COMPACT_MEDIA_TYPE = "application/vnd.cdss.graph+json"
+COMPACT_FORMAT = "cdss-compact/1"
+
+TAG_NUMBER = 0
+TAG_LIST = 1
+TAG_DICT = 2
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 1024
+
+
+def wants_compact(accept: Optional[str]) -> bool:
+    """Whether an Accept header asks for the compact format."""
+    return bool(accept) and COMPACT_MEDIA_TYPE in accept
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether an Accept-Encoding header allows gzip."""
+    if not accept_encoding:
+        return False
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def representation(accept: Optional[str], accept_encoding: Optional[str]) -> str:
+    """Get the negotiated representation: "json", "compact" or "compact+gzip"."""
+    if not wants_compact(accept):
+        return "json"
+    return "compact+gzip" if accepts_gzip(accept_encoding) else "compact"
+
+
+class _Encoder:
+    """Interns strings and key shapes while encoding one document."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._string_refs: Dict[str, int] = {}
+        self.shapes: List[List[int]] = []
+        self._shape_ids: Dict[Tuple[str, ...], int] = {}
+
+    def string(self, value: str) -> int:
+        ref = self._string_refs.get(value)
+        if ref is None:
+            ref = self._string_refs[value] = -1 - len(self.strings)
+            self.strings.append(value)
+        return ref
+
+    def value(self, value: Any) -> Any:
+        if isinstance(value, Enum):
+            value = value.value
+        if isinstance(value, str):
+            return self.string(value)
+        if value is None or isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            return value if value >= 0 else [TAG_NUMBER, value]
+        if isinstance(value, (list, tuple)):
+            return [TAG_LIST] + [self.value(item) for item in value]
+        if isinstance(value, dict):
+            return [TAG_DICT, self.shape(tuple(str(key) for key in value))] + [
+                self.value(item) for item in value.values()
+            ]
+        return self.string(str(value))
+
+    def shape(self, keys: Tuple[str, ...]) -> int:
+        shape = self._shape_ids.get(keys)
+        if shape is None:
+            shape = self._shape_ids[keys] = len(self.shapes)
+            self.shapes.append([self.string(key) for key in keys])
+        return shape
+
+    def records(self, records: List[Dict[str, Any]]) -> List[List[Any]]:
+        """Encode records as runs of one shape, column by column."""
+        runs: List[List[Any]] = []
+        current_keys: Optional[Tuple[str, ...]] = None
+        columns: List[List[Any]] = []
+        for record in records:
+            keys = tuple(record)
+            if keys != current_keys:
+                columns = [[] for _ in keys]
+                runs.append([self.shape(keys), 0] + columns)
+                current_keys = keys
+            runs[-1][1] += 1
+            for column, item in zip(columns, record.values()):
+                column.append(self.value(item))
+        return runs
+
+
+def encode_compact(graph_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Encode a graph dictionary (``to_dict`` output) in the compact format.
+
+    Args:
+        graph_dict: Graph with "type", "nodes", "edges" and optional
+            "hierarchies"
+
+    Returns:
+        Compact document
+    """
+    encoder = _Encoder()
+    graph_type = encoder.value(graph_dict["type"])
+    nodes = encoder.records(graph_dict["nodes"])
+    edges = encoder.records(graph_dict["edges"])
+    hierarchies = graph_dict.get("hierarchies")
+    return {
+        "format": COMPACT_FORMAT,
+        "strings": encoder.strings,
+        "shapes": encoder.shapes,
+        "type": graph_type,
+        "nodes": nodes,
+        "edges": edges,
+        "hierarchies": encoder.value(hierarchies) if hierarchies is not None else None,
+    }
+
+
+def decode_compact(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode a compact document back into a graph dictionary.
+
+    Args:
+        document: Compact document
+
+    Returns:
+        Graph dictionary; tuples come back as lists
+
+    Raises:
+        ValueError: If the document is not in a known compact format
+    """
+    if document.get("format") != COMPACT_FORMAT:
+        raise ValueError(f"Unknown graph format: {document.get('format')!r}")
+    strings = document["strings"]
+
+    def value(encoded: Any) -> Any:
+        if encoded is None or isinstance(encoded, (bool, float)):
+            return encoded
+        if isinstance(encoded, int):
+            return strings[-1 - encoded] if encoded < 0 else encoded
+        tag = encoded[0]
+        if tag == TAG_NUMBER:
+            return encoded[1]
+        if tag == TAG_LIST:
+            return [value(item) for item in encoded[1:]]
+        return dict(zip(shapes[encoded[1]], map(value, encoded[2:])))
+
+    shapes = [[strings[-1 - key] for key in shape] for shape in document["shapes"]]
+
+    def records(runs: List[List[Any]]) -> List[Dict[str, Any]]:
+        decoded = []
+        for run in runs:
+            keys = shapes[run[0]]
+            columns = [[value(item) for item in column] for column in run[2:]]
+            for i in range(run[1]):
+                decoded.append({key: column[i] for key, column in zip(keys, columns)})
+        return decoded
+
+    hierarchies = document.get("hierarchies")
+    return {
+        "type": value(document["type"]),
+        "nodes": records(document["nodes"]),
+        "edges": records(document["edges"]),
+        "hierarchies": value(hierarchies) if hierarchies is not None else None,
+    }
+
+
+def compact_body(graph_dict: Dict[str, Any], compress: bool) -> Tuple[bytes, Dict[str, str]]:
+    """Serialize a graph in the compact format.
+
+    Args:
+        graph_dict: Graph dictionary
+        compress: Whether gzip may be applied
+
+    Returns:
+        (body, extra headers)
+    """
+    body = json.dumps(
+        encode_compact(graph_dict), separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if compress and len(body) >= GZIP_MIN_BYTES:
+        # mtime=0 keeps the bytes stable for a strong ETag
+        body = gzip.compress(body, compresslevel=6, mtime=0)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
@@ -0,0 +1,91 @@
+"""Graph file benchmark: worker load time and memory for large SI graphs.
+
+Builds an SI graph from a synthetic layered LD graph, saves it as a
+memory-mapped graph file and then, in fresh interpreters, compares a
+worker that maps the file with one that rebuilds the graph: time until
+the first point query is answered and resident memory (Linux).
+
+Usage:
+    cd backend
+    python benchmarks/bench_graph_store.py [--sizes 10000 100000]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+from app.models.graph_store import save_graph  # noqa: E402
+from app.services.graph_conversion import GraphConversionEngine  # noqa: E402
+from bench_si_extraction import build_layered_ld_graph  # noqa: E402
+
+WORKER_SNIPPET = """
+import sys, time
+sys.path.insert(0, "benchmarks")
+from app.models.graph_store import load_graph
+from app.services.graph_conversion import GraphConversionEngine
+from bench_si_extraction import build_layered_ld_graph
+started = time.perf_counter()
+if sys.argv[1] == "mapped":
+    si_graph = load_graph(sys.argv[2])
+else:
+    engine = GraphConversionEngine()
+    ld_graph = build_layered_ld_graph(int(sys.argv[2]), 3, 1)
+    si_graph = engine.extract_si_components(ld_graph, engine.extract_hierarchies(ld_graph))
+node_id = next(iter(si_graph.components))
+si_graph.get_component(node_id)
+list(si_graph.graph.predecessors(node_id))
+elapsed = (time.perf_counter() - started) * 1000.0
+# Current RSS; ru_maxrss would include the parent's peak across exec
+with open("/proc/self/status") as status:
+    rss = next(int(line.split()[1]) for line in status if line.startswith("VmRSS:"))
+print(elapsed, rss)
+"""
+
+
+def run_worker(mode: str, argument: str) -> tuple:
+    """Run one worker and get (milliseconds to first query, RSS in KB)."""
+    output = subprocess.check_output(
+        [sys.executable, "-c", WORKER_SNIPPET, mode, argument],
+        cwd=BACKEND_DIR
+    )
+    elapsed, rss = output.decode().split()
+    return float(elapsed), int(rss)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    engine = GraphConversionEngine()
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            ld_graph = build_layered_ld_graph(size, 3, 1)
+            si_graph = engine.extract_si_components(
+                ld_graph, engine.extract_hierarchies(ld_graph)
+            )
+            path = os.path.join(directory, f"si_{size}.cdssg")
+            started = time.perf_counter()
+            save_graph(si_graph, path)
+            saved = (time.perf_counter() - started) * 1000.0
+
+            built_ms, built_rss = run_worker("built", str(size))
+            mapped_ms, mapped_rss = run_worker("mapped", path)
+            print(
+                f"{size:>8} LD nodes: file {os.path.getsize(path) / 1e6:.1f} MB "
+                f"(saved in {saved:.0f} ms) | "
+                f"rebuild {built_ms:.0f} ms, {built_rss / 1024:.0f} MB RSS | "
+                f"mapped {mapped_ms:.1f} ms, {mapped_rss / 1024:.0f} MB RSS"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
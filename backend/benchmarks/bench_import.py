@@ -0,0 +1,100 @@
+"""Import-time benchmark for backend worker cold start.
+
+Runs ``import app.main`` in fresh interpreters and reports the wall time
+of the import, so cold start can be measured and kept low.
+
+Usage:
+    cd backend
+    python benchmarks/bench_import.py [--runs N] [--max-ms MS] [--top K]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import app.main; "
+    "print((time.perf_counter() - t) * 1000.0)"
+)
+
+
+def measure_import(runs: int) -> list:
+    """Measure ``import app.main`` wall time in milliseconds per run."""
+    timings = []
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, "-c", IMPORT_SNIPPET],
+            cwd=BACKEND_DIR
+        )
+        timings.append(float(output.decode().strip().splitlines()[-1]))
+    return timings
+
+
+def top_imports(limit: int) -> list:
+    """Get the slowest modules by cumulative import time.
+
+    Returns:
+        List of (cumulative microseconds, module name) pairs
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            entries.append((int(cumulative), module.rstrip()))
+
+    entries.sort(reverse=True)
+    return entries[:limit]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=None,
+        help="Fail if the median import time exceeds this budget"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Show the K slowest imports (0 to disable)"
+    )
+    args = parser.parse_args()
+
+    timings = measure_import(args.runs)
+    median = statistics.median(timings)
+    print(
+        f"import app.main: median {median:.1f} ms, "
+        f"min {min(timings):.1f} ms, max {max(timings):.1f} ms "
+        f"({args.runs} runs)"
+    )
+
+    if args.top:
+        print(f"\nSlowest imports (cumulative):")
+        for cumulative, module in top_imports(args.top):
+            print(f"  {cumulative / 1000.0:8.1f} ms  {module}")
+
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"\nFAIL: median {median:.1f} ms exceeds budget {args.max_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""Preload benchmark: per-worker memory of a large knowledge base (Linux).
+
+Writes a synthetic knowledge base, then forks workers that query it and
+run a full garbage collection, and reports how much memory each worker
+holds privately (``Private_Dirty`` in ``/proc/<pid>/smaps_rollup``):
+
+- ``per-worker``: every worker loads its own knowledge base
+- ``fork``: the parent loads it and workers fork without freezing
+- ``preload``: the parent runs ``app.preload.preload()`` before forking
+
+Usage:
+    cd backend
+    python benchmarks/bench_preload.py [--systems 200000] [--workers 4]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def write_knowledge_base(path: str, num_systems: int, seed: int) -> None:
+    """Write a synthetic knowledge base in the ``to_dict`` format."""
+    rng = random.Random(seed)
+    situations = {f"system_{i}": f"situation_{rng.randrange(1000)}" for i in range(num_systems)}
+    data = {
+        "situations": situations,
+        "problems": {
+            f"{system},{situation}": f"problem_{rng.randrange(5000)}"
+            for system, situation in situations.items()
+        },
+        "intentions": {f"problem_{i}": f"intention_{i}" for i in range(5000)},
+        "decompositions": {
+            f"system_{i},intention_{rng.randrange(5000)}": {
+                "intentions": [f"intention_{rng.randrange(5000)}" for _ in range(2)],
+                "systems": [f"system_{rng.randrange(num_systems)}" for _ in range(2)],
+            }
+            for i in range(num_systems)
+        },
+        "solutions": {
+            f"system_{i}": [f"solution_{rng.randrange(10000)}" for _ in range(3)]
+            for i in range(num_systems)
+        },
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def private_dirty_kb(pid: int) -> int:
+    """Get a process's private dirty memory in KB."""
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Private_Dirty:"):
+                return int(line.split()[1])
+    return 0
+
+
+def work(num_systems: int) -> None:
+    """Query the shared knowledge base like a busy worker would."""
+    import gc
+    from app.main import load_knowledge_base
+
+    kb = load_knowledge_base()
+    rng = random.Random(os.getpid())
+    for _ in range(10000):
+        system = f"system_{rng.randrange(num_systems)}"
+        kb.query_solutions(system)
+        kb.query_problem(system, kb.query_situation(system))
+    gc.collect()
+
+
+def run(mode: str, num_systems: int, num_workers: int) -> list:
+    """Fork workers in one mode and get their private dirty memory."""
+    from app.main import load_knowledge_base
+
+    if mode == "preload":
+        from app.preload import preload
+        preload()
+    elif mode == "fork":
+        load_knowledge_base()
+
+    pipes = []
+    for _ in range(num_workers):
+        read_end, write_end = os.pipe()
+        ready_read, ready_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            if mode == "preload":
+                from app.preload import after_fork
+                after_fork()
+            work(num_systems)
+            os.write(ready_write, b"1")
+            os.read(read_end, 1)
+            os._exit(0)
+        os.read(ready_read, 1)
+        pipes.append((pid, write_end))
+
+    usage = [private_dirty_kb(pid) for pid, _ in pipes]
+    for pid, write_end in pipes:
+        os.write(write_end, b"1")
+        os.waitpid(pid, 0)
+    return usage
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--systems", type=int, default=200000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "kb.json")
+        write_knowledge_base(path, args.systems, seed=1)
+        print(f"knowledge base: {args.systems} systems, {os.path.getsize(path) / 1e6:.0f} MB JSON")
+
+        for mode in ("per-worker", "fork", "preload"):
+            # Each mode runs in a fresh interpreter so none inherits another's state
+            read_end, write_end = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.environ["CDSS_KNOWLEDGE_BASE"] = path
+                usage = run(mode, args.systems, args.workers)
+                os.write(write_end, json.dumps(usage).encode())
+                os._exit(0)
+            os.close(write_end)
+            with os.fdopen(read_end) as f:
+                usage = json.loads(f.read())
+            os.waitpid(pid, 0)
+            mean = sum(usage) / len(usage) / 1024
+            print(f"{mode:>10}: {mean:7.1f} MB private per worker ({args.workers} workers)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
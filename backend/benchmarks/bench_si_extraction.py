@@ -0,0 +1,183 @@
+"""SI extraction benchmark on large synthetic LD graphs.
+
+Compares hierarchy + SI component extraction done level by level with
+per-node ``get_in_edges``/``get_neighbors`` queries (spec sections
+6.2.4-6.2.5) against the engine's pipeline: CSR index build, level
+extraction and single-pass SI extraction. Both must yield the same
+COL/ALT/EXO components; the timings per size show how each scales.
+
+Usage:
+    cd backend
+    python benchmarks/bench_si_extraction.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.component import ComponentType  # noqa: E402
+from app.models.graphs import LDGraph, LogicOperator, SIGraph  # noqa: E402
+from app.models.si_components import (  # noqa: E402
+    ALTComponent, COLComponent, EXOComponent
+)
+from app.services.graph_conversion import GraphConversionEngine  # noqa: E402
+
+LOGICS = [None, LogicOperator.AND, LogicOperator.OR, LogicOperator.XOR]
+
+_CLASS_BY_LOGIC = {
+    LogicOperator.AND: COLComponent,
+    LogicOperator.OR: ALTComponent,
+    LogicOperator.XOR: EXOComponent,
+}
+
+
+def build_layered_ld_graph(num_nodes: int, fan_in: int, seed: int) -> LDGraph:
+    """Build a layered LD graph where nodes draw inputs from earlier layers."""
+    rnd = random.Random(seed)
+    ld_graph = LDGraph()
+    for i in range(num_nodes):
+        ld_graph.add_node(f"system_{i}", data=f"system_{i}")
+
+    for i in range(1, num_nodes):
+        logic = rnd.choice(LOGICS)
+        for _ in range(rnd.randint(1, fan_in)):
+            j = rnd.randrange(max(0, i - 50), i)
+            ld_graph.add_edge(f"system_{j}", f"system_{i}", logic=logic)
+    return ld_graph
+
+
+def reference_hierarchies(ld_graph) -> dict:
+    """Level-by-level hierarchy extraction over string node IDs."""
+    hierarchies = {}
+    roots = [
+        node_id for node_id in ld_graph.get_nodes()
+        if len(ld_graph.get_in_edges(node_id)) == 0
+    ]
+    visited = set(roots)
+    level = 0
+    if roots:
+        hierarchies[f"Level_{level}"] = roots
+        level += 1
+
+    current_level = roots
+    while current_level:
+        next_level = []
+        for node_id in current_level:
+            for neighbor in ld_graph.get_neighbors(node_id):
+                if neighbor not in visited:
+                    next_level.append(neighbor)
+                    visited.add(neighbor)
+        if next_level:
+            hierarchies[f"Level_{level}"] = list(set(next_level))
+            level += 1
+        current_level = next_level
+    return hierarchies
+
+
+def reference_logic(in_edges) -> LogicOperator:
+    """Logic of a node's incoming edges; mixed logic counts as OR."""
+    logics = {e.get('logic') for e in in_edges} - {None}
+    if not logics or logics == {LogicOperator.AND}:
+        return LogicOperator.AND
+    if len(logics) == 1:
+        return logics.pop()
+    return LogicOperator.OR
+
+
+def reference_extraction(engine, ld_graph, hierarchies) -> SIGraph:
+    """Level-by-level extraction querying in-edges per node."""
+    si_graph = SIGraph()
+    for level_name, node_ids in hierarchies.items():
+        level_num = int(level_name.split('_')[1])
+        for node_id in node_ids:
+            in_edges = ld_graph.get_in_edges(node_id)
+            if len(in_edges) == 0:
+                si_graph.add_root(node_id, level_num)
+            elif len(in_edges) == 1:
+                si_graph.add_dependency(in_edges[0]['source'], node_id, level_num)
+            else:
+                logic = reference_logic(in_edges)
+                component_class = _CLASS_BY_LOGIC[logic]
+                si_graph.add_component(
+                    component_class(
+                        id=engine._generate_id(logic.value),
+                        subsystems=[e['source'] for e in in_edges],
+                        parent=node_id
+                    ),
+                    level_num
+                )
+    return si_graph
+
+
+def engine_components(si_graph):
+    """Components produced by the engine in reference form."""
+    return [
+        (
+            comp.parent,
+            _LOGIC_BY_TYPE[ComponentType(comp.type)],
+            frozenset(comp.subsystems)
+        )
+        for comp in si_graph.get_components()
+    ]
+
+
+_LOGIC_BY_TYPE = {
+    ComponentType.COL: "AND",
+    ComponentType.ALT: "OR",
+    ComponentType.EXO: "XOR",
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10000, 100000]
+    )
+    parser.add_argument("--fan-in", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    engine = GraphConversionEngine()
+    print(
+        f"{'nodes':>8} {'edges':>8} {'reference ms':>13} {'engine ms':>10} "
+        f"{'index ms':>9} {'speedup':>8}"
+    )
+
+    for size in args.sizes:
+        ld_graph = build_layered_ld_graph(size, args.fan_in, args.seed)
+
+        start = time.perf_counter()
+        hierarchies = reference_hierarchies(ld_graph)
+        expected = engine_components(
+            reference_extraction(engine, ld_graph, hierarchies)
+        )
+        reference_ms = (time.perf_counter() - start) * 1000.0
+
+        # Force a fresh index so its construction is part of the timing
+        ld_graph._index = None
+        start = time.perf_counter()
+        index = ld_graph.index()
+        index_ms = (time.perf_counter() - start) * 1000.0
+        levels = engine._extract_levels(index)
+        si_graph = engine._build_si_graph(index, list(enumerate(levels)))
+        engine_ms = (time.perf_counter() - start) * 1000.0
+
+        if set(expected) != set(engine_components(si_graph)):
+            print(f"MISMATCH at {size} nodes")
+            return 1
+
+        num_edges = ld_graph.graph.number_of_edges()
+        print(
+            f"{size:>8} {num_edges:>8} {reference_ms:>13.1f} {engine_ms:>10.1f} "
+            f"{index_ms:>9.1f} "
+            f"{reference_ms / engine_ms:>7.2f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
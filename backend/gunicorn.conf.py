@@ -0,0 +1,33 @@
+"""Gunicorn configuration: uvicorn workers forked from a preloaded master.
+
+Usage:
+    cd backend
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The master imports the app and builds the engines and knowledge base
+once (see ``app.preload``); workers share them copy-on-write. Set
+CDSS_KNOWLEDGE_BASE to a JSON knowledge base file to serve a domain
+knowledge base instead of the built-in example.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get("CDSS_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("CDSS_WORKERS", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+
+def when_ready(server):
+    """Build shared state in the master, after the app is imported."""
+    from app.preload import preload
+
+    preload()
+
+
+def post_fork(server, worker):
+    """Restore garbage collection in each worker."""
+    from app.preload import after_fork
+
+    after_fork()
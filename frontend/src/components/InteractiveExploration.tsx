@@ -7,6 +7,7 @@ import {
   establishIntention,
   decomposeIntention,
   applySolution,
+  mergeGraph,
   ExplorationState,
 } from '../services/api';
 import './InteractiveExploration.css';
@@ -22,12 +23,17 @@ export const InteractiveExploration: React.FC = () => {
   const [subIntentions, setSubIntentions] = useState<string[]>(['']);
   const [subSystems, setSubSystems] = useState<string[]>(['']);
 
+  // Steps return only what they added to the DE graph
+  const updateExplorationState = (state: ExplorationState) => {
+    setExplorationState(prev => ({ ...state, graph: mergeGraph(prev?.graph, state) }));
+  };
+
   const handleStart = async () => {
     setLoading(true);
     setError(null);
     try {
       const state = await startInteractiveExploration(initialSystem);
-      setExplorationState(state);
+      setExplorationState({ ...state, graph: mergeGraph(undefined, state) });
       setInputValue(state.suggested_situation || '');
     } catch (err) {
       setError('Failed to start exploration: ' + (err as Error).message);
@@ -41,7 +47,7 @@ export const InteractiveExploration: React.FC = () => {
     setError(null);
     try {
       const state = await assessSituation(inputValue);
-      setExplorationState(state);
+      updateExplorationState(state);
       setInputValue(state.suggested_problem || '');
     } catch (err) {
       setError('Failed to assess situation: ' + (err as Error).message);
@@ -55,7 +61,7 @@ export const InteractiveExploration: React.FC = () => {
     setError(null);
     try {
       const state = await identifyProblem(inputValue);
-      setExplorationState(state);
+      updateExplorationState(state);
       setInputValue(state.suggested_intention || '');
     } catch (err) {
       setError('Failed to identify problem: ' + (err as Error).message);
@@ -69,7 +75,7 @@ export const InteractiveExploration: React.FC = () => {
     setError(null);
     try {
       const state = await establishIntention(inputValue);
-      setExplorationState(state);
+      updateExplorationState(state);
       setInputValue('');
 
       // Pre-fill decomposition if available
@@ -92,7 +98,7 @@ export const InteractiveExploration: React.FC = () => {
         subIntentions.filter(s => s.trim() !== ''),
         subSystems.filter(s => s.trim() !== '')
       );
-      setExplorationState(state);
+      updateExplorationState(state);
       setInputValue(state.suggested_situation || '');
       setSubIntentions(['']);
       setSubSystems(['']);
@@ -108,7 +114,7 @@ export const InteractiveExploration: React.FC = () => {
     setError(null);
     try {
       const state = await applySolution(solution);
-      setExplorationState(state);
+      updateExplorationState(state);
       setInputValue(state.suggested_situation || '');
     } catch (err) {
       setError('Failed to apply solution: ' + (err as Error).message);
@@ -387,6 +393,9 @@ export const InteractiveExploration: React.FC = () => {
                 {explorationState.pending_subsystems.map((sys, idx) => (
                   <li key={idx}>{sys}</li>
                 ))}
+                {(explorationState.pending_count || 0) > explorationState.pending_subsystems.length && (
+                  <li>+{(explorationState.pending_count || 0) - explorationState.pending_subsystems.length} more</li>
+                )}
               </ul>
             </div>
           )}
@@ -396,7 +405,7 @@ export const InteractiveExploration: React.FC = () => {
       {explorationState && (
         <div className="graph-display">
           <GraphVisualization
-            graphData={explorationState.graph}
+            graphData={explorationState.graph || mergeGraph(undefined, explorationState)}
             title="DE Graph (Design Exploration History)"
           />
         </div>
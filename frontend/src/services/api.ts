@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { GraphData } from '../types';
+import { CompactGraph, CompactRun, CompactValue, GraphData } from '../types';
 
 const API_BASE_URL = 'http://localhost:8000';
 
@@ -17,21 +17,81 @@ export const exploreDesign = async (initialSystem: string): Promise<GraphData> =
   return response.data;
 };
 
-export const getDEGraph = async (): Promise<GraphData> => {
-  const response = await api.get('/api/graphs/de');
-  return response.data;
-};
+export const COMPACT_GRAPH_MEDIA_TYPE = 'application/vnd.cdss.graph+json';
+
+const TAG_NUMBER = 0;
+const TAG_LIST = 1;
+
+// Decode a graph sent in the compact wire format
+export const decodeCompactGraph = (doc: CompactGraph): GraphData => {
+  const { strings } = doc;
+  const shapes = doc.shapes.map((shape) => shape.map((ref) => strings[-1 - ref]));
+
+  const value = (encoded: CompactValue): any => {
+    if (encoded === null || typeof encoded === 'boolean') {
+      return encoded;
+    }
+    if (typeof encoded === 'number') {
+      return encoded < 0 && Number.isInteger(encoded) ? strings[-1 - encoded] : encoded;
+    }
+    const tag = encoded[0];
+    if (tag === TAG_NUMBER) {
+      return encoded[1];
+    }
+    if (tag === TAG_LIST) {
+      return encoded.slice(1).map(value);
+    }
+    const keys = shapes[encoded[1] as number];
+    const result: Record<string, any> = {};
+    for (let i = 0; i < keys.length; i++) {
+      result[keys[i]] = value(encoded[i + 2]);
+    }
+    return result;
+  };
 
-export const getLDGraph = async (): Promise<GraphData> => {
-  const response = await api.get('/api/graphs/ld');
-  return response.data;
+  const records = (runs: CompactRun[]): any[] => {
+    const decoded: any[] = [];
+    for (const run of runs) {
+      const keys = shapes[run[0]];
+      const count = run[1];
+      const columns = (run.slice(2) as CompactValue[][]).map((column) => column.map(value));
+      for (let i = 0; i < count; i++) {
+        const record: Record<string, any> = {};
+        for (let k = 0; k < keys.length; k++) {
+          record[keys[k]] = columns[k][i];
+        }
+        decoded.push(record);
+      }
+    }
+    return decoded;
+  };
+
+  const graph: GraphData = {
+    type: value(doc.type),
+    nodes: records(doc.nodes),
+    edges: records(doc.edges),
+  };
+  if (doc.hierarchies !== null) {
+    graph.hierarchies = value(doc.hierarchies);
+  }
+  return graph;
 };
 
-export const getSIGraph = async (): Promise<GraphData> => {
-  const response = await api.get('/api/graphs/si');
-  return response.data;
+// Fetch a graph, preferring the compact format (the browser handles gzip)
+const getGraph = async (path: string): Promise<GraphData> => {
+  const response = await api.get(path, {
+    headers: { Accept: `${COMPACT_GRAPH_MEDIA_TYPE}, application/json` },
+  });
+  const data = response.data;
+  return data && data.format === 'cdss-compact/1' ? decodeCompactGraph(data) : data;
 };
 
+export const getDEGraph = async (): Promise<GraphData> => getGraph('/api/graphs/de');
+
+export const getLDGraph = async (): Promise<GraphData> => getGraph('/api/graphs/ld');
+
+export const getSIGraph = async (): Promise<GraphData> => getGraph('/api/graphs/si');
+
 export const convertGraphs = async (): Promise<{
   de: GraphData;
   ld: GraphData;
@@ -49,10 +109,16 @@ export interface ExplorationState {
   situation?: string;
   problem?: string;
   intention?: string;
+  // The first pending subsystems, and how many are pending in all
   pending_subsystems?: string[];
+  pending_count?: number;
   suggested_situation?: string;
   suggested_problem?: string;
   suggested_intention?: string;
+  suggested_situations?: string[];
+  suggested_problems?: string[];
+  suggested_intentions?: string[];
+  pending_situations?: Record<string, string[]>;
   can_decompose?: boolean;
   can_apply_solution?: boolean;
   suggested_decomposition?: {
@@ -64,9 +130,28 @@ export interface ExplorationState {
   available_problems?: string[];
   available_intentions?: string[];
   message?: string;
-  graph: GraphData;
+  // Components and edges the step added; the whole graph only comes
+  // with include_graph and from getExplorationState
+  added?: GraphData;
+  graph?: GraphData;
 }
 
+// Apply a step's response to the graph held so far
+export const mergeGraph = (previous: GraphData | undefined, state: ExplorationState): GraphData => {
+  if (state.graph) {
+    return state.graph;
+  }
+  const added = state.added || { type: 'DE', nodes: [], edges: [] };
+  if (!previous) {
+    return added;
+  }
+  return {
+    ...previous,
+    nodes: [...previous.nodes, ...added.nodes],
+    edges: [...previous.edges, ...added.edges],
+  };
+};
+
 export const startInteractiveExploration = async (initialSystem: string): Promise<ExplorationState> => {
   const response = await api.post('/api/interactive/start', {
     initial_system: initialSystem,
@@ -34,3 +34,21 @@ export interface GraphData {
 }
 
 export type GraphType = 'DE' | 'LD' | 'SI';
+
+// Compact graph wire format (Accept: application/vnd.cdss.graph+json).
+// Strings are negative references into `strings`; see
+// backend/app/wire_format.py for the value encoding.
+export type CompactValue = number | boolean | null | CompactValue[];
+
+// [shape, count, column, column, ...]
+export type CompactRun = [number, number, ...CompactValue[][]];
+
+export interface CompactGraph {
+  format: 'cdss-compact/1';
+  strings: string[];
+  shapes: number[][];
+  type: number;
+  nodes: CompactRun[];
+  edges: CompactRun[];
+  hierarchies: CompactValue | null;
+}